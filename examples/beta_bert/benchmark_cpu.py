@@ -0,0 +1,66 @@
+"""
+Measures the load time and speed of the CPU inference modes of BERTNameDividerOnlyKatakana.
+The accuracy on the names in the file is printed as well, to check the effect of quantization on your own data.
+
+Usage:
+    python benchmark_cpu.py bert_katakana_v0_3_0.pt katakana_names.txt --num-threads 4
+
+katakana_names.txt has one divided name per line in the format "given family" (e.g. "フランシスコ ザビエル").
+"""
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+
+import typer
+
+from namedivider.beta_bert_divider import BERTNameDividerOnlyKatakana
+from namedivider.divider.divided_name import DividedName
+
+
+def to_given_family(divided_name: DividedName) -> str:
+    """
+    Formats a result in the format of the input file, regardless of family_first of the divider.
+
+    >>> to_given_family(DividedName(family="ザビエル", given="フランシスコ"))
+    'フランシスコ ザビエル'
+    """
+    return f"{divided_name.given} {divided_name.family}"
+
+
+def evaluate(divider: BERTNameDividerOnlyKatakana, divided_names: list[str]):
+    undivided_names = [_name.replace(" ", "") for _name in divided_names]
+    start = time.perf_counter()
+    results = divider.divide_names(undivided_names)
+    elapsed = time.perf_counter() - start
+    accuracy = sum(to_given_family(_result) == _name for _result, _name in zip(results, divided_names)) / len(
+        divided_names
+    )
+    return accuracy, elapsed
+
+
+def benchmark(model_path: Path, src: Path, num_threads: Optional[int] = None):
+    divided_names = [_line.strip() for _line in src.read_text(encoding="utf-8").splitlines() if _line.strip()]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        fp32_torchscript_path = Path(tmp_dir) / "fp32.torchscript"
+        int8_torchscript_path = Path(tmp_dir) / "int8.torchscript"
+        BERTNameDividerOnlyKatakana(model_path, device="cpu").export_torchscript(fp32_torchscript_path)
+        BERTNameDividerOnlyKatakana(model_path, device="cpu", quantize=True).export_torchscript(int8_torchscript_path)
+        modes = {
+            "fp32": {"model_path": model_path},
+            "int8": {"model_path": model_path, "quantize": True},
+            "fp32 TorchScript": {"model_path": fp32_torchscript_path, "torchscript": True},
+            "int8 TorchScript": {"model_path": int8_torchscript_path, "torchscript": True},
+        }
+        print("| mode | load (sec) | accuracy | names / sec |")
+        print("|----|----|----|----|")
+        for _mode, _kwargs in modes.items():
+            start = time.perf_counter()
+            divider = BERTNameDividerOnlyKatakana(device="cpu", num_threads=num_threads, **_kwargs)
+            load_time = time.perf_counter() - start
+            accuracy, elapsed = evaluate(divider, divided_names)
+            print(f"| {_mode} | {load_time:.2f} | {accuracy:.2%} | {len(divided_names) / elapsed:.1f} |")
+
+
+if __name__ == "__main__":
+    typer.run(benchmark)
@@ -0,0 +1,362 @@
+"""
+Offline management of the assets downloaded by namedivider.
+
+GBDTNameDivider downloads the GBDT model and the family name repository from GitHub on first use.
+For machines without network access, the assets can be staged from a directory or a tarball instead,
+and verified against the SHA-256 checksums in a manifest.
+
+Manifest (manifest.json) example:
+    {"assets": {"gbdt_model_v1.txt": {"sha256": "...", "size": 123}}}
+"""
+import functools
+import hashlib
+import io
+import json
+import os
+import tarfile
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Any, Callable, Optional, TypeVar, Union
+
+from namedivider.util import (
+    DEFAULT_CACHE_DIR,
+    FAMILY_NAME_REPOSITORY_SHA256,
+    FAMILY_NAME_REPOSITORY_URL,
+    GBDT_MODEL_V1_SHA256,
+    GBDT_MODEL_V1_URL,
+    AssetIntegrityError,
+)
+
+MANIFEST_FILENAME = "manifest.json"
+SNAPSHOT_FILENAME = "gbdt.snapshot"
+_HASH_CHUNK_SIZE = 1 << 20
+
+_T = TypeVar("_T")
+
+
+@dataclass(frozen=True)
+class AssetSpec:
+    """
+    name: Name of the asset.
+    filename: File name in the cache directory.
+    url: URL the asset is downloaded from when online.
+    sha256: Pinned checksum of the released asset, or None if it is not pinned.
+    """
+
+    name: str
+    filename: str
+    url: str
+    sha256: Optional[str] = None
+
+
+KNOWN_ASSETS = (
+    AssetSpec(name="gbdt_model_v1", filename="gbdt_model_v1.txt", url=GBDT_MODEL_V1_URL, sha256=GBDT_MODEL_V1_SHA256),
+    AssetSpec(
+        name="family_name_repository",
+        filename="family_name_repository.pickle",
+        url=FAMILY_NAME_REPOSITORY_URL,
+        sha256=FAMILY_NAME_REPOSITORY_SHA256,
+    ),
+)
+
+
+@dataclass(frozen=True)
+class AssetStatus:
+    """
+    name: Name of the asset.
+    path: Path of the asset in the cache directory.
+    exists: Whether the asset exists.
+    sha256: Checksum of the asset, or None if it does not exist.
+    expected_sha256: Pinned checksum of the asset, or the checksum in the manifest if it is not pinned.
+      None if neither exists.
+    """
+
+    name: str
+    path: Path
+    exists: bool
+    sha256: Optional[str]
+    expected_sha256: Optional[str]
+
+    @property
+    def verified(self) -> bool:
+        """
+        True if the asset exists and matches the checksum in the manifest.
+        """
+        return self.exists and self.expected_sha256 is not None and self.sha256 == self.expected_sha256
+
+    @property
+    def corrupted(self) -> bool:
+        """
+        True if the asset exists but does not match the checksum in the manifest.
+        """
+        return self.exists and self.expected_sha256 is not None and self.sha256 != self.expected_sha256
+
+
+def sha256_of(file: Union[str, Path, IO[bytes]]) -> str:
+    """
+    Calculates the SHA-256 checksum of a file.
+    :param file: Path of the file or binary file object.
+    :return: Hex digest
+    :rtype: str
+    """
+    if isinstance(file, (str, Path)):
+        with open(file, "rb") as f:
+            return sha256_of(f)
+    hash_obj = hashlib.sha256()
+    for chunk in iter(lambda: file.read(_HASH_CHUNK_SIZE), b""):
+        hash_obj.update(chunk)
+    return hash_obj.hexdigest()
+
+
+def _open_file(path: Path) -> IO[bytes]:
+    return open(path, "rb")
+
+
+def _extract_file(tar: tarfile.TarFile, member: tarfile.TarInfo) -> IO[bytes]:
+    file = tar.extractfile(member)
+    if file is None:
+        raise FileNotFoundError(f"{member.name} cannot be extracted.")
+    return file
+
+
+def _index_by_name(items: Iterable[tuple[str, _T]]) -> dict[str, _T]:
+    """
+    Indexes the files of a source by base name.
+    Raises ValueError if the source has more than one asset or manifest with the same name at different depths,
+    since it is ambiguous which one to stage. Other files are ignored.
+    """
+    filenames = {_spec.filename for _spec in KNOWN_ASSETS} | {MANIFEST_FILENAME}
+    indexed: dict[str, _T] = {}
+    for _name, _item in items:
+        if _name not in filenames:
+            continue
+        if _name in indexed:
+            raise ValueError(f"More than one {_name} is found in the source.")
+        indexed[_name] = _item
+    return indexed
+
+
+def _copy_atomically(src: IO[bytes], dst: Path, expected_sha256: Optional[str] = None) -> str:
+    """
+    Copies a file object into dst through a temporary file, so that dst is never left half-written
+    and is not replaced by content which does not match expected_sha256.
+    :return: SHA-256 checksum of the copied content
+    """
+    hash_obj = hashlib.sha256()
+    tmp_path = dst.with_name(f".{dst.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            for chunk in iter(lambda: src.read(_HASH_CHUNK_SIZE), b""):
+                hash_obj.update(chunk)
+                f.write(chunk)
+        checksum = hash_obj.hexdigest()
+        if expected_sha256 is not None and checksum != expected_sha256:
+            raise AssetIntegrityError(
+                f"Checksum mismatch of {dst.name}: expected {expected_sha256}, but got {checksum}"
+            )
+        os.replace(tmp_path, dst)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return checksum
+
+
+class AssetManager:
+    """
+    Manages the assets in the cache directory without network access.
+
+    :example
+    -----------------------------------------------------
+    >>> manager = AssetManager()
+    >>> manager.missing()
+    ['gbdt_model_v1', 'family_name_repository']
+    >>> manager.stage("namedivider-assets.tar.gz")
+    >>> manager.missing()
+    []
+    -----------------------------------------------------
+    """
+
+    def __init__(self, cache_dir: Union[str, Path] = DEFAULT_CACHE_DIR):
+        """
+        :param cache_dir: Directory of the assets. The default is the directory used by the default configs.
+        """
+        self.cache_dir = Path(cache_dir)
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.cache_dir / MANIFEST_FILENAME
+
+    @property
+    def snapshot_path(self) -> Path:
+        return self.cache_dir / SNAPSHOT_FILENAME
+
+    def path(self, name: str) -> Path:
+        """
+        Returns the path of the asset in the cache directory.
+        :param name: Name of the asset (See KNOWN_ASSETS).
+        :rtype: Path
+        """
+        for _spec in KNOWN_ASSETS:
+            if _spec.name == name:
+                return self.cache_dir / _spec.filename
+        raise KeyError(f"Unknown asset: {name}")
+
+    def read_manifest(self) -> dict[str, dict[str, Any]]:
+        """
+        Returns the entries of the manifest in the cache directory, by file name.
+        """
+        if not self.manifest_path.exists():
+            return {}
+        with open(self.manifest_path, encoding="utf-8") as f:
+            entries: dict[str, dict[str, Any]] = json.load(f)["assets"]
+        return entries
+
+    def _write_manifest(self, entries: dict[str, dict[str, Any]]) -> None:
+        content = json.dumps({"assets": entries}, indent=2, sort_keys=True).encode()
+        _copy_atomically(io.BytesIO(content), self.manifest_path)
+
+    def status(self) -> list[AssetStatus]:
+        """
+        Returns the status of all known assets. No network access is done.
+        :rtype: list[AssetStatus]
+        """
+        manifest = self.read_manifest()
+        statuses = []
+        for _spec in KNOWN_ASSETS:
+            path = self.cache_dir / _spec.filename
+            exists = path.exists()
+            statuses.append(
+                AssetStatus(
+                    name=_spec.name,
+                    path=path,
+                    exists=exists,
+                    sha256=sha256_of(path) if exists else None,
+                    expected_sha256=_spec.sha256 or manifest.get(_spec.filename, {}).get("sha256"),
+                )
+            )
+        return statuses
+
+    def missing(self) -> list[str]:
+        """
+        Returns the names of the assets which do not exist in the cache directory. No network access is done.
+        :rtype: list[str]
+        """
+        return [_spec.name for _spec in KNOWN_ASSETS if not (self.cache_dir / _spec.filename).exists()]
+
+    def verify(self) -> list[AssetStatus]:
+        """
+        Verifies the assets in the cache directory against the manifest.
+        Raises AssetIntegrityError if any asset does not match its checksum.
+        :return: Status of all known assets.
+        :rtype: list[AssetStatus]
+        """
+        statuses = self.status()
+        corrupted = [_status.name for _status in statuses if _status.corrupted]
+        if len(corrupted) > 0:
+            raise AssetIntegrityError(f"Checksum mismatch: {', '.join(corrupted)}")
+        return statuses
+
+    def stage(self, source: Union[str, Path]) -> list[str]:
+        """
+        Copies the known assets from a directory or a tarball (.tar, .tar.gz, .tgz) into the cache directory.
+        Each asset is verified against its pinned checksum (See AssetSpec) before it replaces the cached one,
+        or against manifest.json in the source if it is not pinned. A mismatch raises AssetIntegrityError.
+        :param source: Directory or tarball containing the assets at any depth.
+            Raises ValueError if an asset is found more than once.
+        :return: Names of the staged assets.
+        :rtype: list[str]
+        """
+        source = Path(source)
+        self.cache_dir.mkdir(exist_ok=True, parents=True)
+        if source.is_dir():
+            paths = _index_by_name((_path.name, _path) for _path in source.rglob("*") if _path.is_file())
+            return self._stage_files({_name: functools.partial(_open_file, _path) for _name, _path in paths.items()})
+        with tarfile.open(source) as tar:
+            # Members are read as file objects and written by their base names,
+            # so paths in the tarball are never used to write files.
+            members = _index_by_name(
+                (Path(_member.name).name, _member) for _member in tar.getmembers() if _member.isfile()
+            )
+            return self._stage_files(
+                {_name: functools.partial(_extract_file, tar, _member) for _name, _member in members.items()}
+            )
+
+    def _stage_files(self, openers: dict[str, Callable[[], IO[bytes]]]) -> list[str]:
+        """
+        Stages the known assets, and records the checksums of the staged ones even if another fails.
+        :param openers: Functions opening a file in binary mode, by file name.
+        :return: Names of the staged assets.
+        """
+        source_manifest: dict[str, dict[str, Any]] = {}
+        if MANIFEST_FILENAME in openers:
+            with openers[MANIFEST_FILENAME]() as f:
+                source_manifest = json.load(f)["assets"]
+        staged = []
+        entries = self.read_manifest()
+        try:
+            for _spec in KNOWN_ASSETS:
+                if _spec.filename not in openers:
+                    continue
+                dst = self.cache_dir / _spec.filename
+                expected_sha256 = source_manifest.get(_spec.filename, {}).get("sha256")
+                if _spec.sha256 is not None:
+                    # The pinned checksum is trusted over the manifest, which comes with the assets.
+                    if expected_sha256 is not None and expected_sha256 != _spec.sha256:
+                        raise AssetIntegrityError(
+                            f"Checksum of {_spec.filename} in the manifest does not match the pinned one: "
+                            f"expected {_spec.sha256}, but got {expected_sha256}"
+                        )
+                    expected_sha256 = _spec.sha256
+                with openers[_spec.filename]() as f:
+                    checksum = _copy_atomically(f, dst, expected_sha256=expected_sha256)
+                entries[_spec.filename] = {"sha256": checksum, "size": dst.stat().st_size}
+                staged.append(_spec.name)
+        finally:
+            self._write_manifest(entries)
+        return staged
+
+    def bundle(self, output: Union[str, Path]) -> list[str]:
+        """
+        Writes the cached assets and their manifest into a tarball, which can be staged on other machines.
+        :param output: Path of the tarball (.tar.gz).
+        :return: Names of the bundled assets.
+        :rtype: list[str]
+        """
+        missing = self.missing()
+        if len(missing) > 0:
+            raise FileNotFoundError(f"Assets are missing: {', '.join(missing)}")
+        entries = {}
+        with tarfile.open(output, "w:gz") as tar:
+            for _spec in KNOWN_ASSETS:
+                path = self.cache_dir / _spec.filename
+                entries[_spec.filename] = {"sha256": sha256_of(path), "size": path.stat().st_size}
+                tar.add(path, arcname=_spec.filename)
+            content = json.dumps({"assets": entries}, indent=2, sort_keys=True).encode()
+            info = tarfile.TarInfo(MANIFEST_FILENAME)
+            info.size = len(content)
+            tar.addfile(info, io.BytesIO(content))
+        return [_spec.name for _spec in KNOWN_ASSETS]
+
+    def build_snapshot(self, path: Optional[Union[str, Path]] = None) -> Path:
+        """
+        Builds a snapshot of GBDTNameDivider from the cached assets for fast loading (See load_snapshot).
+        :param path: Path of the snapshot. The default is gbdt.snapshot in the cache directory.
+        :return: Path of the snapshot.
+        :rtype: Path
+        """
+        from namedivider.divider.config import GBDTNameDividerConfig
+        from namedivider.divider.gbdt_name_divider import GBDTNameDivider
+
+        missing = self.missing()
+        if len(missing) > 0:
+            raise FileNotFoundError(f"Assets are missing: {', '.join(missing)}")
+        self.verify()
+        snapshot_path = self.snapshot_path if path is None else Path(path)
+        config = GBDTNameDividerConfig(
+            path_family_names=self.path("family_name_repository"), path_model=self.path("gbdt_model_v1")
+        )
+        tmp_path = snapshot_path.with_name(f".{snapshot_path.name}.tmp")
+        GBDTNameDivider(config=config).save_snapshot(tmp_path)
+        os.replace(tmp_path, snapshot_path)
+        return snapshot_path
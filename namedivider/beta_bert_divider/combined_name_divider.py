@@ -1,3 +1,7 @@
+from collections import Counter
+from collections.abc import Sequence
+from typing import Optional
+
 import regex
 
 from namedivider.beta_bert_divider.bert_name_divider_only_katakana import (
@@ -5,15 +9,87 @@ from namedivider.beta_bert_divider.bert_name_divider_only_katakana import (
 )
 from namedivider.divider.divided_name import DividedName
 from namedivider.divider.name_divider_base import _NameDivider
+from namedivider.rule.katakana_rule import KatakanaRule
+from namedivider.rule.rule import Rule
+
+# Keys of CombinedNameDivider.route_counts
+ROUTE_RULE = "rule"
+ROUTE_KATAKANA = "katakana"
+ROUTE_BASE = "base"
 
 
 class CombinedNameDivider:
-    def __init__(self, base_divider: _NameDivider, katakana_divider: BERTNameDividerOnlyKatakana) -> None:
+    def __init__(
+        self,
+        base_divider: _NameDivider,
+        katakana_divider: BERTNameDividerOnlyKatakana,
+        katakana_rules: Optional[list[Rule]] = None,
+    ) -> None:
+        """
+        :param base_divider: Divider of names which are not katakana
+        :param katakana_divider: Divider of katakana names
+        :param katakana_rules: Rules applied before the dividers, so that names fitting them skip the katakana model.
+            The default is KatakanaRule, which divides names with delimiters such as "ジョン・スミス".
+        """
         self.base_divider = base_divider
         self.katakana_divider = katakana_divider
         self.compiled_regex_katakana = regex.compile("[\u30A1-\u30FF]+")
+        if katakana_rules is None:
+            katakana_rules = [KatakanaRule(family_first=katakana_divider.family_first)]
+        self.katakana_rules = katakana_rules
+        # Number of names divided by each route: "rule", "katakana" (the katakana model) and "base".
+        self.route_counts: Counter[str] = Counter()
+
+    def _is_katakana(self, undivided_name: str) -> bool:
+        return len(undivided_name) < 15 and self.compiled_regex_katakana.fullmatch(undivided_name) is not None
+
+    def _apply_katakana_rules(self, undivided_name: str) -> Optional[DividedName]:
+        for _rule in self.katakana_rules:
+            divided_name = _rule.divide(undivided_name, self.katakana_divider.separator)
+            if divided_name is not None:
+                return divided_name
+        return None
 
     def divide_name(self, undivided_name: str) -> DividedName:
-        if len(undivided_name) < 15 and self.compiled_regex_katakana.fullmatch(undivided_name):
+        divided_name = self._apply_katakana_rules(undivided_name)
+        if divided_name is not None:
+            self.route_counts[ROUTE_RULE] += 1
+            return divided_name
+        if self._is_katakana(undivided_name):
+            self.route_counts[ROUTE_KATAKANA] += 1
             return self.katakana_divider.divide_name(undivided_name)
+        self.route_counts[ROUTE_BASE] += 1
         return self.base_divider.divide_name(undivided_name)
+
+    def divide_names(self, undivided_names: Sequence[str]) -> list[DividedName]:
+        """
+        Divides undivided names.
+        Names fitting katakana_rules are divided by the rules. Of the rest, katakana names are divided by
+        katakana_divider and the others by base_divider, each in one batch.
+
+        :param undivided_names: Names with no space between the family name and given name
+        :return: Divided names, in the same order as undivided_names
+        """
+        divided_names = [self._apply_katakana_rules(_undivided_name) for _undivided_name in undivided_names]
+        katakana_indices = []
+        other_indices = []
+        for i, (_undivided_name, _divided_name) in enumerate(zip(undivided_names, divided_names)):
+            if _divided_name is not None:
+                continue
+            if self._is_katakana(_undivided_name):
+                katakana_indices.append(i)
+            else:
+                other_indices.append(i)
+        self.route_counts[ROUTE_RULE] += len(undivided_names) - len(katakana_indices) - len(other_indices)
+        self.route_counts[ROUTE_KATAKANA] += len(katakana_indices)
+        self.route_counts[ROUTE_BASE] += len(other_indices)
+
+        if len(katakana_indices) > 0:
+            katakana_names = self.katakana_divider.divide_names([undivided_names[i] for i in katakana_indices])
+            for i, _divided_name in zip(katakana_indices, katakana_names):
+                divided_names[i] = _divided_name
+        if len(other_indices) > 0:
+            other_names = self.base_divider.divide_names([undivided_names[i] for i in other_indices])
+            for i, _divided_name in zip(other_indices, other_names):
+                divided_names[i] = _divided_name
+        return [_divided_name for _divided_name in divided_names if _divided_name is not None]
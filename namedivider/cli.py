@@ -1,24 +1,44 @@
+import os
 import time
 from pathlib import Path
+from typing import Optional
 
 import typer
 
+from namedivider.asset_manager import AssetManager
 from namedivider.divider.basic_name_divider import BasicNameDivider
-from namedivider.divider.config import BasicNameDividerConfig, GBDTNameDividerConfig
+from namedivider.divider.config import (
+    FAMILY_NAME_PKL_DEFAULT_PATH,
+    KANJI_CSV_DEFAULT_PATH,
+    BasicNameDividerConfig,
+    GBDTNameDividerConfig,
+)
 from namedivider.divider.gbdt_name_divider import GBDTNameDivider
-from namedivider.divider.name_divider_base import _NameDivider
+from namedivider.divider.name_divider_base import _NameDivider, _UndividedNameHolder
+from namedivider.training.kanji_statistics_taker import (
+    BatchKanjiStatisticsTaker,
+    KanjiStatisticsMode,
+    take_from_files,
+)
+from namedivider.util import DEFAULT_CACHE_DIR, is_gil_enabled
 
 CURRENT_DIR = Path(__file__).resolve().parent
 
 app = typer.Typer()
 
 
-def get_divider(mode: str, separator: str, use_mask_cache: bool = False, backend: str = "python") -> _NameDivider:
+def get_divider(
+    mode: str, separator: str, use_mask_cache: bool = False, backend: str = "python", prune_candidates: bool = False
+) -> _NameDivider:
     if mode == "basic":
-        basic_config = BasicNameDividerConfig(separator=separator, cache_mask=use_mask_cache, backend=backend)
+        basic_config = BasicNameDividerConfig(
+            separator=separator, cache_mask=use_mask_cache, backend=backend, prune_candidates=prune_candidates
+        )
         return BasicNameDivider(config=basic_config)
     elif mode == "gbdt":
-        gbdt_config = GBDTNameDividerConfig(separator=separator, cache_mask=use_mask_cache, backend=backend)
+        gbdt_config = GBDTNameDividerConfig(
+            separator=separator, cache_mask=use_mask_cache, backend=backend, prune_candidates=prune_candidates
+        )
         return GBDTNameDivider(config=gbdt_config)
     else:
         raise ValueError(f"Mode must be in [basic, gbdt], but got {mode}")
@@ -29,7 +49,12 @@ def name(
     undivided_name: str = typer.Argument(..., help="Undivided name"),
     separator: str = typer.Option(" ", "--separator", "-s", help="Separator between family name and given name"),
     mode: str = typer.Option("basic", "--mode", "-m", help="Divider Mode. You can choice basic or gbdt."),
-    backend: str = typer.Option("python", "--backend", "-b", help="Backend to use. python (default) or rust (beta)."),
+    backend: str = typer.Option(
+        "python",
+        "--backend",
+        "-b",
+        help="Backend to use. python (default), rust (beta), hybrid (beta), numba (basic mode only) or auto.",
+    ),
 ) -> None:
     """
     Divides an undivided name.
@@ -49,7 +74,12 @@ def file(
     separator: str = typer.Option(" ", "--separator", "-s", help="Separator between family name and given name"),
     mode: str = typer.Option("basic", "--mode", "-m", help="Divider Mode. You can choice basic or gbdt."),
     encoding: str = typer.Option("utf-8", "--encoding", "-e", help="Encoding of text file"),
-    backend: str = typer.Option("python", "--backend", "-b", help="Backend to use. python (default) or rust (beta)."),
+    backend: str = typer.Option(
+        "python",
+        "--backend",
+        "-b",
+        help="Backend to use. python (default), rust (beta), hybrid (beta), numba (basic mode only) or auto.",
+    ),
 ) -> None:
     """
     Divides names in text file.
@@ -92,7 +122,15 @@ def accuracy(
     separator: str = typer.Option(" ", "--separator", "-s", help="Separator between family name and given name"),
     mode: str = typer.Option("basic", "--mode", "-m", help="Divider Mode. You can choice basic or gbdt."),
     encoding: str = typer.Option("utf-8", "--encoding", "-e", help="Encoding of text file"),
-    backend: str = typer.Option("python", "--backend", "-b", help="Backend to use. python (default) or rust (beta)."),
+    backend: str = typer.Option(
+        "python",
+        "--backend",
+        "-b",
+        help="Backend to use. python (default), rust (beta), hybrid (beta), numba (basic mode only) or auto.",
+    ),
+    prune: bool = typer.Option(
+        False, "--prune/--no-prune", help="Skip implausible divisions, and compare with the accuracy without it"
+    ),
 ) -> None:
     """
     Check the accuracy of this tool.
@@ -108,6 +146,9 @@ def accuracy(
     :param divided_name_text: File path of text file
     :param separator: Separator between family name and given name
     :param encoding: Encoding of text file
+    :param prune: Skip implausible divisions (See BasicNameDividerConfig.prune_candidates).
+    The pruning rate over the names not divided by rules, and the difference from the accuracy without pruning
+    are also printed.
     :return:
     Prints accuracy and missed name.
     ```
@@ -116,24 +157,88 @@ def accuracy(
     True: 滝 登喜男, Pred: 滝登 喜男
     ```
     """
-    divider = get_divider(mode=mode, separator=separator, backend=backend)
+    divider = get_divider(mode=mode, separator=separator, backend=backend, prune_candidates=prune)
     with open(divided_name_text, "rb") as f:
         divided_names = f.read().decode(encoding).strip().split("\n")
     is_correct_list = []
     wrong_list = []
+    # Names divided by the algorithm, not by rules. Only they reach the candidate pruner.
+    algorithm_names = []
     with typer.progressbar(divided_names) as bar:
         for _divided_name in bar:
             _undivided_name = _divided_name.replace(separator, "")
-            _divided_name_pred = str(divider.divide_name(_undivided_name))
+            _result = divider.divide_name(_undivided_name)
+            if _result.algorithm == divider.algorithm_name:
+                algorithm_names.append(_undivided_name)
+            _divided_name_pred = str(_result)
             is_correct = _divided_name == _divided_name_pred
             is_correct_list.append(is_correct)
             if not is_correct:
                 wrong_list.append(f"True: {_divided_name}, Pred: {_divided_name_pred}")
-    print(f"{sum(is_correct_list) / len(is_correct_list):.04}")
+    accuracy = sum(is_correct_list) / len(is_correct_list)
+    print(f"{accuracy:.04}")
+    if divider.candidate_pruner is not None:
+        undivided_names = [_name.replace(separator, "") for _name in divided_names]
+        unpruned_divider = get_divider(mode=mode, separator=separator, backend=backend)
+        unpruned_results = unpruned_divider.divide_names(undivided_names)
+        unpruned_accuracy = sum(str(_result) == _name for _result, _name in zip(unpruned_results, divided_names)) / len(
+            divided_names
+        )
+        if divider.normalize_name:
+            algorithm_names = [_UndividedNameHolder(_name).normalized_name for _name in algorithm_names]
+        print(
+            f"Pruning rate: {divider.candidate_pruner.pruning_rate(algorithm_names):.2%} "
+            f"(of {len(algorithm_names)} names not divided by rules)"
+        )
+        print(f"Accuracy without pruning: {unpruned_accuracy:.04} (delta: {accuracy - unpruned_accuracy:+.04})")
     if len(wrong_list) != 0:
         print("\n".join(wrong_list))
 
 
+@app.command()
+def cascade_threshold(
+    divided_name_text: Path = typer.Argument(
+        ..., help="File path of text file", exists=True, dir_okay=False, readable=True
+    ),
+    separator: str = typer.Option(" ", "--separator", "-s", help="Separator between family name and given name"),
+    encoding: str = typer.Option("utf-8", "--encoding", "-e", help="Encoding of text file"),
+    criterion: str = typer.Option("score", "--criterion", "-c", help="Confidence to compare. score or margin."),
+    tolerance: float = typer.Option(0.0, "--tolerance", help="Accuracy lower than gbdt mode which is allowed"),
+    backend: str = typer.Option(
+        "python", "--backend", "-b", help="Backend to use. python (default), rust (beta), hybrid (beta) or auto."
+    ),
+) -> None:
+    """
+    Choose the threshold of CascadeNameDivider, which escalates names from basic mode to gbdt mode.
+    The lowest threshold whose accuracy is as high as gbdt mode is chosen.
+    The text file must have one name per line, and name must be divided py separator.
+    :param divided_name_text: File path of text file
+    :param separator: Separator between family name and given name
+    :param encoding: Encoding of text file
+    :param criterion: Confidence to compare. score or margin.
+    :param tolerance: Accuracy lower than gbdt mode which is allowed
+    :return:
+    Prints the threshold, the accuracies and the escalation rate.
+    """
+    from namedivider.divider.cascade_name_divider import select_threshold
+
+    with open(divided_name_text, "rb") as f:
+        divided_names = f.read().decode(encoding).strip().split("\n")
+    selection = select_threshold(
+        divided_names,
+        basic_divider=get_divider(mode="basic", separator=separator, backend=backend),
+        gbdt_divider=get_divider(mode="gbdt", separator=separator, backend=backend),
+        criterion=criterion,
+        separator=separator,
+        tolerance=tolerance,
+    )
+    print(f"threshold: {selection.threshold}")
+    print(
+        f"accuracy: {selection.accuracy:.04} (basic: {selection.basic_accuracy:.04}, gbdt: {selection.gbdt_accuracy:.04})"
+    )
+    print(f"escalation rate: {selection.escalation_rate:.2%}")
+
+
 @app.command()
 def benchmark(
     undivided_name_text: Path = typer.Argument(
@@ -144,7 +249,12 @@ def benchmark(
     encoding: str = typer.Option("utf-8", "--encoding", "-e", help="Encoding of text file"),
     silent: bool = typer.Option(False, "--silent", help="Suppress output for benchmarking"),
     use_mask_cache: bool = typer.Option(True, "--use-mask-cache/--no-mask-cache", help="Enable or disable mask cache"),
-    backend: str = typer.Option("python", "--backend", "-b", help="Backend to use. python (default) or rust (beta)."),
+    backend: str = typer.Option(
+        "python",
+        "--backend",
+        "-b",
+        help="Backend to use. python (default), rust (beta), hybrid (beta), numba (basic mode only) or auto.",
+    ),
 ) -> None:
     """
     Benchmark the performance of name division on a file (single run).
@@ -190,5 +300,375 @@ def benchmark(
         )
 
 
+@app.command()
+def benchmark_threads(
+    undivided_name_text: Path = typer.Argument(
+        ..., help="File path of text file", exists=True, dir_okay=False, readable=True
+    ),
+    separator: str = typer.Option(" ", "--separator", "-s", help="Separator between family name and given name"),
+    mode: str = typer.Option("basic", "--mode", "-m", help="Divider Mode. You can choice basic or gbdt."),
+    encoding: str = typer.Option("utf-8", "--encoding", "-e", help="Encoding of text file"),
+    max_threads: int = typer.Option(4, "--max-threads", "-t", help="Maximum number of threads", min=1),
+    use_mask_cache: bool = typer.Option(True, "--use-mask-cache/--no-mask-cache", help="Enable or disable mask cache"),
+) -> None:
+    """
+    Benchmark the scaling of divide_names from 1 to max_threads threads sharing one divider.
+    Names are divided in parallel only on free-threaded builds (e.g. python3.13t) running without the GIL.
+    The text file must have one name per line.
+    :param undivided_name_text: File path of text file
+    :param separator: Separator between family name and given name
+    :param mode: Divider Mode. You can choice basic or gbdt.
+    :param encoding: Encoding of text file
+    :param max_threads: Maximum number of threads
+    :param use_mask_cache: Enable or disable mask cache
+    :return:
+    Reports throughput, speedup and scaling efficiency for each number of threads.
+    ```
+    GIL enabled: False
+    threads=1: 4152.8 names/sec, speedup 1.00x, efficiency 100.0%
+    threads=2: 8012.3 names/sec, speedup 1.93x, efficiency 96.5%
+    threads=4: 15300.1 names/sec, speedup 3.68x, efficiency 92.1%
+    ```
+    """
+    divider = get_divider(mode=mode, separator=separator, use_mask_cache=use_mask_cache)
+
+    with open(undivided_name_text, "rb") as f:
+        undivided_names = f.read().decode(encoding).strip().split("\n")
+
+    print(f"GIL enabled: {is_gil_enabled()}")
+    num_threads_list = []
+    num_threads = 1
+    while num_threads < max_threads:
+        num_threads_list.append(num_threads)
+        num_threads *= 2
+    num_threads_list.append(max_threads)
+
+    # Warm up the caches, so that threads=1 is not measured with cold caches.
+    divider.divide_names(undivided_names)
+    base_names_per_sec = 0.0
+    for _num_threads in num_threads_list:
+        start_time = time.perf_counter()
+        divider.divide_names(undivided_names, num_threads=_num_threads)
+        elapsed = time.perf_counter() - start_time
+        names_per_sec = len(undivided_names) / elapsed if elapsed > 0 else float("inf")
+        if _num_threads == 1:
+            base_names_per_sec = names_per_sec
+        speedup = names_per_sec / base_names_per_sec
+        print(
+            f"threads={_num_threads}: {names_per_sec:.1f} names/sec, "
+            f"speedup {speedup:.2f}x, efficiency {speedup / _num_threads:.1%}"
+        )
+
+
+@app.command()
+def kanji_csv(
+    shard_dir: Path = typer.Argument(
+        ..., help="Directory of text files with divided names", exists=True, file_okay=False, readable=True
+    ),
+    output: Path = typer.Argument(..., help="Path of kanji.csv to write"),
+    pattern: str = typer.Option("*.txt", "--pattern", "-p", help="Glob pattern of the text files in shard_dir"),
+    separator: str = typer.Option(" ", "--separator", "-s", help="Separator between family name and given name"),
+    encoding: str = typer.Option("utf-8", "--encoding", "-e", help="Encoding of text files"),
+    statistics_mode: str = typer.Option(
+        "only_frequent_kanji", "--statistics-mode", help="Kanji to write. only_frequent_kanji, only_kanji or all."
+    ),
+    workers: Optional[int] = typer.Option(None, "--workers", "-w", help="Number of processes. Defaults to all cores."),
+    base_checkpoint: Optional[Path] = typer.Option(
+        None, "--base-checkpoint", help="Checkpoint to add the counts to, for incremental updates", exists=True
+    ),
+    save_checkpoint: Optional[Path] = typer.Option(None, "--save-checkpoint", help="Path to save the merged counts"),
+) -> None:
+    """
+    Builds kanji.csv from a directory of sharded text files, counting each file in a separate process.
+    Each text file must have one divided name per line (e.g. "菅 義偉").
+    For incremental updates, pass only the new files with --base-checkpoint pointing to the previous counts.
+    :param shard_dir: Directory of text files with divided names
+    :param output: Path of kanji.csv to write
+    :param pattern: Glob pattern of the text files in shard_dir
+    :param separator: Separator between family name and given name
+    :param encoding: Encoding of text files
+    :param statistics_mode: Kanji to write. only_frequent_kanji, only_kanji or all.
+    :param workers: Number of processes. Defaults to all cores.
+    :param base_checkpoint: Checkpoint to add the counts to
+    :param save_checkpoint: Path to save the merged counts
+    """
+    paths = sorted(shard_dir.glob(pattern))
+    if len(paths) == 0:
+        raise typer.BadParameter(f"No files match {pattern} in {shard_dir}")
+    base = None if base_checkpoint is None else BatchKanjiStatisticsTaker.load_checkpoint(base_checkpoint)
+    start_time = time.perf_counter()
+    taker = take_from_files(
+        paths,
+        mode=KanjiStatisticsMode[statistics_mode.upper()],
+        separator=separator,
+        encoding=encoding,
+        num_workers=workers,
+        base=base,
+    )
+    taker.to_csv(output)
+    if save_checkpoint is not None:
+        taker.save_checkpoint(save_checkpoint)
+    elapsed = time.perf_counter() - start_time
+    print(f"Counted {len(paths)} files into {len(taker.kanjis)} characters in {elapsed:.2f}s")
+
+
+train_app = typer.Typer(help="Train GBDTNameDivider from divided names.")
+app.add_typer(train_app, name="train")
+
+
+@train_app.command("augment")
+def train_augment(
+    src: Path = typer.Argument(..., help="Text file of divided names", exists=True, dir_okay=False, readable=True),
+    dst: Path = typer.Argument(..., help="Text file to write augmented names"),
+    factor: int = typer.Option(7, "--factor", help="Number of times to shuffle family names and given names"),
+    seed: Optional[int] = typer.Option(None, "--seed", help="Seed of the shuffle"),
+    separator: str = typer.Option(" ", "--separator", "-s", help="Separator between family name and given name"),
+    encoding: str = typer.Option("utf-8", "--encoding", "-e", help="Encoding of text file"),
+) -> None:
+    """
+    Augments divided names by shuffling family names and given names.
+    Names with characters other than kanji are skipped.
+    """
+    from namedivider.training.gbdt_training import augment_names, read_divided_names
+
+    num_names = 0
+    with open(dst, "w", encoding=encoding) as f:
+        for _divided_name in augment_names(
+            read_divided_names(src, separator=separator, encoding=encoding),
+            factor=factor,
+            separator=separator,
+            seed=seed,
+        ):
+            f.write(_divided_name + "\n")
+            num_names += 1
+    print(f"Wrote {num_names} names into {dst}")
+
+
+@train_app.command("family-names")
+def train_family_names(
+    src: Path = typer.Argument(..., help="Text file of divided names", exists=True, dir_okay=False, readable=True),
+    dst: Path = typer.Argument(..., help="Text file to write family names ranked by frequency"),
+    separator: str = typer.Option(" ", "--separator", "-s", help="Separator between family name and given name"),
+    encoding: str = typer.Option("utf-8", "--encoding", "-e", help="Encoding of text file"),
+) -> None:
+    """
+    Ranks family names by frequency. The output can be used as GBDTNameDividerConfig.path_family_names.
+    """
+    from namedivider.training.gbdt_training import (
+        count_family_names,
+        read_divided_names,
+    )
+
+    family_names = count_family_names(read_divided_names(src, separator=separator, encoding=encoding), separator)
+    with open(dst, "wb") as f:
+        f.write(os.linesep.join(family_names).encode())
+    print(f"Wrote {len(family_names)} family names into {dst}")
+
+
+@train_app.command("features")
+def train_features(
+    src: Path = typer.Argument(..., help="Text file of divided names", exists=True, dir_okay=False, readable=True),
+    dst_dir: Path = typer.Argument(..., help="Directory to write feature chunks. Chunks already in it are removed"),
+    path_csv: Path = typer.Option(KANJI_CSV_DEFAULT_PATH, "--kanji-csv", help="Path of kanji.csv"),
+    path_family_names: Path = typer.Option(
+        FAMILY_NAME_PKL_DEFAULT_PATH, "--family-names", help="Path of family names (.pickle or text file)"
+    ),
+    chunk_size: int = typer.Option(100000, "--chunk-size", help="Number of names in a chunk"),
+    workers: int = typer.Option(1, "--workers", "-w", help="Number of processes extracting features"),
+    separator: str = typer.Option(" ", "--separator", "-s", help="Separator between family name and given name"),
+    encoding: str = typer.Option("utf-8", "--encoding", "-e", help="Encoding of text file"),
+) -> None:
+    """
+    Extracts features of all candidates of divided names into chunked .npy files.
+    Names with characters other than kanji are skipped.
+    """
+    from namedivider.training.gbdt_training import (
+        read_divided_names,
+        write_feature_chunks,
+    )
+
+    num_rows = write_feature_chunks(
+        read_divided_names(src, separator=separator, encoding=encoding),
+        dst_dir,
+        path_csv=path_csv,
+        path_family_names=path_family_names,
+        separator=separator,
+        chunk_size=chunk_size,
+        num_workers=workers,
+    )
+    print(f"Wrote {num_rows} rows into {dst_dir}")
+
+
+@train_app.command("fit")
+def train_fit(
+    train_dir: Path = typer.Argument(..., help="Directory of feature chunks for training", exists=True),
+    dst: Path = typer.Argument(..., help="Path to save the model"),
+    valid_dir: Optional[Path] = typer.Option(
+        None, "--valid-dir", help="Directory of feature chunks for validation", exists=True
+    ),
+    num_boost_round: Optional[int] = typer.Option(
+        None,
+        "--num-boost-round",
+        help="Maximum number of boosting rounds. Defaults to 10000 with --valid-dir, and 100 without it",
+        min=1,
+    ),
+    early_stopping_rounds: int = typer.Option(200, "--early-stopping-rounds", help="Used with --valid-dir"),
+    learning_rate: float = typer.Option(0.1, "--learning-rate", help="Learning rate of LightGBM"),
+    num_threads: int = typer.Option(0, "--num-threads", "-t", help="Number of threads of LightGBM. 0 means default"),
+) -> None:
+    """
+    Trains the GBDT model from feature chunks. The model can be used as GBDTNameDividerConfig.path_model.
+    """
+    from namedivider.training.gbdt_training import train_gbdt
+
+    model = train_gbdt(
+        train_dir,
+        dst,
+        valid_dir=valid_dir,
+        params={"learning_rate": learning_rate},
+        num_boost_round=num_boost_round,
+        early_stopping_rounds=early_stopping_rounds,
+        num_threads=num_threads,
+    )
+    print(f"Saved the model with {model.num_trees()} trees into {dst}")
+
+
+@train_app.command("run")
+def train_run(
+    src_train: Path = typer.Argument(
+        ..., help="Text file of divided names for training", exists=True, dir_okay=False, readable=True
+    ),
+    src_valid: Path = typer.Argument(
+        ..., help="Text file of divided names for validation", exists=True, dir_okay=False, readable=True
+    ),
+    out_dir: Path = typer.Argument(..., help="Directory to write the outputs"),
+    path_csv: Path = typer.Option(KANJI_CSV_DEFAULT_PATH, "--kanji-csv", help="Path of kanji.csv"),
+    path_family_names: Path = typer.Option(
+        FAMILY_NAME_PKL_DEFAULT_PATH, "--family-names", help="Path of family names (.pickle or text file)"
+    ),
+    factor: int = typer.Option(7, "--factor", help="Number of times to shuffle family names and given names"),
+    seed: Optional[int] = typer.Option(None, "--seed", help="Seed of the shuffle"),
+    chunk_size: int = typer.Option(100000, "--chunk-size", help="Number of names in a chunk"),
+    workers: int = typer.Option(1, "--workers", "-w", help="Number of processes extracting features"),
+    num_threads: int = typer.Option(0, "--num-threads", "-t", help="Number of threads of LightGBM. 0 means default"),
+    separator: str = typer.Option(" ", "--separator", "-s", help="Separator between family name and given name"),
+    encoding: str = typer.Option("utf-8", "--encoding", "-e", help="Encoding of text file"),
+) -> None:
+    """
+    Runs augmentation, feature extraction and training, streaming names without writing augmented names.
+    Writes out_dir/features/{train,valid} and out_dir/gbdt_model.txt.
+    """
+    from namedivider.training.gbdt_training import (
+        augment_names,
+        read_divided_names,
+        train_gbdt,
+        write_feature_chunks,
+    )
+
+    for _name, _names in [
+        (
+            "train",
+            augment_names(
+                read_divided_names(src_train, separator=separator, encoding=encoding),
+                factor=factor,
+                separator=separator,
+                seed=seed,
+            ),
+        ),
+        ("valid", read_divided_names(src_valid, separator=separator, encoding=encoding)),
+    ]:
+        num_rows = write_feature_chunks(
+            _names,
+            out_dir / "features" / _name,
+            path_csv=path_csv,
+            path_family_names=path_family_names,
+            separator=separator,
+            chunk_size=chunk_size,
+            num_workers=workers,
+        )
+        print(f"Extracted {num_rows} rows for {_name}")
+    path_model = out_dir / "gbdt_model.txt"
+    train_gbdt(
+        out_dir / "features" / "train", path_model, valid_dir=out_dir / "features" / "valid", num_threads=num_threads
+    )
+    print(
+        f"Saved the model into {path_model}. "
+        f"Use GBDTNameDividerConfig(path_csv='{path_csv}', path_family_names='{path_family_names}', "
+        f"path_model='{path_model}')"
+    )
+
+
+assets_app = typer.Typer(help="Manage the downloaded assets without network access.")
+app.add_typer(assets_app, name="assets")
+
+
+@assets_app.command("status")
+def assets_status(
+    cache_dir: Path = typer.Option(DEFAULT_CACHE_DIR, "--cache-dir", help="Directory of the assets"),
+) -> None:
+    """
+    Reports which assets are missing, verified or corrupted. No network access is done.
+    :param cache_dir: Directory of the assets
+    :return:
+    ```
+    gbdt_model_v1: verified (/root/.cache/namedivider-python/gbdt_model_v1.txt)
+    family_name_repository: missing (/root/.cache/namedivider-python/family_name_repository.pickle)
+    ```
+    Exits with code 1 if any asset is missing or corrupted.
+    """
+    ok = True
+    for _status in AssetManager(cache_dir).status():
+        if not _status.exists:
+            state = "missing"
+        elif _status.corrupted:
+            state = "corrupted"
+        elif _status.verified:
+            state = "verified"
+        else:
+            state = "unverified"
+        ok = ok and state not in ("missing", "corrupted")
+        print(f"{_status.name}: {state} ({_status.path})")
+    if not ok:
+        raise typer.Exit(code=1)
+
+
+@assets_app.command("stage")
+def assets_stage(
+    source: Path = typer.Argument(..., help="Directory or tarball containing the assets", exists=True),
+    cache_dir: Path = typer.Option(DEFAULT_CACHE_DIR, "--cache-dir", help="Directory of the assets"),
+    snapshot: bool = typer.Option(False, "--snapshot", help="Also build a snapshot of GBDTNameDivider"),
+) -> None:
+    """
+    Stages the assets from a directory or a tarball created by `nmdiv assets bundle`.
+    Assets are verified against manifest.json in the source, if it exists.
+    :param source: Directory or tarball containing the assets
+    :param cache_dir: Directory of the assets
+    :param snapshot: Also build a snapshot of GBDTNameDivider (See GBDTNameDivider.load_snapshot)
+    """
+    manager = AssetManager(cache_dir)
+    for _name in manager.stage(source):
+        print(f"Staged {_name}")
+    missing = manager.missing()
+    if len(missing) > 0:
+        print(f"Missing: {', '.join(missing)}")
+        raise typer.Exit(code=1)
+    if snapshot:
+        print(f"Built snapshot {manager.build_snapshot()}")
+
+
+@assets_app.command("bundle")
+def assets_bundle(
+    output: Path = typer.Argument(..., help="Path of the tarball (.tar.gz)"),
+    cache_dir: Path = typer.Option(DEFAULT_CACHE_DIR, "--cache-dir", help="Directory of the assets"),
+) -> None:
+    """
+    Writes the assets and their checksums into a tarball, to be staged on machines without network access.
+    :param output: Path of the tarball (.tar.gz)
+    :param cache_dir: Directory of the assets
+    """
+    AssetManager(cache_dir).bundle(output)
+    print(f"Bundled assets into {output}")
+
+
 if __name__ == "__main__":
     app()
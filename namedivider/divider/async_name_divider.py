@@ -0,0 +1,249 @@
+"""
+Asyncio support for namedivider.
+
+This module provides a facade that runs name division in an executor,
+so that event loop based applications (e.g. web services) are not blocked by a large batch.
+"""
+import asyncio
+import os
+from collections.abc import Sequence
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Optional
+
+from namedivider.divider.config import NameDividerConfigBase
+from namedivider.divider.divided_name import DividedName
+from namedivider.divider.factory import create_divider_from_config
+from namedivider.divider.name_divider_base import _NameDivider
+
+# Divider owned by each worker process of ProcessPoolExecutor.
+_worker_divider: Optional[_NameDivider] = None
+
+
+def _init_worker(config: NameDividerConfigBase) -> None:
+    """
+    Initializer of worker processes. Each process builds its own divider once.
+    :param config: Configuration of NameDivider.
+    """
+    global _worker_divider
+    _worker_divider = create_divider_from_config(config)
+
+
+def _divide_names_in_worker(undivided_names: list[str]) -> list[DividedName]:
+    """
+    Divides names with the divider owned by the worker process.
+    :param undivided_names: Names with no space between the family name and given name
+    :return: Divided names
+    """
+    if _worker_divider is None:
+        raise RuntimeError("Worker process is not initialized.")
+    return _worker_divider.divide_names(undivided_names)
+
+
+class AsyncNameDivider:
+    """
+    Asyncio facade for BasicNameDivider and GBDTNameDivider.
+
+    Batches are offloaded to an executor so that the event loop keeps serving other requests.
+    At most `max_in_flight` batches are submitted to the executor at the same time,
+    and concurrent small requests are coalesced into one batch of up to `max_batch_size` names.
+
+    :example
+    -----------------------------------------------------
+    >>> from namedivider import BasicNameDivider
+    >>> from namedivider.divider.async_name_divider import AsyncNameDivider
+    >>> async_divider = AsyncNameDivider(BasicNameDivider())
+    >>> await async_divider.adivide_names(["菅義偉", "阿部晋三"])
+    [DividedName(family='菅', given='義偉', ...), DividedName(family='阿部', given='晋三', ...)]
+    -----------------------------------------------------
+    """
+
+    def __init__(
+        self,
+        divider: Optional[_NameDivider],
+        executor: Optional[Executor] = None,
+        max_in_flight: int = 4,
+        max_batch_size: int = 256,
+        max_delay: float = 0.002,
+    ):
+        """
+        :param divider: NameDivider to run batches.
+            If None, executor must be a process pool whose workers own their dividers (See `with_process_pool`).
+        :param executor: Executor to run batches. If None, ThreadPoolExecutor owned by this instance is used.
+        :param max_in_flight: Maximum number of batches submitted to the executor at the same time.
+        :param max_batch_size: Maximum number of names in a batch.
+            Larger requests are split, and smaller concurrent requests are coalesced up to this size.
+        :param max_delay: Maximum seconds a small request waits to be coalesced with other requests.
+        """
+        if divider is None and executor is None:
+            raise ValueError("Either divider or executor must be specified.")
+        if max_in_flight < 1:
+            raise ValueError(f"max_in_flight must be at least 1, but got {max_in_flight}")
+        if max_batch_size < 1:
+            raise ValueError(f"max_batch_size must be at least 1, but got {max_batch_size}")
+        self.divider = divider
+        self.max_in_flight = max_in_flight
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self._owns_executor = executor is None
+        self._executor: Executor = executor if executor is not None else ThreadPoolExecutor(max_workers=max_in_flight)
+        self._batch_fn: Callable[[list[str]], list[DividedName]] = _divide_names_in_worker
+        if divider is not None:
+            self._batch_fn = divider.divide_names
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._pending: list[tuple[list[str], "asyncio.Future[list[DividedName]]"]] = []
+        self._pending_count = 0
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._tasks: set["asyncio.Future[list[DividedName]]"] = set()
+
+    @classmethod
+    def with_process_pool(
+        cls,
+        config: NameDividerConfigBase,
+        max_workers: Optional[int] = None,
+        max_in_flight: Optional[int] = None,
+        max_batch_size: int = 256,
+        max_delay: float = 0.002,
+    ) -> "AsyncNameDivider":
+        """
+        Create instance that runs batches in worker processes.
+        Each worker process builds its own divider from config once, so config must be picklable.
+        :param config: Configuration of NameDivider.
+        :param max_workers: Number of worker processes. If None, the number of CPUs is used.
+        :param max_in_flight: Maximum number of batches submitted at the same time. If None, max_workers is used.
+        :param max_batch_size: Maximum number of names in a batch.
+        :param max_delay: Maximum seconds a small request waits to be coalesced with other requests.
+        :return: AsyncNameDivider instance
+        :rtype: AsyncNameDivider
+        """
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+        executor = ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(config,))
+        instance = cls(
+            divider=None,
+            executor=executor,
+            max_in_flight=max_in_flight if max_in_flight is not None else max_workers,
+            max_batch_size=max_batch_size,
+            max_delay=max_delay,
+        )
+        instance._owns_executor = True
+        return instance
+
+    async def adivide_name(self, undivided_name: str) -> DividedName:
+        """
+        Divides undivided name without blocking the event loop.
+        :param undivided_name: Names with no space between the family name and given name
+        :return: Divided name
+        :rtype: DividedName
+        """
+        divided_names = await self.adivide_names([undivided_name])
+        return divided_names[0]
+
+    async def adivide_names(self, undivided_names: Sequence[str]) -> list[DividedName]:
+        """
+        Divides undivided names without blocking the event loop.
+        :param undivided_names: Names with no space between the family name and given name
+        :return: Divided names, in the same order as undivided_names
+        :rtype: list[DividedName]
+        """
+        names = list(undivided_names)
+        # Validate here so that an invalid name does not fail the other requests coalesced into the same batch.
+        for _name in names:
+            _NameDivider._validate(_name)
+        if len(names) == 0:
+            return []
+
+        if len(names) >= self.max_batch_size:
+            return await self._run_batches(names)
+
+        loop = asyncio.get_running_loop()
+        future: "asyncio.Future[list[DividedName]]" = loop.create_future()
+        self._pending.append((names, future))
+        self._pending_count += len(names)
+        if self._pending_count >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.max_delay, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        """
+        Submits pending requests as one batch.
+        """
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        pending = self._pending
+        self._pending = []
+        self._pending_count = 0
+        if len(pending) == 0:
+            return
+        batch = [_name for _names, _ in pending for _name in _names]
+        task = asyncio.ensure_future(self._run_batches(batch))
+        self._tasks.add(task)
+        task.add_done_callback(partial(self._scatter, pending))
+
+    def _scatter(
+        self,
+        pending: list[tuple[list[str], "asyncio.Future[list[DividedName]]"]],
+        task: "asyncio.Future[list[DividedName]]",
+    ) -> None:
+        """
+        Returns the results of a coalesced batch to each waiter.
+        """
+        self._tasks.discard(task)
+        if task.cancelled():
+            for _, _future in pending:
+                _future.cancel()
+            return
+        exception = task.exception()
+        if exception is not None:
+            for _, _future in pending:
+                if not _future.done():
+                    _future.set_exception(exception)
+            return
+        results = task.result()
+        offset = 0
+        for _names, _future in pending:
+            if not _future.done():
+                _future.set_result(results[offset : offset + len(_names)])
+            offset += len(_names)
+
+    async def _run_batches(self, names: list[str]) -> list[DividedName]:
+        """
+        Splits names into batches of up to `max_batch_size` names, and runs them concurrently.
+        """
+        batches = [names[i : i + self.max_batch_size] for i in range(0, len(names), self.max_batch_size)]
+        results = await asyncio.gather(*[self._run_batch(_batch) for _batch in batches])
+        return [_divided_name for _result in results for _divided_name in _result]
+
+    async def _run_batch(self, batch: list[str]) -> list[DividedName]:
+        """
+        Runs a batch in the executor, waiting while `max_in_flight` batches are already running.
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, self._batch_fn, batch)
+
+    def close(self) -> None:
+        """
+        Shuts down the executor if it is owned by this instance, waiting for the running batches.
+        In a coroutine, use `aclose` instead, which does not block the event loop.
+        """
+        if self._owns_executor:
+            self._executor.shutdown(wait=True)
+
+    async def __aenter__(self) -> "AsyncNameDivider":
+        return self
+
+    async def aclose(self) -> None:
+        """
+        Shuts down the executor like `close`, waiting for the running batches without blocking the event loop.
+        """
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.close)
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.aclose()
@@ -0,0 +1,177 @@
+"""
+Selection of the backend for backend="auto".
+
+The available backends are probed in the order of BACKEND_PREFERENCE, and the first one which supports
+the configuration is chosen. With auto_benchmark=True, every compatible backend divides a built-in sample
+of names, and the fastest one is chosen instead.
+"""
+import dataclasses
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Optional
+
+from namedivider.divider.config import (
+    BasicNameDividerConfig,
+    GBDTNameDividerConfig,
+    NameDividerConfigBase,
+)
+
+if TYPE_CHECKING:
+    from namedivider.divider.name_divider_base import _NameDivider
+
+# Backends from the fastest one in general.
+BACKEND_PREFERENCE = ("rust", "hybrid", "numba", "python")
+
+# Names divided by the self-benchmark. Rules do not apply to them, so every backend divides them with its algorithm.
+BENCHMARK_SAMPLE_NAMES = (
+    "菅義偉",
+    "安倍晋三",
+    "野田佳彦",
+    "菅直人",
+    "鳩山由紀夫",
+    "麻生太郎",
+    "福田康夫",
+    "小泉純一郎",
+    "森喜朗",
+    "小渕恵三",
+    "橋本龍太郎",
+    "村山富市",
+    "羽田孜",
+    "細川護熙",
+    "宮沢喜一",
+    "海部俊樹",
+    "宇野宗佑",
+    "竹下登",
+    "中曽根康弘",
+    "鈴木善幸",
+)
+# Number of times the sample is repeated in one measurement.
+BENCHMARK_REPEAT = 10
+
+
+@dataclass(frozen=True)
+class BackendChoice:
+    """
+    backend: Chosen backend.
+    reason: Why the backend was chosen.
+    unavailable: Reasons why the other backends can not be used, by backend.
+    names_per_sec: Speed of each compatible backend measured by the self-benchmark, by backend.
+    """
+
+    backend: str
+    reason: str
+    unavailable: dict[str, str] = field(default_factory=dict)
+    names_per_sec: dict[str, float] = field(default_factory=dict)
+
+
+def probe_backends(config: NameDividerConfigBase) -> dict[str, Optional[str]]:
+    """
+    Checks whether each backend can be used with the configuration, without creating dividers.
+    :param config: BasicNameDividerConfig or GBDTNameDividerConfig
+    :return: None for each compatible backend, or the reason why it can not be used, in the order of preference.
+    :rtype: dict[str, Optional[str]]
+    """
+    from namedivider.divider.rust_backend import (
+        RustBackendNotAvailableError,
+        RustBackendUnsupportedConfigError,
+        _try_import_rust_backend,
+        get_hybrid_asset_paths,
+        validate_rust_basic_config,
+        validate_rust_gbdt_config,
+    )
+
+    results: dict[str, Optional[str]] = {}
+    try:
+        namedivider_core = _try_import_rust_backend()
+    except RustBackendNotAvailableError:
+        namedivider_core = None
+
+    for _backend in BACKEND_PREFERENCE:
+        if _backend == "python":
+            results[_backend] = None
+            continue
+        if _backend == "numba":
+            results[_backend] = _probe_numba_backend(config)
+            continue
+        if namedivider_core is None:
+            results[_backend] = "namedivider-core is not installed."
+            continue
+        try:
+            if _backend == "rust":
+                if isinstance(config, GBDTNameDividerConfig):
+                    validate_rust_gbdt_config(config)
+                else:
+                    validate_rust_basic_config(config)
+            else:
+                get_hybrid_asset_paths(config, namedivider_core)
+            results[_backend] = None
+        except RustBackendUnsupportedConfigError as e:
+            results[_backend] = str(e)
+    return results
+
+
+def _probe_numba_backend(config: NameDividerConfigBase) -> Optional[str]:
+    """
+    Checks whether backend="numba" can be used with the configuration.
+    :return: None if compatible, or the reason why it can not be used.
+    """
+    from namedivider.divider.numba_backend import is_numba_available
+
+    if "numba" not in config.valid_backends:
+        return f"backend='numba' is not supported by {type(config).__name__}."
+    if config.prune_candidates:
+        return "prune_candidates=True is not supported by backend='numba'."
+    if not is_numba_available():
+        return "numba is not installed."
+    return None
+
+
+def _measure_names_per_sec(divider: "_NameDivider") -> float:
+    """
+    Measures the speed of divide_names with the built-in sample. The best of a few runs is used.
+    """
+    names = list(BENCHMARK_SAMPLE_NAMES) * BENCHMARK_REPEAT
+    # The first call warms up caches of the divider.
+    divider.divide_names(names)
+    elapsed = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        divider.divide_names(names)
+        elapsed = min(elapsed, time.perf_counter() - start)
+    return len(names) / max(elapsed, 1e-9)
+
+
+def select_backend(
+    config: NameDividerConfigBase, divider_class: type["_NameDivider"], benchmark: bool = False
+) -> BackendChoice:
+    """
+    Chooses the backend for backend="auto".
+    :param config: BasicNameDividerConfig or GBDTNameDividerConfig
+    :param divider_class: Class of the divider to create, which is used by the self-benchmark.
+    :param benchmark: If True, the fastest compatible backend on the built-in sample is chosen.
+        Otherwise, the first compatible backend in BACKEND_PREFERENCE is chosen.
+    :return: Chosen backend and the reason
+    :rtype: BackendChoice
+    """
+    if not isinstance(config, (BasicNameDividerConfig, GBDTNameDividerConfig)):
+        raise TypeError(f"Expected BasicNameDividerConfig or GBDTNameDividerConfig, got {type(config).__name__}")
+    probes = probe_backends(config)
+    unavailable = {_backend: _reason for _backend, _reason in probes.items() if _reason is not None}
+    compatible = [_backend for _backend, _reason in probes.items() if _reason is None]
+
+    if not benchmark or len(compatible) == 1:
+        backend = compatible[0]
+        skipped = list(BACKEND_PREFERENCE[: BACKEND_PREFERENCE.index(backend)])
+        if len(skipped) == 0:
+            reason = f"'{backend}' is the fastest backend and supports the configuration."
+        else:
+            reason = f"'{backend}' is the fastest backend available, because {', '.join(skipped)} can not be used."
+        return BackendChoice(backend=backend, reason=reason, unavailable=unavailable)
+
+    names_per_sec = {
+        _backend: _measure_names_per_sec(divider_class(dataclasses.replace(config, backend=_backend)))
+        for _backend in compatible
+    }
+    backend = max(names_per_sec, key=lambda _backend: names_per_sec[_backend])
+    reason = f"'{backend}' was the fastest in the self-benchmark ({names_per_sec[backend]:.1f} names/sec)."
+    return BackendChoice(backend=backend, reason=reason, unavailable=unavailable, names_per_sec=names_per_sec)
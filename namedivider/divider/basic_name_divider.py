@@ -1,5 +1,10 @@
-from typing import Optional
+import dataclasses
+import warnings
+from collections.abc import Sequence
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional, Union
 
+from namedivider.divider.backend_selection import BackendChoice
 from namedivider.divider.config import BasicNameDividerConfig
 from namedivider.divider.divided_name import DividedName
 from namedivider.divider.name_divider_base import _NameDivider
@@ -7,22 +12,36 @@ from namedivider.divider.rust_backend import RustNameDividerWrapper
 from namedivider.feature.extractor import SimpleFeatureExtractor
 from namedivider.feature.kanji import KanjiStatisticsRepository
 
+if TYPE_CHECKING:
+    from namedivider.divider.model_store import ModelStore
+    from namedivider.divider.numba_backend import NumbaDivisionEngine
+
 
 class BasicNameDivider(_NameDivider):
     """
     NameDivider with basic algorithm.
     Prior to v0.1.0, this was provided as a 'NameDivider' class.
 
-    Supports both Python (default) and Rust (beta) backends.
+    Supports Python (default), Rust (beta), hybrid (beta) and numba backends.
     """
 
+    # Kernel compiled by numba, which is set only with backend="numba".
+    _numba_engine: Optional["NumbaDivisionEngine"] = None
+
     def __init__(self, config: Optional[BasicNameDividerConfig] = None):
         if config is None:
             config = BasicNameDividerConfig()
 
+        if config.backend == "auto":
+            config = self._select_backend(config)
+
         # Initialize based on backend selection
         if config.backend == "rust":
             self._init_rust_backend(config)
+        elif config.backend == "hybrid":
+            self._init_hybrid_backend(config)
+        elif config.backend == "numba":
+            config = self._init_numba_backend(config)
         else:
             # Default Python backend - preserve existing behavior
             self._init_python_backend(config)
@@ -32,11 +51,67 @@ class BasicNameDivider(_NameDivider):
     def _init_python_backend(self, config: BasicNameDividerConfig) -> None:
         """Initialize Python backend (default behavior)."""
         repository = KanjiStatisticsRepository(path_csv=config.path_csv)
+        self._init_python_backend_from_assets(config, repository)
+
+    def _init_python_backend_from_assets(
+        self, config: BasicNameDividerConfig, repository: KanjiStatisticsRepository
+    ) -> None:
+        """Initialize Python backend with loaded assets."""
         self.only_order_score_when_4 = config.only_order_score_when_4
         self.feature_extractor = SimpleFeatureExtractor(
             kanji_statistics_repository=repository, cache_mask=config.cache_mask
         )
         self._rust_divider: Optional[RustNameDividerWrapper] = None
+        if config.prune_candidates:
+            from namedivider.divider.candidate_pruner import CandidatePruner
+
+            self.candidate_pruner = CandidatePruner(repository)
+
+    @classmethod
+    def from_model_store(
+        cls, store: "ModelStore", config: Optional[BasicNameDividerConfig] = None
+    ) -> "BasicNameDivider":
+        """
+        Create instance with the kanji statistics in a model store instead of loading them from config.path_csv.
+        Kanji statistics are read from the store without copying.
+        :param store: ModelStore
+        :param config: Configuration of NameDivider. Paths in config are ignored. Only Python backend is supported.
+        :return: BasicNameDivider instance
+        :rtype: BasicNameDivider
+        """
+        if config is None:
+            config = BasicNameDividerConfig()
+        if config.backend != "python":
+            raise ValueError(f"Only backend='python' is supported with a model store, but got '{config.backend}'")
+        divider = cls.__new__(cls)
+        divider._init_python_backend_from_assets(config, store.kanji_statistics_repository())
+        super(BasicNameDivider, divider).__init__(config=config)
+        return divider
+
+    def save_snapshot(self, path: Union[str, Path]) -> None:
+        """
+        Writes the prepared assets and the configuration into a snapshot file for fast warm start.
+        Only Python backend is supported.
+        :param path: Path of the snapshot file.
+        """
+        from namedivider.divider.snapshot import save_snapshot
+
+        save_snapshot(self, path)
+
+    @classmethod
+    def load_snapshot(cls, path: Union[str, Path]) -> "BasicNameDivider":
+        """
+        Create instance from a snapshot file written by save_snapshot, without reading the source assets.
+        :param path: Path of the snapshot file.
+        :return: BasicNameDivider instance
+        :rtype: BasicNameDivider
+        """
+        from namedivider.divider.snapshot import load_snapshot
+
+        divider = load_snapshot(path)
+        if not isinstance(divider, cls):
+            raise TypeError(f"{path} is a snapshot of {type(divider).__name__}, not {cls.__name__}.")
+        return divider
 
     def _init_rust_backend(self, config: BasicNameDividerConfig) -> None:
         """Initialize Rust backend (beta feature)."""
@@ -46,6 +121,41 @@ class BasicNameDivider(_NameDivider):
         self.only_order_score_when_4 = config.only_order_score_when_4
         # Python-specific feature_extractor is not set for Rust backend
 
+    def _init_hybrid_backend(self, config: BasicNameDividerConfig) -> None:
+        """Initialize hybrid backend, which applies rules in Python and divides the other names in Rust (beta)."""
+        from namedivider.divider.rust_backend import create_rust_basic_divider
+
+        self._rust_divider = None
+        self._hybrid_divider = create_rust_basic_divider(config)
+        self.only_order_score_when_4 = config.only_order_score_when_4
+
+    def _init_numba_backend(self, config: BasicNameDividerConfig) -> BasicNameDividerConfig:
+        """
+        Initialize Python backend with the kernel compiled by numba.
+        If numba is not installed, Python backend is used with a warning.
+        :param config: Configuration with backend="numba"
+        :return: Configuration with the backend actually used
+        """
+        from namedivider.divider.numba_backend import (
+            NumbaDivisionEngine,
+            NumbaNotAvailableError,
+        )
+
+        if config.prune_candidates:
+            raise ValueError("prune_candidates=True is not supported with backend='numba'.")
+        self._init_python_backend(config)
+        try:
+            self._numba_engine = NumbaDivisionEngine(
+                self.feature_extractor.kanji_statistics_repository, config.only_order_score_when_4
+            )
+        except NumbaNotAvailableError:
+            warnings.warn("numba is not installed, so backend='python' is used instead of 'numba'.", stacklevel=3)
+            self.backend_choice = BackendChoice(
+                backend="python", reason="backend='numba' fell back to 'python', because numba is not installed."
+            )
+            return dataclasses.replace(config, backend="python")
+        return config
+
     def calc_score(self, family: str, given: str) -> float:
         """
         Calculates the score. The higher the score, the more likely the division is correct.
@@ -54,8 +164,9 @@ class BasicNameDivider(_NameDivider):
         :return: Score of dividing.
         """
         # Use Rust backend if available
-        if self._rust_divider is not None:
-            return self._rust_divider.calc_score(family, given)
+        rust_divider = self._rust_divider or self._hybrid_divider
+        if rust_divider is not None:
+            return rust_divider.calc_score(family, given)
 
         # Use Python backend (default) - feature_extractor is guaranteed to be initialized
         name = family + given
@@ -67,6 +178,38 @@ class BasicNameDivider(_NameDivider):
 
         return (order_score + length_score) / 2.0
 
+    def _divide_by_algorithm(self, undivided_name: str) -> DividedName:
+        """
+        Divides undivided name using kanji statistics.
+        :param undivided_name: Names with no space between the family name and given name
+        :return: Divided name
+        :rtype: DividedName
+        """
+        if self._numba_engine is not None:
+            return self._divide_by_algorithm_batch([undivided_name])[0]
+        return super()._divide_by_algorithm(undivided_name)
+
+    def _divide_by_algorithm_batch(self, undivided_names: Sequence[str]) -> list[DividedName]:
+        """
+        Divides undivided names using kanji statistics.
+        With backend="numba", all names are divided in one call of the compiled kernel.
+        :param undivided_names: Names with no space between the family name and given name
+        :return: Divided names
+        :rtype: list[DividedName]
+        """
+        if self._numba_engine is None:
+            return super()._divide_by_algorithm_batch(undivided_names)
+        family_lengths, scores = self._numba_engine.divide_names(undivided_names)
+        return [
+            self._create_divided_name(
+                family=_undivided_name[:_family_length],
+                given=_undivided_name[_family_length:],
+                score=_score,
+                algorithm=self.algorithm_name,
+            )
+            for _undivided_name, _family_length, _score in zip(undivided_names, family_lengths, scores)
+        ]
+
     def divide_name(self, undivided_name: str) -> DividedName:
         """
         Divides undivided name.
@@ -80,3 +223,19 @@ class BasicNameDivider(_NameDivider):
 
         # Use Python backend (default) - delegate to parent class
         return super().divide_name(undivided_name)
+
+    def divide_names(self, undivided_names: Sequence[str], num_threads: Optional[int] = 1) -> list[DividedName]:
+        """
+        Divides undivided names.
+        :param undivided_names: Names with no space between the family name and given name
+        :param num_threads: Number of threads sharing this divider (Python backend only).
+            Names are split across threads only on free-threaded builds running without the GIL.
+        :return: Divided names, in the same order as undivided_names
+        :rtype: list[DividedName]
+        """
+        # Use Rust backend if available
+        if self._rust_divider is not None:
+            return self._rust_divider.divide_names(undivided_names)
+
+        # Use Python backend (default) - delegate to parent class
+        return super().divide_names(undivided_names, num_threads=num_threads)
@@ -0,0 +1,119 @@
+"""
+Pruning of implausible divisions before scoring them.
+
+Dividers score all divisions of a name, even if most of them are implausible.
+With prune_candidates=True, CandidatePruner removes the divisions failing cheap checks, and only the rest are scored.
+This is approximate: the correct division can be pruned, and the scores are the softmax of the remaining divisions.
+"""
+from collections.abc import Sequence
+from typing import Optional
+
+import numpy as np
+
+from namedivider.feature.family_name import FamilyNameRepository
+from namedivider.feature.kanji import KanjiStatisticsRepository
+
+MAX_FAMILY_LENGTH = 5
+MAX_GIVEN_LENGTH = 5
+# Kanji used fewer times than this are not trusted to never appear at a position.
+MIN_KANJI_COUNT = 50
+# Family names of this length or longer must be a prefix of a known family name.
+MIN_FAMILY_LENGTH_FOR_PREFIX = 3
+
+
+class CandidatePruner:
+    """
+    Removes divisions which fail any of the following checks.
+    - The family name has at most max_family_length characters, and the given name at most max_given_length.
+    - The last character of the family name and the first character of the given name are not kanji which never
+      appear at the position in the kanji statistics, among kanji used at least min_kanji_count times.
+    - With family_name_repository, a family name with MIN_FAMILY_LENGTH_FOR_PREFIX or more characters
+      is a prefix of a known family name.
+    If all divisions of a name fail, none of them is removed.
+    The pruner holds no state which changes after the construction, so one instance can be shared by threads.
+    """
+
+    def __init__(
+        self,
+        kanji_statistics_repository: KanjiStatisticsRepository,
+        family_name_repository: Optional[FamilyNameRepository] = None,
+        max_family_length: int = MAX_FAMILY_LENGTH,
+        max_given_length: int = MAX_GIVEN_LENGTH,
+        min_kanji_count: int = MIN_KANJI_COUNT,
+    ):
+        """
+        :param kanji_statistics_repository: Class for managing Kanji statistics.
+        :param family_name_repository: Known family names. If None, the prefix check is skipped.
+        :param max_family_length: Maximum length of family names.
+        :param max_given_length: Maximum length of given names.
+        :param min_kanji_count: Minimum number of uses of a kanji to trust its zero counts.
+        """
+        self.max_family_length = max_family_length
+        self.max_given_length = max_given_length
+
+        # Kanji which never end a family name, never start a family name, and never start a given name.
+        # The columns are the indices of order_counts (See KanjiStatistics).
+        order_counts_table = kanji_statistics_repository.order_counts_table
+        is_frequent = order_counts_table.sum(axis=1) >= min_kanji_count
+        kanjis = np.array(kanji_statistics_repository.kanjis + [""], dtype=object)
+        self._never_family_last = frozenset(kanjis[is_frequent & (order_counts_table[:, 2] == 0)])
+        self._never_family_first = frozenset(kanjis[is_frequent & (order_counts_table[:, 0] == 0)])
+        self._never_given_first = frozenset(kanjis[is_frequent & (order_counts_table[:, 3] == 0)])
+
+        self._family_prefixes: Optional[frozenset[str]] = None
+        if family_name_repository is not None:
+            self._family_prefixes = frozenset(
+                _family[:i]
+                for _family, _ in family_name_repository.items()
+                for i in range(MIN_FAMILY_LENGTH_FOR_PREFIX, len(_family) + 1)
+            )
+
+    def pruning_rate(self, undivided_names: Sequence[str]) -> float:
+        """
+        Calculates the ratio of the divisions of undivided names which are removed.
+        :param undivided_names: Names with no space between the family name and given name
+        :return: Ratio of removed divisions, or 0 if the names have no division.
+        :rtype: float
+        """
+        num_candidates = 0
+        num_pruned = 0
+        for _undivided_name in undivided_names:
+            num_divisions = max(len(_undivided_name) - 1, 0)
+            num_candidates += num_divisions
+            num_pruned += num_divisions - len(self.select_family_lengths(_undivided_name))
+        return num_pruned / num_candidates if num_candidates > 0 else 0.0
+
+    def is_plausible(self, family: str, given: str) -> bool:
+        """
+        Checks whether the division passes all checks.
+        :param family: Family name.
+        :param given: Given name.
+        :return: False if the division can be removed.
+        :rtype: bool
+        """
+        if len(family) > self.max_family_length or len(given) > self.max_given_length:
+            return False
+        # A family name with one character is counted as the first character (See _calc_current_order_status).
+        never_family_end = self._never_family_first if len(family) == 1 else self._never_family_last
+        if family[-1] in never_family_end or given[0] in self._never_given_first:
+            return False
+        if (
+            self._family_prefixes is not None
+            and len(family) >= MIN_FAMILY_LENGTH_FOR_PREFIX
+            and family not in self._family_prefixes
+        ):
+            return False
+        return True
+
+    def select_family_lengths(self, undivided_name: str) -> list[int]:
+        """
+        Returns the divisions of undivided name to score, as the lengths of the family names.
+        :param undivided_name: Names with no space between the family name and given name
+        :return: Lengths of the family names in ascending order. All divisions if all of them fail the checks.
+        :rtype: list[int]
+        """
+        all_family_lengths = range(1, len(undivided_name))
+        family_lengths = [i for i in all_family_lengths if self.is_plausible(undivided_name[:i], undivided_name[i:])]
+        if len(family_lengths) == 0:
+            return list(all_family_lengths)
+        return family_lengths
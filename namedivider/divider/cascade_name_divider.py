@@ -0,0 +1,230 @@
+"""
+Cascade of BasicNameDivider and GBDTNameDivider.
+
+GBDTNameDivider is more accurate but several times slower than BasicNameDivider.
+CascadeNameDivider divides names with BasicNameDivider first, and escalates only the names it is not confident of
+to GBDTNameDivider. Use select_threshold to choose the threshold from divided names.
+"""
+import math
+import threading
+from collections import Counter
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from namedivider.divider.basic_name_divider import BasicNameDivider
+from namedivider.divider.divided_name import DividedName
+from namedivider.divider.gbdt_name_divider import GBDTNameDivider
+from namedivider.divider.name_divider_base import _NameDivider, _UndividedNameHolder
+
+# Keys of CascadeNameDivider.route_counts
+ROUTE_BASIC = "basic"
+ROUTE_GBDT = "gbdt"
+
+# Confidence of the results of BasicNameDivider compared with the threshold.
+# "score": Softmax score of the division (DividedName.score).
+# "margin": Difference between the softmax scores of the best division and the second best division.
+CRITERIA = ("score", "margin")
+
+
+class CascadeNameDivider:
+    """
+    Divider that escalates names from BasicNameDivider to GBDTNameDivider when the result is uncertain.
+
+    The result of BasicNameDivider is accepted when its confidence (See CRITERIA) is at least threshold.
+    Names divided by rules are always accepted.
+
+    :example
+    -----------------------------------------------------
+    >>> from namedivider.divider.cascade_name_divider import CascadeNameDivider
+    >>> divider = CascadeNameDivider(threshold=0.6)
+    >>> divider.divide_name("菅義偉")
+    DividedName(family='菅', given='義偉', separator=' ', score=0.6328842762252201, algorithm='kanji_feature')
+    >>> divider.divide_name("中曽根康弘").algorithm  # The score of BasicNameDivider is 0.37
+    'gbdt'
+    >>> divider.escalation_rate
+    0.5
+    -----------------------------------------------------
+    """
+
+    def __init__(
+        self,
+        basic_divider: Optional[_NameDivider] = None,
+        gbdt_divider: Optional[_NameDivider] = None,
+        threshold: float = 0.5,
+        criterion: str = "score",
+    ):
+        """
+        :param basic_divider: Divider used first. The default is BasicNameDivider().
+        :param gbdt_divider: Divider of the escalated names. The default is GBDTNameDivider().
+        :param threshold: Minimum confidence to accept the result of basic_divider.
+        :param criterion: "score" or "margin" (See CRITERIA).
+            "margin" scores the candidates of the names once more, so it is slower than "score".
+        """
+        if criterion not in CRITERIA:
+            raise ValueError(f"criterion must be in {list(CRITERIA)}, but got {criterion}")
+        self.basic_divider = basic_divider if basic_divider is not None else BasicNameDivider()
+        self.gbdt_divider = gbdt_divider if gbdt_divider is not None else GBDTNameDivider()
+        self.threshold = threshold
+        self.criterion = criterion
+        # Number of names divided by each route: "basic" and "gbdt" (escalated).
+        self.route_counts: Counter[str] = Counter()
+        self._lock = threading.Lock()
+
+    @property
+    def escalation_rate(self) -> float:
+        """
+        Ratio of names escalated to gbdt_divider, or 0 if no name has been divided.
+        """
+        with self._lock:
+            num_names = self.route_counts[ROUTE_BASIC] + self.route_counts[ROUTE_GBDT]
+            return self.route_counts[ROUTE_GBDT] / num_names if num_names > 0 else 0.0
+
+    def _calc_margins(self, undivided_names: Sequence[str]) -> list[float]:
+        """
+        Calculates the difference between the best and the second best softmax scores of basic_divider.
+        :param undivided_names: Names with at least 3 characters, which are not divided by rules.
+        :return: Margins
+        """
+        if self.basic_divider.normalize_name:
+            undivided_names = [_UndividedNameHolder(_name).normalized_name for _name in undivided_names]
+        families = []
+        givens = []
+        for _undivided_name in undivided_names:
+            for i in range(1, len(_undivided_name)):
+                families.append(_undivided_name[:i])
+                givens.append(_undivided_name[i:])
+        all_scores = self.basic_divider.calc_scores(families, givens)
+
+        margins = []
+        offset = 0
+        for _undivided_name in undivided_names:
+            n_candidates = len(_undivided_name) - 1
+            softmax_scores = np.sort(self.basic_divider._softmax(list(all_scores[offset : offset + n_candidates])))
+            offset += n_candidates
+            margins.append(float(softmax_scores[-1] - softmax_scores[-2]))
+        return margins
+
+    def calc_confidences(self, undivided_names: Sequence[str], divided_names: Sequence[DividedName]) -> list[float]:
+        """
+        Calculates the confidence of the results of basic_divider by criterion.
+        :param undivided_names: Names with no space between the family name and given name
+        :param divided_names: Results of basic_divider for undivided_names
+        :return: Confidences. Names divided by rules have infinity, so that they are always accepted.
+          Results with an algorithm other than basic_divider.algorithm_name (e.g. "rule_specific_family" of
+          custom rules) are regarded as divided by rules.
+        :rtype: list[float]
+        """
+        confidences = [
+            _divided_name.score if _divided_name.algorithm == self.basic_divider.algorithm_name else math.inf
+            for _divided_name in divided_names
+        ]
+        if self.criterion == "margin":
+            indices = [i for i, _confidence in enumerate(confidences) if _confidence != math.inf]
+            margins = self._calc_margins([undivided_names[i] for i in indices])
+            for i, _margin in zip(indices, margins):
+                confidences[i] = _margin
+        return confidences
+
+    def divide_name(self, undivided_name: str) -> DividedName:
+        """
+        Divides undivided name.
+        :param undivided_name: Names with no space between the family name and given name
+        :return: Divided name
+        :rtype: DividedName
+        """
+        return self.divide_names([undivided_name])[0]
+
+    def divide_names(self, undivided_names: Sequence[str]) -> list[DividedName]:
+        """
+        Divides undivided names. The escalated names are divided by one divide_names call of gbdt_divider.
+        :param undivided_names: Names with no space between the family name and given name
+        :return: Divided names, in the same order as undivided_names
+        :rtype: list[DividedName]
+        """
+        divided_names = self.basic_divider.divide_names(undivided_names)
+        confidences = self.calc_confidences(undivided_names, divided_names)
+        escalated_indices = [i for i, _confidence in enumerate(confidences) if _confidence < self.threshold]
+        if len(escalated_indices) > 0:
+            escalated = self.gbdt_divider.divide_names([undivided_names[i] for i in escalated_indices])
+            for i, _divided_name in zip(escalated_indices, escalated):
+                divided_names[i] = _divided_name
+        with self._lock:
+            self.route_counts[ROUTE_BASIC] += len(undivided_names) - len(escalated_indices)
+            self.route_counts[ROUTE_GBDT] += len(escalated_indices)
+        return divided_names
+
+
+@dataclass(frozen=True)
+class ThresholdSelection:
+    """
+    threshold: Chosen threshold of CascadeNameDivider.
+    accuracy: Accuracy of CascadeNameDivider with the threshold.
+    basic_accuracy: Accuracy of basic_divider alone.
+    gbdt_accuracy: Accuracy of gbdt_divider alone.
+    escalation_rate: Ratio of names escalated to gbdt_divider with the threshold.
+    """
+
+    threshold: float
+    accuracy: float
+    basic_accuracy: float
+    gbdt_accuracy: float
+    escalation_rate: float
+
+
+def select_threshold(
+    divided_names: Sequence[str],
+    basic_divider: Optional[_NameDivider] = None,
+    gbdt_divider: Optional[_NameDivider] = None,
+    criterion: str = "score",
+    separator: str = " ",
+    tolerance: float = 0.0,
+) -> ThresholdSelection:
+    """
+    Chooses the lowest threshold of CascadeNameDivider whose accuracy on divided names is as high as gbdt_divider.
+    The lowest threshold escalates the fewest names.
+    :param divided_names: Correctly divided names like "菅 義偉".
+    :param basic_divider: Divider used first. The default is BasicNameDivider().
+    :param gbdt_divider: Divider of the escalated names. The default is GBDTNameDivider().
+    :param criterion: "score" or "margin" (See CRITERIA).
+    :param separator: Separator of divided_names.
+    :param tolerance: Accuracy lower than gbdt_divider which is allowed, like 0.001.
+    :return: Chosen threshold and the accuracies
+    :rtype: ThresholdSelection
+    """
+    if len(divided_names) == 0:
+        raise ValueError("divided_names must not be empty.")
+    cascade_divider = CascadeNameDivider(basic_divider, gbdt_divider, criterion=criterion)
+    undivided_names = [_divided_name.replace(separator, "") for _divided_name in divided_names]
+    basic_results = cascade_divider.basic_divider.divide_names(undivided_names)
+    gbdt_results = cascade_divider.gbdt_divider.divide_names(undivided_names)
+    basic_correct = np.array(
+        [f"{_r.family}{separator}{_r.given}" == _name for _r, _name in zip(basic_results, divided_names)],
+        dtype=np.int64,
+    )
+    gbdt_correct = np.array(
+        [f"{_r.family}{separator}{_r.given}" == _name for _r, _name in zip(gbdt_results, divided_names)], dtype=np.int64
+    )
+    confidences = np.array(cascade_divider.calc_confidences(undivided_names, basic_results), dtype=np.float64)
+
+    # Names are accepted from the most confident one, so the number of correct names of each threshold is
+    # the correct names of gbdt_divider plus the gain of basic_divider over gbdt_divider in the accepted names.
+    order = np.argsort(-confidences, kind="stable")
+    sorted_negative_confidences = -confidences[order]
+    cumulative_gains = np.concatenate([[0], np.cumsum((basic_correct - gbdt_correct)[order])])
+    thresholds = np.append(np.unique(confidences[np.isfinite(confidences)]), math.inf)
+    num_accepted = np.searchsorted(sorted_negative_confidences, -thresholds, side="right")
+    num_correct = gbdt_correct.sum() + cumulative_gains[num_accepted]
+
+    num_names = len(divided_names)
+    is_enough = num_correct >= gbdt_correct.sum() - tolerance * num_names
+    idx = int(np.argmax(is_enough)) if is_enough.any() else int(np.argmax(num_correct))
+    return ThresholdSelection(
+        threshold=float(thresholds[idx]),
+        accuracy=float(num_correct[idx] / num_names),
+        basic_accuracy=float(basic_correct.sum() / num_names),
+        gbdt_accuracy=float(gbdt_correct.sum() / num_names),
+        escalation_rate=float((num_names - num_accepted[idx]) / num_names),
+    )
@@ -1,7 +1,7 @@
 from dataclasses import dataclass
 from enum import Enum, auto
 from pathlib import Path
-from typing import Optional, Union
+from typing import ClassVar, Optional, Union
 
 from namedivider.rule.rule import Rule
 from namedivider.util import (
@@ -33,7 +33,13 @@ class NameDividerConfigBase:
     algorithm_name: Name of algorithm.
     custom_rules: Custom rules to apply before statistical analysis.
     cache_mask: Flag whether or not to cache masks for performance optimization.
-    backend: Backend to use for name division. "python" (default) or "rust" (beta).
+    backend: Backend to use for name division. "python" (default), "rust" (beta), "hybrid" (beta) or "auto".
+    BasicNameDividerConfig also accepts "numba", which compiles the scoring with numba (See BasicNameDividerConfig).
+    "hybrid" applies the rules including custom_rules in Python, and divides the other names with the Rust backend.
+    "auto" chooses the fastest backend which supports the other options (See backend_choice of dividers).
+    auto_benchmark: With backend="auto", chooses the backend by a short self-benchmark on creating the divider.
+    prune_candidates: Flag whether or not to skip implausible divisions before scoring them (Python backend only).
+    This is approximate: the accuracy can change (See namedivider.divider.candidate_pruner).
     """
 
     separator: str = " "
@@ -42,12 +48,16 @@ class NameDividerConfigBase:
     custom_rules: Optional[list[Rule]] = None
     cache_mask: bool = False
     backend: str = "python"
+    auto_benchmark: bool = False
+    prune_candidates: bool = False
+
+    # Backends supported by the divider of the configuration.
+    valid_backends: ClassVar[frozenset[str]] = frozenset({"python", "rust", "hybrid", "auto"})
 
     def __post_init__(self) -> None:
-        valid_backends = {"python", "rust"}
-        if self.backend not in valid_backends:
+        if self.backend not in self.valid_backends:
             raise ValueError(
-                f"Invalid backend '{self.backend}'. " f"Valid backends are: {', '.join(sorted(valid_backends))}"
+                f"Invalid backend '{self.backend}'. " f"Valid backends are: {', '.join(sorted(self.valid_backends))}"
             )
 
 
@@ -56,12 +66,16 @@ class BasicNameDividerConfig(NameDividerConfigBase):
     """
     path_csv: Path of the file containing the kanji information.
     only_order_score_when_4: If True, only order score is used for 4-character names. Not recommended to be True.
+    backend: In addition to the backends of NameDividerConfigBase, "numba" is accepted.
+    "numba" divides names with a kernel compiled by numba, and falls back to "python" if numba is not installed.
     """
 
     path_csv: Union[str, Path] = KANJI_CSV_DEFAULT_PATH
     only_order_score_when_4: bool = False
     algorithm_name: str = "kanji_feature"
 
+    valid_backends: ClassVar[frozenset[str]] = NameDividerConfigBase.valid_backends | {"numba"}
+
 
 @dataclass(frozen=True)
 class GBDTNameDividerConfig(NameDividerConfigBase):
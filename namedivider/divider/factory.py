@@ -0,0 +1,22 @@
+from namedivider.divider.basic_name_divider import BasicNameDivider
+from namedivider.divider.config import (
+    BasicNameDividerConfig,
+    GBDTNameDividerConfig,
+    NameDividerConfigBase,
+)
+from namedivider.divider.gbdt_name_divider import GBDTNameDivider
+from namedivider.divider.name_divider_base import _NameDivider
+
+
+def create_divider_from_config(config: NameDividerConfigBase) -> _NameDivider:
+    """
+    Create a NameDivider instance suitable for the configuration.
+    :param config: BasicNameDividerConfig or GBDTNameDividerConfig
+    :return: NameDivider constructed by config.
+    :rtype: _NameDivider
+    """
+    if isinstance(config, GBDTNameDividerConfig):
+        return GBDTNameDivider(config=config)
+    if isinstance(config, BasicNameDividerConfig):
+        return BasicNameDivider(config=config)
+    raise TypeError(f"Expected BasicNameDividerConfig or GBDTNameDividerConfig, got {type(config).__name__}")
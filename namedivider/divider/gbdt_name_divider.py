@@ -1,6 +1,7 @@
+from collections.abc import Sequence
 from dataclasses import asdict
 from pathlib import Path
-from typing import Optional, cast
+from typing import TYPE_CHECKING, Optional, Union, cast
 
 from namedivider.divider.config import GBDTNameDividerConfig
 from namedivider.divider.divided_name import DividedName
@@ -11,21 +12,52 @@ from namedivider.util import (
     download_gbdt_model_v1_if_needed,
 )
 
+if TYPE_CHECKING:
+    import lightgbm as lgb
+
+    from namedivider.divider.model_store import ModelStore
+    from namedivider.feature.family_name import FamilyNameRepository
+    from namedivider.feature.kanji import KanjiStatisticsRepository
+
+
+def load_family_name_repository(path_family_names: Union[str, Path]) -> "FamilyNameRepository":
+    """
+    Loads FamilyNameRepository, downloading the default one if needed.
+    :param path_family_names: Allows .pickle file or text file (See GBDTNameDividerConfig).
+    :return: FamilyNameRepository
+    :rtype: FamilyNameRepository
+    """
+    import pickle
+
+    from namedivider.feature.family_name import FamilyNameRepository
+
+    download_family_name_pickle_if_needed(path_family_names)
+    if Path(path_family_names).suffix == ".pickle":
+        with open(path_family_names, "rb") as f:
+            family_name_repository: FamilyNameRepository = pickle.load(f)
+        return family_name_repository
+    return FamilyNameRepository(path_txt=path_family_names)
+
 
 class GBDTNameDivider(_NameDivider):
     """
     NameDivider with gradient boosting decision tree.
 
-    Supports both Python (default) and Rust (beta) backends.
+    Supports Python (default), Rust (beta) and hybrid (beta) backends.
     """
 
     def __init__(self, config: Optional[GBDTNameDividerConfig] = None):
         if config is None:
             config = GBDTNameDividerConfig()
 
+        if config.backend == "auto":
+            config = self._select_backend(config)
+
         # Initialize based on backend selection
         if config.backend == "rust":
             self._init_rust_backend(config)
+        elif config.backend == "hybrid":
+            self._init_hybrid_backend(config)
         else:
             # Default Python backend - preserve existing behavior
             self._init_python_backend(config)
@@ -33,32 +65,96 @@ class GBDTNameDivider(_NameDivider):
         super().__init__(config=config)
 
     def _init_python_backend(self, config: GBDTNameDividerConfig) -> None:
+        """Initialize Python backend (default behavior)."""
         # Local imports to prevent C library conflicts between lightgbm
         # and Rust backend on macOS
-        import pickle
-
         import lightgbm as lgb
 
-        from namedivider.feature.extractor import FamilyRankingFeatureExtractor
-        from namedivider.feature.family_name import FamilyNameRepository
         from namedivider.feature.kanji import KanjiStatisticsRepository
 
-        """Initialize Python backend (default behavior)."""
-        download_family_name_pickle_if_needed(config.path_family_names)
         download_gbdt_model_v1_if_needed(config.path_model)
-        kanji_statistics_repository = KanjiStatisticsRepository(path_csv=config.path_csv)
-        if Path(config.path_family_names).suffix == ".pickle":
-            with open(config.path_family_names, "rb") as f:
-                family_name_repository: FamilyNameRepository = pickle.load(f)
-        else:
-            family_name_repository = FamilyNameRepository(path_txt=config.path_family_names)
+        self._init_python_backend_from_assets(
+            config=config,
+            kanji_statistics_repository=KanjiStatisticsRepository(path_csv=config.path_csv),
+            family_name_repository=load_family_name_repository(config.path_family_names),
+            model=lgb.Booster(model_file=config.path_model),
+        )
+
+    def _init_python_backend_from_assets(
+        self,
+        config: GBDTNameDividerConfig,
+        kanji_statistics_repository: "KanjiStatisticsRepository",
+        family_name_repository: "FamilyNameRepository",
+        model: "lgb.Booster",
+    ) -> None:
+        """Initialize Python backend with loaded assets."""
+        from namedivider.feature.extractor import FamilyRankingFeatureExtractor
+
         self.feature_extractor = FamilyRankingFeatureExtractor(
             kanji_statistics_repository=kanji_statistics_repository,
             family_name_repository=family_name_repository,
             cache_mask=config.cache_mask,
         )
-        self.model = lgb.Booster(model_file=config.path_model)
+        self.model = model
         self._rust_divider: Optional[RustNameDividerWrapper] = None
+        if config.prune_candidates:
+            from namedivider.divider.candidate_pruner import CandidatePruner
+
+            self.candidate_pruner = CandidatePruner(kanji_statistics_repository, family_name_repository)
+
+    @classmethod
+    def from_model_store(cls, store: "ModelStore", config: Optional[GBDTNameDividerConfig] = None) -> "GBDTNameDivider":
+        """
+        Create instance with the assets in a model store instead of loading them from the paths of config.
+        Kanji statistics and family names are read from the store without copying.
+        The GBDT model is parsed from the text in the store, so each process holds its own trees.
+        :param store: ModelStore containing the assets of GBDTNameDivider.
+        :param config: Configuration of NameDivider. Paths in config are ignored. Only Python backend is supported.
+        :return: GBDTNameDivider instance
+        :rtype: GBDTNameDivider
+        """
+        import lightgbm as lgb
+
+        if config is None:
+            config = GBDTNameDividerConfig()
+        if config.backend != "python":
+            raise ValueError(f"Only backend='python' is supported with a model store, but got '{config.backend}'")
+        if not store.has_gbdt_assets():
+            raise ValueError("The model store does not contain the assets of GBDTNameDivider.")
+        divider = cls.__new__(cls)
+        divider._init_python_backend_from_assets(
+            config=config,
+            kanji_statistics_repository=store.kanji_statistics_repository(),
+            family_name_repository=store.family_name_repository(),
+            model=lgb.Booster(model_str=store.model_str()),
+        )
+        super(GBDTNameDivider, divider).__init__(config=config)
+        return divider
+
+    def save_snapshot(self, path: Union[str, Path]) -> None:
+        """
+        Writes the prepared assets and the configuration into a snapshot file for fast warm start.
+        Only Python backend is supported.
+        :param path: Path of the snapshot file.
+        """
+        from namedivider.divider.snapshot import save_snapshot
+
+        save_snapshot(self, path)
+
+    @classmethod
+    def load_snapshot(cls, path: Union[str, Path]) -> "GBDTNameDivider":
+        """
+        Create instance from a snapshot file written by save_snapshot, without reading the source assets.
+        :param path: Path of the snapshot file.
+        :return: GBDTNameDivider instance
+        :rtype: GBDTNameDivider
+        """
+        from namedivider.divider.snapshot import load_snapshot
+
+        divider = load_snapshot(path)
+        if not isinstance(divider, cls):
+            raise TypeError(f"{path} is a snapshot of {type(divider).__name__}, not {cls.__name__}.")
+        return divider
 
     def _init_rust_backend(self, config: GBDTNameDividerConfig) -> None:
         """Initialize Rust backend (beta feature)."""
@@ -67,6 +163,13 @@ class GBDTNameDivider(_NameDivider):
         self._rust_divider = create_rust_gbdt_divider(config)
         # Python-specific attributes are not set for Rust backend
 
+    def _init_hybrid_backend(self, config: GBDTNameDividerConfig) -> None:
+        """Initialize hybrid backend, which applies rules in Python and divides the other names in Rust (beta)."""
+        from namedivider.divider.rust_backend import create_rust_gbdt_divider
+
+        self._rust_divider = None
+        self._hybrid_divider = create_rust_gbdt_divider(config)
+
     def calc_score(self, family: str, given: str) -> float:
         """
         Calculates the score. The higher the score, the more likely the division is correct.
@@ -75,8 +178,9 @@ class GBDTNameDivider(_NameDivider):
         :return: Score of dividing.
         """
         # Use Rust backend if available
-        if self._rust_divider is not None:
-            return self._rust_divider.calc_score(family, given)
+        rust_divider = self._rust_divider or self._hybrid_divider
+        if rust_divider is not None:
+            return rust_divider.calc_score(family, given)
 
         # Use Python backend (default) - feature_extractor/model are guaranteed to be initialized
         feature = self.feature_extractor.get_features(family=family, given=given)
@@ -85,6 +189,27 @@ class GBDTNameDivider(_NameDivider):
         score = cast(float, score_list[0])
         return score
 
+    def calc_scores(self, families: Sequence[str], givens: Sequence[str]) -> list[float]:
+        """
+        Calculates the scores of multiple divisions with one prediction of the GBDT model.
+        :param families: Family names.
+        :param givens: Given names. Must be the same length as families.
+        :return: Scores of dividing, in the same order as input.
+        """
+        # Use Rust backend if available
+        rust_divider = self._rust_divider or self._hybrid_divider
+        if rust_divider is not None:
+            return [rust_divider.calc_score(_family, _given) for _family, _given in zip(families, givens)]
+
+        if len(families) == 0:
+            return []
+        feature_list = [
+            list(asdict(self.feature_extractor.get_features(family=_family, given=_given)).values())
+            for _family, _given in zip(families, givens)
+        ]
+        score_list = self.model.predict(feature_list)
+        return [float(_score) for _score in score_list]
+
     def divide_name(self, undivided_name: str) -> DividedName:
         """
         Divides undivided name.
@@ -98,3 +223,19 @@ class GBDTNameDivider(_NameDivider):
 
         # Use Python backend (default) - delegate to parent class
         return super().divide_name(undivided_name)
+
+    def divide_names(self, undivided_names: Sequence[str], num_threads: Optional[int] = 1) -> list[DividedName]:
+        """
+        Divides undivided names.
+        :param undivided_names: Names with no space between the family name and given name
+        :param num_threads: Number of threads sharing this divider (Python backend only).
+            Names are split across threads only on free-threaded builds running without the GIL.
+        :return: Divided names, in the same order as undivided_names
+        :rtype: list[DividedName]
+        """
+        # Use Rust backend if available
+        if self._rust_divider is not None:
+            return self._rust_divider.divide_names(undivided_names)
+
+        # Use Python backend (default) - delegate to parent class
+        return super().divide_names(undivided_names, num_threads=num_threads)
@@ -0,0 +1,201 @@
+"""
+Joint scoring of BasicNameDivider and GBDTNameDivider.
+
+The features of GBDTNameDivider (FamilyRankingFeatures) contain the four scores used by BasicNameDivider.
+JointNameDivider calculates the features of each candidate once with one KanjiStatisticsRepository,
+and derives both the score of BasicNameDivider and the input of the GBDT model from them.
+"""
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Optional, cast
+
+import numpy as np
+import numpy.typing as npt
+
+from namedivider.divider.config import BasicNameDividerConfig
+from namedivider.divider.divided_name import DividedName
+from namedivider.divider.gbdt_name_divider import GBDTNameDivider
+from namedivider.divider.name_divider_base import _UndividedNameHolder
+from namedivider.feature.extractor import FamilyRankingFeatures
+
+JOINT_ALGORITHM_NAME = "joint"
+
+
+@dataclass(frozen=True)
+class JointDividedName:
+    """
+    Results of a name by JointNameDivider.
+    :param basic: Result by the algorithm of BasicNameDivider.
+    :param gbdt: Result by the algorithm of GBDTNameDivider.
+    :param blended: Result by the weighted average of the softmax scores of both algorithms.
+    All of them are the same result if the name is divided by rules.
+    """
+
+    basic: DividedName
+    gbdt: DividedName
+    blended: DividedName
+
+
+class JointNameDivider:
+    """
+    Divider scoring every candidate by the algorithms of both BasicNameDivider and GBDTNameDivider in one pass.
+    The score of BasicNameDivider is calculated with the kanji statistics of gbdt_divider.
+
+    :example
+    -----------------------------------------------------
+    >>> from namedivider.divider.joint_name_divider import JointNameDivider
+    >>> divider = JointNameDivider(basic_weight=0.3)
+    >>> result = divider.divide_names_joint(["菅義偉"])[0]
+    >>> result.basic.algorithm, result.gbdt.algorithm, result.blended.algorithm
+    ('kanji_feature', 'gbdt', 'joint')
+    -----------------------------------------------------
+    """
+
+    def __init__(
+        self,
+        gbdt_divider: Optional[GBDTNameDivider] = None,
+        basic_weight: float = 0.5,
+        only_order_score_when_4: bool = False,
+    ):
+        """
+        :param gbdt_divider: GBDTNameDivider with Python backend. The default is GBDTNameDivider().
+        :param basic_weight: Weight of the softmax scores of BasicNameDivider in the blended result, from 0 to 1.
+        :param only_order_score_when_4: See BasicNameDividerConfig.
+        """
+        if not 0.0 <= basic_weight <= 1.0:
+            raise ValueError(f"basic_weight must be from 0 to 1, but got {basic_weight}")
+        if gbdt_divider is None:
+            gbdt_divider = GBDTNameDivider()
+        if gbdt_divider.config.backend != "python":
+            raise ValueError(f"Only backend='python' is supported, but got '{gbdt_divider.config.backend}'")
+        self.gbdt_divider = gbdt_divider
+        self.basic_weight = basic_weight
+        self.only_order_score_when_4 = only_order_score_when_4
+        self.basic_algorithm_name = BasicNameDividerConfig.algorithm_name
+
+    def calc_scores(
+        self, families: Sequence[str], givens: Sequence[str]
+    ) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]:
+        """
+        Calculates the scores of BasicNameDivider and GBDTNameDivider from the features calculated once.
+        :param families: Family names.
+        :param givens: Given names. Must be the same length as families.
+        :return: [basic_scores, gbdt_scores]
+          basic_scores: Scores of BasicNameDivider.calc_score.
+          gbdt_scores: Scores of GBDTNameDivider.calc_score.
+        """
+        if len(families) == 0:
+            return np.zeros(0, dtype=np.float64), np.zeros(0, dtype=np.float64)
+        features = self.gbdt_divider.feature_extractor.get_features_batch(families, givens)
+
+        # See BasicNameDivider.calc_score.
+        fullname_lengths = features["fullname_length"]
+        order_scores = (features["family_order_score"] + features["given_order_score"]) / (fullname_lengths - 2)
+        length_scores = (features["family_length_score"] + features["given_length_score"]) / fullname_lengths
+        basic_scores = (order_scores + length_scores) / 2.0
+        if self.only_order_score_when_4:
+            basic_scores = np.where(fullname_lengths == 4, order_scores, basic_scores)
+
+        # The columns are in the order of FamilyRankingFeatures, as GBDTNameDivider.calc_score.
+        x = np.column_stack(
+            [features[_field].astype(np.float64) for _field in FamilyRankingFeatures.__dataclass_fields__]
+        )
+        gbdt_scores = cast(npt.NDArray[np.float64], self.gbdt_divider.model.predict(x))
+        return basic_scores, gbdt_scores
+
+    def _divide_by_algorithm_batch(self, undivided_names: Sequence[str]) -> list[JointDividedName]:
+        """
+        Divides undivided names by both algorithms, scoring all candidates of all names in one pass.
+        :param undivided_names: Names with no space between the family name and given name
+        :return: Results of both algorithms and the blended result
+        """
+        families = []
+        givens = []
+        for _undivided_name in undivided_names:
+            for i in range(1, len(_undivided_name)):
+                families.append(_undivided_name[:i])
+                givens.append(_undivided_name[i:])
+        all_basic_scores, all_gbdt_scores = self.calc_scores(families, givens)
+
+        results = []
+        offset = 0
+        for _undivided_name in undivided_names:
+            n_candidates = len(_undivided_name) - 1
+            basic_scores = self.gbdt_divider._softmax(list(all_basic_scores[offset : offset + n_candidates]))
+            gbdt_scores = self.gbdt_divider._softmax(list(all_gbdt_scores[offset : offset + n_candidates]))
+            offset += n_candidates
+            blended_scores = self.basic_weight * np.asarray(basic_scores) + (1.0 - self.basic_weight) * np.asarray(
+                gbdt_scores
+            )
+            results.append(
+                JointDividedName(
+                    basic=self._create_divided_name(_undivided_name, basic_scores, self.basic_algorithm_name),
+                    gbdt=self._create_divided_name(_undivided_name, gbdt_scores, self.gbdt_divider.algorithm_name),
+                    blended=self._create_divided_name(_undivided_name, list(blended_scores), JOINT_ALGORITHM_NAME),
+                )
+            )
+        return results
+
+    def _create_divided_name(self, undivided_name: str, scores: list[float], algorithm: str) -> DividedName:
+        max_idx = int(np.argmax(np.array(scores))) + 1
+        return self.gbdt_divider._create_divided_name(
+            family=undivided_name[:max_idx],
+            given=undivided_name[max_idx:],
+            score=scores[max_idx - 1],
+            algorithm=algorithm,
+        )
+
+    def divide_names_joint(self, undivided_names: Sequence[str]) -> list[JointDividedName]:
+        """
+        Divides undivided names by both algorithms. Rules and normalization are the same as gbdt_divider.
+        :param undivided_names: Names with no space between the family name and given name
+        :return: Results of both algorithms and the blended result, in the same order as undivided_names
+        :rtype: list[JointDividedName]
+        """
+        results: list[Optional[JointDividedName]] = []
+        holders: list[Optional[_UndividedNameHolder]] = []
+        indices_for_algorithm = []
+        names_for_algorithm = []
+        for idx, _undivided_name in enumerate(undivided_names):
+            self.gbdt_divider._validate(_undivided_name)
+            holder = _UndividedNameHolder(_undivided_name) if self.gbdt_divider.normalize_name else None
+            name = holder.normalized_name if holder is not None else _undivided_name
+            holders.append(holder)
+            divided_name = self.gbdt_divider._divide_by_rule_base(name)
+            results.append(JointDividedName(divided_name, divided_name, divided_name) if divided_name else None)
+            if divided_name is None:
+                indices_for_algorithm.append(idx)
+                names_for_algorithm.append(name)
+
+        for idx, _result in zip(indices_for_algorithm, self._divide_by_algorithm_batch(names_for_algorithm)):
+            results[idx] = _result
+
+        joint_divided_names = []
+        for _holder, _result_or_none in zip(holders, results):
+            _result = cast(JointDividedName, _result_or_none)
+            if _holder is not None:
+                _result = JointDividedName(
+                    basic=_holder.get_divided_original_name(_result.basic),
+                    gbdt=_holder.get_divided_original_name(_result.gbdt),
+                    blended=_holder.get_divided_original_name(_result.blended),
+                )
+            joint_divided_names.append(_result)
+        return joint_divided_names
+
+    def divide_names(self, undivided_names: Sequence[str]) -> list[DividedName]:
+        """
+        Divides undivided names by the weighted average of the softmax scores of both algorithms.
+        :param undivided_names: Names with no space between the family name and given name
+        :return: Blended results, in the same order as undivided_names
+        :rtype: list[DividedName]
+        """
+        return [_result.blended for _result in self.divide_names_joint(undivided_names)]
+
+    def divide_name(self, undivided_name: str) -> DividedName:
+        """
+        Divides undivided name by the weighted average of the softmax scores of both algorithms.
+        :param undivided_name: Names with no space between the family name and given name
+        :return: Blended result
+        :rtype: DividedName
+        """
+        return self.divide_names([undivided_name])[0]
@@ -0,0 +1,159 @@
+"""
+Micro-batching support for namedivider.
+
+Services receiving many independent single-name requests pay the per-call overhead of divide_name
+(and, in GBDT mode, one prediction of the model per candidate) for every request.
+This module collects the calls arriving within a short window and divides them in one batch.
+"""
+import asyncio
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Optional
+
+from namedivider.divider.divided_name import DividedName
+from namedivider.divider.name_divider_base import _NameDivider
+
+
+class MicroBatchNameDivider:
+    """
+    Divider that coalesces concurrent single-name calls into batches.
+
+    Calls are collected until `max_batch_size` names are queued or `max_delay` seconds have passed
+    since the first call of the batch, and then divided by one `divide_names` call of the wrapped divider.
+    This can be used from both threads (`divide_name`) and asyncio (`adivide_name`).
+
+    :example
+    -----------------------------------------------------
+    >>> from namedivider import GBDTNameDivider
+    >>> from namedivider.divider.micro_batch_name_divider import MicroBatchNameDivider
+    >>> divider = MicroBatchNameDivider(GBDTNameDivider(), max_batch_size=64, max_delay=0.001)
+    >>> divider.divide_name("菅義偉")  # Called from many threads at the same time
+    DividedName(family='菅', given='義偉', separator=' ', score=0.7300634880343344, algorithm='gbdt')
+    >>> await divider.adivide_name("阿部晋三")  # Or from coroutines
+    DividedName(family='阿部', given='晋三', separator=' ', score=0.5761118242092244, algorithm='gbdt')
+    -----------------------------------------------------
+    """
+
+    def __init__(self, divider: _NameDivider, max_batch_size: int = 64, max_delay: float = 0.001):
+        """
+        :param divider: NameDivider to divide batches.
+        :param max_batch_size: Maximum number of names in a batch.
+        :param max_delay: Maximum seconds the first call of a batch waits for other calls.
+        """
+        if max_batch_size < 1:
+            raise ValueError(f"max_batch_size must be at least 1, but got {max_batch_size}")
+        self.divider = divider
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        # None is put into the queue to stop the worker thread.
+        self._queue: "queue.Queue[Optional[tuple[str, Future[DividedName]]]]" = queue.Queue()
+        self._closed = False
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="MicroBatchNameDivider", daemon=True)
+        self._thread.start()
+
+    def submit(self, undivided_name: str) -> "Future[DividedName]":
+        """
+        Queues undivided name to be divided in the next batch.
+        :param undivided_name: Names with no space between the family name and given name
+        :return: Future of divided name
+        :rtype: concurrent.futures.Future
+        """
+        # Validate here so that an invalid name does not fail the other calls in the same batch.
+        _NameDivider._validate(undivided_name)
+        future: "Future[DividedName]" = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("MicroBatchNameDivider is already closed.")
+            self._queue.put((undivided_name, future))
+        return future
+
+    def divide_name(self, undivided_name: str) -> DividedName:
+        """
+        Divides undivided name, blocking until the batch containing it is processed.
+        :param undivided_name: Names with no space between the family name and given name
+        :return: Divided name
+        :rtype: DividedName
+        """
+        return self.submit(undivided_name).result()
+
+    async def adivide_name(self, undivided_name: str) -> DividedName:
+        """
+        Divides undivided name without blocking the event loop.
+        :param undivided_name: Names with no space between the family name and given name
+        :return: Divided name
+        :rtype: DividedName
+        """
+        return await asyncio.wrap_future(self.submit(undivided_name))
+
+    def _collect(
+        self, first: tuple[str, "Future[DividedName]"]
+    ) -> tuple[list[tuple[str, "Future[DividedName]"]], bool]:
+        """
+        Collects calls arriving within the window.
+        :return: [batch, stop]
+          batch: Pairs of undivided name and its future.
+          stop: True if close was requested while collecting.
+        """
+        batch = [first]
+        deadline = time.monotonic() + self.max_delay
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                break
+            if item is None:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _process(self, batch: list[tuple[str, "Future[DividedName]"]]) -> None:
+        """
+        Divides a batch and returns the results to each waiter.
+        """
+        batch = [(_name, _future) for _name, _future in batch if _future.set_running_or_notify_cancel()]
+        if len(batch) == 0:
+            return
+        try:
+            divided_names = self.divider.divide_names([_name for _name, _ in batch])
+        except Exception as e:
+            for _, _future in batch:
+                _future.set_exception(e)
+            return
+        for (_, _future), _divided_name in zip(batch, divided_names):
+            _future.set_result(_divided_name)
+
+    def _run(self) -> None:
+        """
+        Main loop of the worker thread.
+        """
+        stop = False
+        while not stop:
+            item = self._queue.get()
+            if item is None:
+                break
+            batch, stop = self._collect(item)
+            self._process(batch)
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """
+        Stops the worker thread after processing the queued calls.
+        :param timeout: Seconds to wait for the worker thread.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+        self._thread.join(timeout=timeout)
+
+    def __enter__(self) -> "MicroBatchNameDivider":
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
@@ -0,0 +1,372 @@
+"""
+Model store for namedivider.
+
+A model store holds all assets of dividers (kanji statistics, family name rankings and the GBDT model)
+in one flat buffer, which can be placed in shared memory or a memory-mapped file.
+Processes attaching the same store read the statistics through numpy views without copying them.
+
+Layout of the buffer:
+    magic (8 bytes) | format version (uint32) | header length (uint32) | header (JSON) | arrays (64-byte aligned)
+"""
+import json
+import mmap
+import struct
+import sys
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Any, Optional, Union
+
+import numpy as np
+import numpy.typing as npt
+
+from namedivider.divider.config import BasicNameDividerConfig, GBDTNameDividerConfig
+from namedivider.feature.family_name import (
+    ArrayFamilyNameRepository,
+    FamilyNameRepository,
+)
+from namedivider.feature.kanji import KanjiStatisticsRepository
+
+MODEL_STORE_MAGIC = b"NDSTORE\x00"
+MODEL_STORE_FORMAT_VERSION = 1
+_PREFIX = struct.Struct("<8sII")
+_ALIGNMENT = 64
+
+
+class ModelStoreFormatError(ValueError):
+    """
+    Raised when a buffer is not a model store, or its format version is not supported.
+    """
+
+
+def _align(offset: int) -> int:
+    return (offset + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+
+def build_model_store_bytes(
+    arrays: dict[str, npt.NDArray[Any]], metadata: Optional[dict[str, Any]] = None
+) -> tuple[bytes, list[tuple[int, npt.NDArray[Any]]]]:
+    """
+    Builds the prefix and header of a model store, and the positions of the arrays.
+    :param arrays: Arrays to be stored, by name.
+    :param metadata: JSON-serializable metadata to be stored.
+    :return: [prefix_and_header, placements]
+      prefix_and_header: Bytes from the beginning of the buffer to the end of the header.
+      placements: Offset and contiguous array to be written there.
+    """
+    array_headers: dict[str, dict[str, Any]] = {}
+    placements: list[tuple[int, npt.NDArray[Any]]] = []
+    contiguous_arrays = {_name: np.ascontiguousarray(_array) for _name, _array in arrays.items()}
+    # Offsets depend on the header length, so fix the header length first with placeholder offsets.
+    offset = 0
+    for _name, _array in contiguous_arrays.items():
+        array_headers[_name] = {"dtype": _array.dtype.str, "shape": list(_array.shape), "offset": offset}
+    header_length = 0
+    while True:
+        header = json.dumps({"arrays": array_headers, "metadata": metadata or {}}).encode()
+        if len(header) == header_length:
+            break
+        header_length = len(header)
+        offset = _align(_PREFIX.size + header_length)
+        placements = []
+        for _name, _array in contiguous_arrays.items():
+            array_headers[_name]["offset"] = offset
+            placements.append((offset, _array))
+            offset = _align(offset + _array.nbytes)
+    prefix = _PREFIX.pack(MODEL_STORE_MAGIC, MODEL_STORE_FORMAT_VERSION, header_length)
+    return prefix + header, placements
+
+
+def _total_size(prefix_and_header: bytes, placements: list[tuple[int, npt.NDArray[Any]]]) -> int:
+    size = len(prefix_and_header)
+    for _offset, _array in placements:
+        size = max(size, _offset + _array.nbytes)
+    return max(size, 1)
+
+
+def _write(buffer: memoryview, prefix_and_header: bytes, placements: list[tuple[int, npt.NDArray[Any]]]) -> None:
+    buffer[: len(prefix_and_header)] = prefix_and_header
+    for _offset, _array in placements:
+        buffer[_offset : _offset + _array.nbytes] = _array.reshape(-1).view(np.uint8).data
+
+
+class _SharedMemory(shared_memory.SharedMemory):
+    """
+    SharedMemory that can be garbage collected while numpy views of it are still alive (e.g. at exit).
+    """
+
+    def __del__(self) -> None:
+        try:
+            self.close()
+        except BufferError:
+            pass
+
+
+def _attach_untracked(name: str) -> shared_memory.SharedMemory:
+    """
+    Attaches a shared memory block without registering it to the resource tracker.
+    Otherwise the block owned by the creator would be unlinked when the attaching process exits.
+    """
+    if sys.version_info >= (3, 13):
+        return _SharedMemory(name=name, track=False)
+    from multiprocessing import resource_tracker
+
+    shm = _SharedMemory(name=name)
+    resource_tracker.unregister(shm._name, "shared_memory")  # type: ignore[attr-defined]
+    return shm
+
+
+class ModelStore:
+    """
+    Read-only view of the assets of dividers placed in a flat buffer.
+
+    :example
+    -----------------------------------------------------
+    >>> # In the master process (e.g. gunicorn's on_starting hook)
+    >>> store = ModelStore.create_shared(GBDTNameDividerConfig(), name="namedivider")
+    >>> # In each worker process
+    >>> store = ModelStore.attach_shared("namedivider")
+    >>> divider = GBDTNameDivider.from_model_store(store)
+    -----------------------------------------------------
+    """
+
+    def __init__(self, buffer: memoryview, owner: Any = None):
+        """
+        :param buffer: Buffer of the model store.
+        :param owner: Object owning the buffer (SharedMemory or mmap). It is closed by close().
+        """
+        if len(buffer) < _PREFIX.size:
+            raise ModelStoreFormatError("Buffer is too small to be a model store.")
+        magic, version, header_length = _PREFIX.unpack_from(buffer, 0)
+        if magic != MODEL_STORE_MAGIC:
+            raise ModelStoreFormatError("Buffer is not a model store.")
+        if version != MODEL_STORE_FORMAT_VERSION:
+            raise ModelStoreFormatError(
+                f"Format version {version} is not supported. Supported version is {MODEL_STORE_FORMAT_VERSION}."
+            )
+        header = json.loads(bytes(buffer[_PREFIX.size : _PREFIX.size + header_length]).decode())
+        self.metadata: dict[str, Any] = header["metadata"]
+        self._buffer = buffer
+        self._owner = owner
+        self._arrays: dict[str, npt.NDArray[Any]] = {}
+        for _name, _array_header in header["arrays"].items():
+            dtype = np.dtype(_array_header["dtype"])
+            shape = tuple(_array_header["shape"])
+            count = int(np.prod(shape))
+            array = np.frombuffer(buffer, dtype=dtype, count=count, offset=_array_header["offset"]).reshape(shape)
+            array.setflags(write=False)
+            self._arrays[_name] = array
+
+    @staticmethod
+    def collect_arrays(
+        kanji_statistics_repository: KanjiStatisticsRepository,
+        family_name_repository: Optional[FamilyNameRepository] = None,
+        model_str: Optional[str] = None,
+    ) -> dict[str, npt.NDArray[Any]]:
+        """
+        Converts assets into arrays to be stored.
+        :param kanji_statistics_repository: Kanji statistics.
+        :param family_name_repository: Family name rankings. Required for GBDTNameDivider.
+        :param model_str: GBDT model in text format. Required for GBDTNameDivider.
+        :return: Arrays by name.
+        """
+        arrays: dict[str, npt.NDArray[Any]] = {
+            "kanjis": np.array(kanji_statistics_repository.kanjis, dtype=np.str_),
+            "order_counts_table": kanji_statistics_repository.order_counts_table,
+            "length_counts_table": kanji_statistics_repository.length_counts_table,
+        }
+        if family_name_repository is not None:
+            array_repository = ArrayFamilyNameRepository.from_repository(family_name_repository)
+            arrays["family_names"] = array_repository._sorted_family_names
+            arrays["family_ranks"] = array_repository._ranks
+        if model_str is not None:
+            arrays["model"] = np.frombuffer(model_str.encode(), dtype=np.uint8)
+        return arrays
+
+    @staticmethod
+    def load_assets(config: Union[BasicNameDividerConfig, GBDTNameDividerConfig]) -> dict[str, npt.NDArray[Any]]:
+        """
+        Loads the assets specified by config and converts them into arrays to be stored.
+        :param config: BasicNameDividerConfig or GBDTNameDividerConfig
+        :return: Arrays by name.
+        """
+        kanji_statistics_repository = KanjiStatisticsRepository(path_csv=config.path_csv)
+        if not isinstance(config, GBDTNameDividerConfig):
+            return ModelStore.collect_arrays(kanji_statistics_repository)
+
+        from namedivider.divider.gbdt_name_divider import load_family_name_repository
+        from namedivider.util import download_gbdt_model_v1_if_needed
+
+        family_name_repository = load_family_name_repository(config.path_family_names)
+        download_gbdt_model_v1_if_needed(config.path_model)
+        with open(config.path_model, "rb") as f:
+            model_str = f.read().decode()
+        return ModelStore.collect_arrays(kanji_statistics_repository, family_name_repository, model_str)
+
+    @classmethod
+    def create_shared(
+        cls,
+        config: Union[BasicNameDividerConfig, GBDTNameDividerConfig],
+        name: Optional[str] = None,
+        metadata: Optional[dict[str, Any]] = None,
+    ) -> "ModelStore":
+        """
+        Loads the assets specified by config into a new shared memory block.
+        The creator is responsible for calling unlink() when the store is no longer needed.
+        :param config: BasicNameDividerConfig or GBDTNameDividerConfig
+        :param name: Name of the shared memory block. If None, a unique name is generated.
+        :param metadata: JSON-serializable metadata to be stored.
+        :return: ModelStore instance
+        :rtype: ModelStore
+        """
+        return cls.create_shared_from_arrays(cls.load_assets(config), name=name, metadata=metadata)
+
+    @classmethod
+    def create_shared_from_arrays(
+        cls, arrays: dict[str, npt.NDArray[Any]], name: Optional[str] = None, metadata: Optional[dict[str, Any]] = None
+    ) -> "ModelStore":
+        """
+        Writes arrays into a new shared memory block.
+        :param arrays: Arrays by name (See collect_arrays).
+        :param name: Name of the shared memory block. If None, a unique name is generated.
+        :param metadata: JSON-serializable metadata to be stored.
+        :return: ModelStore instance
+        :rtype: ModelStore
+        """
+        prefix_and_header, placements = build_model_store_bytes(arrays, metadata)
+        shm = _SharedMemory(name=name, create=True, size=_total_size(prefix_and_header, placements))
+        _write(shm.buf, prefix_and_header, placements)
+        return cls(shm.buf, owner=shm)
+
+    @classmethod
+    def attach_shared(cls, name: str) -> "ModelStore":
+        """
+        Attaches a shared memory block created by create_shared.
+        :param name: Name of the shared memory block.
+        :return: ModelStore instance
+        :rtype: ModelStore
+        """
+        shm = _attach_untracked(name)
+        return cls(shm.buf, owner=shm)
+
+    @classmethod
+    def save_from_arrays(
+        cls, path: Union[str, Path], arrays: dict[str, npt.NDArray[Any]], metadata: Optional[dict[str, Any]] = None
+    ) -> None:
+        """
+        Writes arrays into a file, which can be opened by open_file.
+        :param path: Path of the file.
+        :param arrays: Arrays by name (See collect_arrays).
+        :param metadata: JSON-serializable metadata to be stored.
+        """
+        prefix_and_header, placements = build_model_store_bytes(arrays, metadata)
+        with open(path, "wb") as f:
+            f.write(prefix_and_header)
+            for _offset, _array in placements:
+                f.write(b"\x00" * (_offset - f.tell()))
+                f.write(_array.tobytes())
+
+    @classmethod
+    def save(
+        cls,
+        path: Union[str, Path],
+        config: Union[BasicNameDividerConfig, GBDTNameDividerConfig],
+        metadata: Optional[dict[str, Any]] = None,
+    ) -> None:
+        """
+        Loads the assets specified by config and writes them into a file.
+        :param path: Path of the file.
+        :param config: BasicNameDividerConfig or GBDTNameDividerConfig
+        :param metadata: JSON-serializable metadata to be stored.
+        """
+        cls.save_from_arrays(path, cls.load_assets(config), metadata=metadata)
+
+    @classmethod
+    def open_file(cls, path: Union[str, Path]) -> "ModelStore":
+        """
+        Memory-maps a file written by save. Processes opening the same file share its pages.
+        :param path: Path of the file.
+        :return: ModelStore instance
+        :rtype: ModelStore
+        """
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(memoryview(mapped), owner=mapped)
+
+    @property
+    def name(self) -> Optional[str]:
+        """
+        Name of the shared memory block, or None if the store is not in shared memory.
+        """
+        if isinstance(self._owner, shared_memory.SharedMemory):
+            return self._owner.name
+        return None
+
+    def has_array(self, name: str) -> bool:
+        """
+        Returns if the store contains the array.
+        :param name: Name of the array.
+        """
+        return name in self._arrays
+
+    def get_array(self, name: str) -> npt.NDArray[Any]:
+        """
+        Returns the array as a read-only view of the store.
+        :param name: Name of the array.
+        :rtype: np.ndarray
+        """
+        return self._arrays[name]
+
+    def has_gbdt_assets(self) -> bool:
+        """
+        Returns if the store contains the assets required by GBDTNameDivider.
+        """
+        return "family_names" in self._arrays and "model" in self._arrays
+
+    def kanji_statistics_repository(self) -> KanjiStatisticsRepository:
+        """
+        Returns KanjiStatisticsRepository whose tables are views of the store.
+        :rtype: KanjiStatisticsRepository
+        """
+        return KanjiStatisticsRepository.from_tables(
+            kanjis=self._arrays["kanjis"].tolist(),
+            order_counts_table=self._arrays["order_counts_table"],
+            length_counts_table=self._arrays["length_counts_table"],
+        )
+
+    def family_name_repository(self) -> ArrayFamilyNameRepository:
+        """
+        Returns FamilyNameRepository whose arrays are views of the store.
+        :rtype: ArrayFamilyNameRepository
+        """
+        if "family_names" not in self._arrays:
+            raise KeyError("The store does not contain family names.")
+        return ArrayFamilyNameRepository(family_names=self._arrays["family_names"], ranks=self._arrays["family_ranks"])
+
+    def model_str(self) -> str:
+        """
+        Returns the GBDT model in text format.
+        :rtype: str
+        """
+        if "model" not in self._arrays:
+            raise KeyError("The store does not contain a GBDT model.")
+        return self._arrays["model"].tobytes().decode()
+
+    def close(self) -> None:
+        """
+        Closes the buffer.
+        Dividers created from this store hold views of the buffer, so they must be deleted before closing.
+        """
+        self._arrays = {}
+        if isinstance(self._owner, shared_memory.SharedMemory):
+            self._owner.close()
+            return
+        self._buffer.release()
+        if self._owner is not None:
+            self._owner.close()
+
+    def unlink(self) -> None:
+        """
+        Requests the shared memory block to be destroyed. Only the creator should call this.
+        """
+        if isinstance(self._owner, shared_memory.SharedMemory):
+            self._owner.unlink()
@@ -1,9 +1,14 @@
 import abc
-from typing import Optional
+import dataclasses
+import os
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Optional, TypeVar, cast
 
 import numpy as np
 import regex
 
+from namedivider.divider.backend_selection import BackendChoice
 from namedivider.divider.config import (
     NameDividerConfigBase,
     NameDividerVersions,
@@ -11,6 +16,13 @@ from namedivider.divider.config import (
 )
 from namedivider.divider.divided_name import DividedName
 from namedivider.rule.pipeline import Pipeline
+from namedivider.util import is_gil_enabled
+
+if TYPE_CHECKING:
+    from namedivider.divider.candidate_pruner import CandidatePruner
+    from namedivider.divider.rust_backend import RustNameDividerWrapper
+
+ConfigT = TypeVar("ConfigT", bound=NameDividerConfigBase)
 
 
 class _UndividedNameHolder:
@@ -56,6 +68,13 @@ class _UndividedNameHolder:
 
 
 class _NameDivider(metaclass=abc.ABCMeta):
+    # Rust backend dividing the names not divided by rules with backend="hybrid".
+    _hybrid_divider: Optional["RustNameDividerWrapper"] = None
+    # Backend used by this divider and the reason. Set by _select_backend with backend="auto".
+    backend_choice: Optional[BackendChoice] = None
+    # Pruner of implausible divisions, which is set only with prune_candidates=True.
+    candidate_pruner: Optional["CandidatePruner"] = None
+
     @abc.abstractmethod
     def __init__(self, config: Optional[NameDividerConfigBase] = None):
         """
@@ -66,12 +85,26 @@ class _NameDivider(metaclass=abc.ABCMeta):
         """
         if config is None:
             config = NameDividerConfigBase()
+        self.config = config
+        if self.backend_choice is None:
+            self.backend_choice = BackendChoice(backend=config.backend, reason="Specified by the configuration.")
         self.separator = config.separator
         self.normalize_name = config.normalize_name
         self.algorithm_name = config.algorithm_name
         self._rule_pipeline = Pipeline(separator=self.separator, custom_rules=config.custom_rules)
         self._compiled_regex_kanji = regex.compile(r"\p{Script=Han}+")
 
+    def _select_backend(self, config: ConfigT) -> ConfigT:
+        """
+        Chooses the backend for backend="auto", and sets backend_choice.
+        :param config: Configuration with backend="auto"
+        :return: Configuration with the chosen backend
+        """
+        from namedivider.divider.backend_selection import select_backend
+
+        self.backend_choice = select_backend(config, type(self), benchmark=config.auto_benchmark)
+        return dataclasses.replace(config, backend=self.backend_choice.backend)
+
     @abc.abstractmethod
     def calc_score(self, family: str, given: str) -> float:
         """
@@ -82,6 +115,16 @@ class _NameDivider(metaclass=abc.ABCMeta):
         """
         pass
 
+    def calc_scores(self, families: Sequence[str], givens: Sequence[str]) -> list[float]:
+        """
+        Calculates the scores of multiple divisions at once.
+        Override this method when the scores can be calculated more efficiently in a batch.
+        :param families: Family names.
+        :param givens: Given names. Must be the same length as families.
+        :return: Scores of dividing, in the same order as input.
+        """
+        return [self.calc_score(_family, _given) for _family, _given in zip(families, givens)]
+
     @classmethod
     def from_version(cls, version: NameDividerVersions) -> "_NameDivider":
         """
@@ -141,6 +184,17 @@ class _NameDivider(metaclass=abc.ABCMeta):
 
         return divided_name_or_none
 
+    def _candidate_family_lengths(self, undivided_name: str) -> Sequence[int]:
+        """
+        Returns the divisions of undivided name to score, as the lengths of the family names.
+        All divisions are scored unless prune_candidates=True.
+        :param undivided_name: Names with no space between the family name and given name
+        :return: Lengths of the family names in ascending order
+        """
+        if self.candidate_pruner is not None:
+            return self.candidate_pruner.select_family_lengths(undivided_name)
+        return range(1, len(undivided_name))
+
     def _divide_by_algorithm(self, undivided_name: str) -> DividedName:
         """
         Divides undivided name using kanji statistics.
@@ -148,22 +202,66 @@ class _NameDivider(metaclass=abc.ABCMeta):
         :return: Divided name
         :rtype: DividedName
         """
+        if self._hybrid_divider is not None:
+            return self._hybrid_divider.divide_name(undivided_name)
+
+        family_lengths = self._candidate_family_lengths(undivided_name)
         total_scores = []
-        for i in range(1, len(undivided_name)):
+        for i in family_lengths:
             family = undivided_name[:i]
             given = undivided_name[i:]
             score = self.calc_score(family, given)
             total_scores.append(score)
 
         total_scores = self._softmax(total_scores)
-        max_idx = np.argmax(np.array(total_scores)) + 1
+        max_pos = int(np.argmax(np.array(total_scores)))
+        max_idx = family_lengths[max_pos]
         return self._create_divided_name(
             family=undivided_name[:max_idx],
             given=undivided_name[max_idx:],
-            score=total_scores[max_idx - 1],
+            score=total_scores[max_pos],
             algorithm=self.algorithm_name,
         )
 
+    def _divide_by_algorithm_batch(self, undivided_names: Sequence[str]) -> list[DividedName]:
+        """
+        Divides undivided names using kanji statistics, scoring all candidates of all names in one pass.
+        The result of each name is the same as _divide_by_algorithm.
+        :param undivided_names: Names with no space between the family name and given name
+        :return: Divided names
+        :rtype: list[DividedName]
+        """
+        if len(undivided_names) == 0:
+            return []
+        if self._hybrid_divider is not None:
+            return self._hybrid_divider.divide_names(undivided_names)
+        all_family_lengths = [self._candidate_family_lengths(_undivided_name) for _undivided_name in undivided_names]
+        families = []
+        givens = []
+        for _undivided_name, _family_lengths in zip(undivided_names, all_family_lengths):
+            for i in _family_lengths:
+                families.append(_undivided_name[:i])
+                givens.append(_undivided_name[i:])
+        all_scores = self.calc_scores(families, givens)
+
+        divided_names = []
+        offset = 0
+        for _undivided_name, _family_lengths in zip(undivided_names, all_family_lengths):
+            n_candidates = len(_family_lengths)
+            total_scores = self._softmax(list(all_scores[offset : offset + n_candidates]))
+            offset += n_candidates
+            max_pos = int(np.argmax(np.array(total_scores)))
+            max_idx = _family_lengths[max_pos]
+            divided_names.append(
+                self._create_divided_name(
+                    family=_undivided_name[:max_idx],
+                    given=_undivided_name[max_idx:],
+                    score=total_scores[max_pos],
+                    algorithm=self.algorithm_name,
+                )
+            )
+        return divided_names
+
     def _divide_name(self, undivided_name: str) -> DividedName:
         """
         Divides undivided name.
@@ -190,3 +288,57 @@ class _NameDivider(metaclass=abc.ABCMeta):
             return holder.get_divided_original_name(divided_name)
         else:
             return self._divide_name(undivided_name)
+
+    def divide_names(self, undivided_names: Sequence[str], num_threads: Optional[int] = 1) -> list[DividedName]:
+        """
+        Divides undivided names.
+        The candidates of all names not divided by rules are scored in one pass (See calc_scores).
+        :param undivided_names: Names with no space between the family name and given name
+        :param num_threads: Number of threads sharing this divider. If None, the number of CPUs is used.
+            Names are split across threads only on free-threaded builds (e.g. 3.13t) running without the GIL,
+            because threads can not divide names in parallel under the GIL.
+            Otherwise, names are divided in the calling thread.
+        :return: Divided names, in the same order as undivided_names
+        :rtype: list[DividedName]
+        """
+        if num_threads is None:
+            num_threads = os.cpu_count() or 1
+        num_threads = min(num_threads, len(undivided_names))
+        if num_threads <= 1 or is_gil_enabled():
+            return self._divide_names(undivided_names)
+
+        chunk_size = -(-len(undivided_names) // num_threads)
+        chunks = [undivided_names[i : i + chunk_size] for i in range(0, len(undivided_names), chunk_size)]
+        with ThreadPoolExecutor(max_workers=num_threads) as executor:
+            results = executor.map(self._divide_names, chunks)
+            return [_divided_name for _result in results for _divided_name in _result]
+
+    def _divide_names(self, undivided_names: Sequence[str]) -> list[DividedName]:
+        """
+        Divides undivided names in the calling thread.
+        :param undivided_names: Names with no space between the family name and given name
+        :return: Divided names, in the same order as undivided_names
+        :rtype: list[DividedName]
+        """
+        divided_names: list[Optional[DividedName]] = []
+        holders: list[Optional[_UndividedNameHolder]] = []
+        indices_for_algorithm = []
+        names_for_algorithm = []
+        for idx, _undivided_name in enumerate(undivided_names):
+            self._validate(_undivided_name)
+            holder = _UndividedNameHolder(_undivided_name) if self.normalize_name else None
+            name = holder.normalized_name if holder is not None else _undivided_name
+            holders.append(holder)
+            divided_names.append(self._divide_by_rule_base(name))
+            if divided_names[-1] is None:
+                indices_for_algorithm.append(idx)
+                names_for_algorithm.append(name)
+
+        for idx, _divided_name in zip(indices_for_algorithm, self._divide_by_algorithm_batch(names_for_algorithm)):
+            divided_names[idx] = _divided_name
+
+        results = []
+        for _holder, _divided_name_or_none in zip(holders, divided_names):
+            _divided_name = cast(DividedName, _divided_name_or_none)
+            results.append(_holder.get_divided_original_name(_divided_name) if _holder is not None else _divided_name)
+        return results
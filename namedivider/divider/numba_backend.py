@@ -0,0 +1,208 @@
+"""
+Numba backend of BasicNameDivider.
+
+The order scores, the length scores and the split loop of _divide_by_algorithm are compiled with numba.
+Names are encoded into the row indices of the dense tables of KanjiStatisticsRepository,
+and all candidates of all names are scored in one call of the compiled kernel.
+numba is an optional dependency. Use is_numba_available to check whether it is installed.
+"""
+from collections.abc import Sequence
+from functools import lru_cache
+from typing import Any, Callable
+
+import numpy as np
+import numpy.typing as npt
+
+from namedivider.feature.functional import _create_mask_tables
+from namedivider.feature.kanji import KanjiStatisticsRepository
+
+
+class NumbaNotAvailableError(ImportError):
+    """Raised when the numba backend is requested but numba is not installed."""
+
+    def __init__(self, message: str = "numba is not installed. Install it with: pip install numba"):
+        super().__init__(message)
+
+
+def is_numba_available() -> bool:
+    """
+    Checks whether numba can be imported.
+    :return: True if numba is installed.
+    :rtype: bool
+    """
+    try:
+        import numba  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _divide_encoded(
+    codes: npt.NDArray[np.int64],
+    offsets: npt.NDArray[np.int64],
+    order_counts_table: npt.NDArray[np.int64],
+    length_counts_table: npt.NDArray[np.int64],
+    order_mask_table: npt.NDArray[np.int64],
+    length_mask_table: npt.NDArray[np.int64],
+    only_order_score_when_4: bool,
+) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.float64]]:
+    """
+    Divides encoded names. This function is compiled by numba (See _compile_kernel).
+    Scores are summed in the same order as calc_order_score, calc_length_score and BasicNameDivider.calc_score.
+    :param codes: Row indices of the characters of all names.
+    :param offsets: Start of each name in codes, followed by len(codes).
+    :param order_counts_table: order_counts_table of KanjiStatisticsRepository.
+    :param length_counts_table: length_counts_table of KanjiStatisticsRepository.
+    :param order_mask_table: Order masks by full name length and character index.
+    :param length_mask_table: Length masks by full name length and character index.
+    :param only_order_score_when_4: See BasicNameDividerConfig.
+    :return: [family_lengths, scores]
+      family_lengths: Length of the family name of each name.
+      scores: Softmax score of the chosen division of each name.
+    """
+    num_names = len(offsets) - 1
+    family_lengths = np.zeros(num_names, dtype=np.int64)
+    scores = np.zeros(num_names, dtype=np.float64)
+    for k in range(num_names):
+        start = offsets[k]
+        length = offsets[k + 1] - start
+        candidate_scores = np.zeros(length - 1, dtype=np.float64)
+        for i in range(1, length):
+            family_order_score = 0.0
+            given_order_score = 0.0
+            family_length_score = 0.0
+            given_length_score = 0.0
+            given_length = length - i
+            for idx in range(length):
+                code = codes[start + idx]
+                is_family = idx < i
+                idx_in_piece = idx if is_family else idx - i
+                piece_length = i if is_family else given_length
+
+                # Order score. The masks of the first and last characters are zeros.
+                if 0 < idx < length - 1:
+                    if idx_in_piece == 0:
+                        status = 0
+                    elif idx_in_piece == piece_length - 1:
+                        status = 2
+                    else:
+                        status = 1
+                    if not is_family:
+                        status += 3
+                    total = 0
+                    for c in range(6):
+                        total += order_counts_table[code, c] * order_mask_table[length, idx, c]
+                    if total != 0:
+                        score = order_counts_table[code, status] * order_mask_table[length, idx, status] / total
+                        if is_family:
+                            family_order_score += score
+                        else:
+                            given_order_score += score
+
+                # Length score.
+                status = min(piece_length, 4) - 1
+                if not is_family:
+                    status += 4
+                total = 0
+                for c in range(8):
+                    total += length_counts_table[code, c] * length_mask_table[length, idx, c]
+                if total != 0:
+                    score = length_counts_table[code, status] * length_mask_table[length, idx, status] / total
+                    if is_family:
+                        family_length_score += score
+                    else:
+                        given_length_score += score
+
+            order_score = (family_order_score + given_order_score) / (length - 2)
+            if only_order_score_when_4 and length == 4:
+                candidate_scores[i - 1] = order_score
+            else:
+                length_score = (family_length_score + given_length_score) / length
+                candidate_scores[i - 1] = (order_score + length_score) / 2.0
+
+        # Softmax and argmax (See _NameDivider._softmax).
+        exp_scores = np.exp(candidate_scores)
+        exp_sum = 0.0
+        for i in range(length - 1):
+            exp_sum += exp_scores[i]
+        max_idx = 0
+        max_score = exp_scores[0] / exp_sum
+        for i in range(1, length - 1):
+            softmax_score = exp_scores[i] / exp_sum
+            if softmax_score > max_score:
+                max_idx = i
+                max_score = softmax_score
+        family_lengths[k] = max_idx + 1
+        scores[k] = max_score
+    return family_lengths, scores
+
+
+@lru_cache(maxsize=1)
+def _compile_kernel() -> Callable[..., Any]:
+    """
+    Compiles _divide_encoded with numba. Compiled code is cached on disk, so that it is compiled once per environment.
+    :return: Compiled _divide_encoded
+    """
+    try:
+        import numba
+    except ImportError as e:
+        raise NumbaNotAvailableError() from e
+    return numba.njit(cache=True, nogil=True)(_divide_encoded)
+
+
+@lru_cache(maxsize=16)
+def _mask_tables(max_length: int) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+    """
+    Returns the read-only mask tables of all lengths up to max_length.
+    """
+    order_mask_table, length_mask_table = _create_mask_tables(max_length)
+    order_mask_table.setflags(write=False)
+    length_mask_table.setflags(write=False)
+    return order_mask_table, length_mask_table
+
+
+class NumbaDivisionEngine:
+    """
+    Divides names by the algorithm of BasicNameDivider with the kernel compiled by numba.
+    The engine holds no state which changes after the construction, so one instance can be shared by threads.
+    """
+
+    def __init__(self, kanji_statistics_repository: KanjiStatisticsRepository, only_order_score_when_4: bool = False):
+        """
+        :param kanji_statistics_repository: Class for managing Kanji statistics.
+        :param only_order_score_when_4: See BasicNameDividerConfig.
+        :raises NumbaNotAvailableError: If numba is not installed.
+        """
+        self._kernel = _compile_kernel()
+        self.kanji_statistics_repository = kanji_statistics_repository
+        self.only_order_score_when_4 = only_order_score_when_4
+
+    def divide_names(self, undivided_names: Sequence[str]) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.float64]]:
+        """
+        Divides undivided names, which must have at least 3 characters.
+        :param undivided_names: Names with no space between the family name and given name
+        :return: [family_lengths, scores]
+          family_lengths: Length of the family name of each name.
+          scores: Confidence level of each division, from 0 to 1.
+        """
+        if len(undivided_names) == 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float64)
+        lengths = np.fromiter(map(len, undivided_names), dtype=np.int64, count=len(undivided_names))
+        if lengths.min() < 3:
+            raise ValueError("Names divided by the numba backend need at least 3 chars")
+        offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        codes = self.kanji_statistics_repository.encode("".join(undivided_names))
+        order_mask_table, length_mask_table = _mask_tables(int(lengths.max()))
+        family_lengths: npt.NDArray[np.int64]
+        scores: npt.NDArray[np.float64]
+        family_lengths, scores = self._kernel(
+            codes,
+            offsets,
+            self.kanji_statistics_repository.order_counts_table,
+            self.kanji_statistics_repository.length_counts_table,
+            order_mask_table,
+            length_mask_table,
+            self.only_order_score_when_4,
+        )
+        return family_lengths, scores
@@ -0,0 +1,203 @@
+"""
+Hot-reload support for namedivider.
+
+Dividers load kanji statistics, family names and the GBDT model once in the constructor.
+This module rebuilds the divider when its asset files change (or on request) and swaps it in atomically,
+so that long-running services pick up new statistics without restarting.
+"""
+import logging
+import threading
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Callable, Optional, Union
+
+from namedivider.divider.config import NameDividerConfigBase
+from namedivider.divider.divided_name import DividedName
+from namedivider.divider.factory import create_divider_from_config
+from namedivider.divider.name_divider_base import _NameDivider
+
+logger = logging.getLogger(__name__)
+
+# Attributes of configs holding the paths of assets.
+_ASSET_PATH_ATTRIBUTES = ("path_csv", "path_family_names", "path_model")
+
+_FileSignature = Optional[tuple[int, int]]
+
+
+def _file_signature(path: Path) -> _FileSignature:
+    """
+    Returns modification time and size of the file, or None if it does not exist.
+    """
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class ReloadableNameDivider:
+    """
+    Divider that swaps in a new divider when the asset files are updated.
+
+    Each call uses the divider which is current when the call starts, so calls in flight during a reload
+    finish on the old assets, and all later calls use the new ones.
+    Caches are owned by each divider, so they are discarded together with the old assets.
+
+    :example
+    -----------------------------------------------------
+    >>> divider = ReloadableNameDivider(GBDTNameDividerConfig(path_csv="kanji.csv"), poll_interval=60)
+    >>> divider.divide_name("菅義偉")
+    DividedName(family='菅', given='義偉', separator=' ', score=0.7300634880343344, algorithm='gbdt')
+    >>> # After kanji.csv is replaced, the next poll reloads it. Or reload explicitly:
+    >>> divider.reload()
+    -----------------------------------------------------
+    """
+
+    def __init__(
+        self,
+        config: NameDividerConfigBase,
+        poll_interval: Optional[float] = None,
+        watch_paths: Optional[Sequence[Union[str, Path]]] = None,
+        factory: Callable[[NameDividerConfigBase], _NameDivider] = create_divider_from_config,
+    ):
+        """
+        :param config: BasicNameDividerConfig or GBDTNameDividerConfig
+        :param poll_interval: Seconds between checks of the asset files in a background thread.
+            If None, files are checked only when reload_if_changed is called.
+        :param watch_paths: Files to watch. Defaults to the asset paths in config.
+        :param factory: Function creating a divider from config.
+        """
+        self._factory = factory
+        self._lock = threading.Lock()
+        self._config = config
+        # Paths given by the caller are kept across reloads with new configs.
+        self._custom_watch_paths = watch_paths is not None
+        self._watch_paths = self._get_watch_paths(config) if watch_paths is None else [Path(p) for p in watch_paths]
+        self._signatures = self._current_signatures()
+        # Signatures of the files which failed to load, so that they are not loaded again until they change.
+        self._failed_signatures: Optional[list[_FileSignature]] = None
+        self._divider = factory(config)
+        self.version = 1
+        self.last_error: Optional[BaseException] = None
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        if poll_interval is not None:
+            self._thread = threading.Thread(
+                target=self._watch, args=(poll_interval,), name="ReloadableNameDivider", daemon=True
+            )
+            self._thread.start()
+
+    @staticmethod
+    def _get_watch_paths(config: NameDividerConfigBase) -> list[Path]:
+        return [
+            Path(getattr(config, _attribute)) for _attribute in _ASSET_PATH_ATTRIBUTES if hasattr(config, _attribute)
+        ]
+
+    def _current_signatures(self) -> list[_FileSignature]:
+        return [_file_signature(_path) for _path in self._watch_paths]
+
+    @property
+    def divider(self) -> _NameDivider:
+        """
+        Divider which is current now. Hold the returned divider to use one version for several calls.
+        """
+        return self._divider
+
+    def reload(
+        self,
+        config: Optional[NameDividerConfigBase] = None,
+        watch_paths: Optional[Sequence[Union[str, Path]]] = None,
+    ) -> None:
+        """
+        Builds a new divider and swaps it in. If building fails, the current divider is kept.
+        :param config: New configuration. If None, the current configuration is reloaded.
+        :param watch_paths: New files to watch. If None, the files given to the constructor are kept,
+            or the asset paths in the new config are watched if none were given.
+        """
+        with self._lock:
+            config = self._config if config is None else config
+            custom_watch_paths = self._custom_watch_paths or watch_paths is not None
+            if watch_paths is not None:
+                new_watch_paths = [Path(p) for p in watch_paths]
+            elif config is self._config or self._custom_watch_paths:
+                new_watch_paths = self._watch_paths
+            else:
+                new_watch_paths = self._get_watch_paths(config)
+            signatures = [_file_signature(_path) for _path in new_watch_paths]
+            # Calls keep using the current divider while the new one is built.
+            try:
+                divider = self._factory(config)
+            except Exception:
+                if config is self._config and new_watch_paths is self._watch_paths:
+                    self._failed_signatures = signatures
+                raise
+            self._config = config
+            self._watch_paths = new_watch_paths
+            self._custom_watch_paths = custom_watch_paths
+            self._signatures = signatures
+            self._failed_signatures = None
+            self._divider = divider
+            self.version += 1
+            self.last_error = None
+
+    def is_changed(self) -> bool:
+        """
+        Returns if any watched file has been modified, created or deleted since the last load.
+        Files which failed to load are not regarded as changed until they change again.
+        """
+        signatures = self._current_signatures()
+        return signatures != self._signatures and signatures != self._failed_signatures
+
+    def reload_if_changed(self) -> bool:
+        """
+        Reloads the divider if any watched file has been changed.
+        :return: True if reloaded.
+        """
+        if not self.is_changed():
+            return False
+        self.reload()
+        return True
+
+    def _watch(self, poll_interval: float) -> None:
+        """
+        Main loop of the watcher thread.
+        """
+        while not self._stop_event.wait(poll_interval):
+            try:
+                self.reload_if_changed()
+            except Exception as e:
+                # Files may be in the middle of being replaced. Keep the current divider and retry when they change.
+                self.last_error = e
+                logger.warning("Failed to reload namedivider assets: %s", e)
+
+    def divide_name(self, undivided_name: str) -> DividedName:
+        """
+        Divides undivided name with the current divider.
+        :param undivided_name: Names with no space between the family name and given name
+        :return: Divided name
+        :rtype: DividedName
+        """
+        return self._divider.divide_name(undivided_name)
+
+    def divide_names(self, undivided_names: Sequence[str]) -> list[DividedName]:
+        """
+        Divides undivided names with the current divider. All names are divided by the same version.
+        :param undivided_names: Names with no space between the family name and given name
+        :return: Divided names, in the same order as undivided_names
+        :rtype: list[DividedName]
+        """
+        return self._divider.divide_names(undivided_names)
+
+    def close(self) -> None:
+        """
+        Stops the watcher thread.
+        """
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "ReloadableNameDivider":
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
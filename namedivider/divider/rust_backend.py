@@ -4,6 +4,8 @@ Rust backend support for namedivider.
 This module provides optional Rust backend functionality for improved performance.
 The Rust backend is a beta feature and requires the namedivider-core package.
 """
+import inspect
+from collections.abc import Sequence
 from pathlib import Path
 from typing import Any, Optional, Union
 
@@ -25,6 +27,18 @@ class RustNameDividerWrapper:
 
     def __init__(self, rust_divider: Any):
         self._rust_divider = rust_divider
+        # Older versions of namedivider-core have no batch API.
+        self.supports_batch = callable(getattr(rust_divider, "divide_names", None))
+
+    @staticmethod
+    def _to_divided_name(rust_result: Any) -> DividedName:
+        return DividedName(
+            family=rust_result.family,
+            given=rust_result.given,
+            separator=rust_result.separator,
+            score=rust_result.score,
+            algorithm=rust_result.algorithm,
+        )
 
     def divide_name(self, undivided_name: str) -> DividedName:
         """
@@ -36,14 +50,40 @@ class RustNameDividerWrapper:
         Returns:
             Python DividedName object
         """
-        rust_result = self._rust_divider.divide_name(undivided_name)
-        return DividedName(
-            family=rust_result.family,
-            given=rust_result.given,
-            separator=rust_result.separator,
-            score=rust_result.score,
-            algorithm=rust_result.algorithm,
-        )
+        return self._to_divided_name(self._rust_divider.divide_name(undivided_name))
+
+    def divide_names_raw(self, undivided_names: Sequence[str]) -> list[Any]:
+        """
+        Divides undivided names using Rust backend, and returns the results of the Rust backend as they are.
+
+        The results have the same attributes as DividedName (family, given, separator, score, algorithm)
+        and to_dict, but are not converted into Python DividedName objects.
+        The whole list is passed to the Rust backend in one call if the installed namedivider-core supports it.
+
+        Args:
+            undivided_names: Names with no space between the family name and given name
+
+        Returns:
+            DividedName objects of the Rust backend, in the same order as undivided_names
+        """
+        if self.supports_batch:
+            return list(self._rust_divider.divide_names(list(undivided_names)))
+        return [self._rust_divider.divide_name(_undivided_name) for _undivided_name in undivided_names]
+
+    def divide_names(self, undivided_names: Sequence[str]) -> list[DividedName]:
+        """
+        Divides undivided names using Rust backend.
+
+        The whole list is passed to the Rust backend in one call if the installed namedivider-core supports it.
+
+        Args:
+            undivided_names: Names with no space between the family name and given name
+
+        Returns:
+            Python DividedName objects, in the same order as undivided_names
+        """
+        to_divided_name = self._to_divided_name
+        return [to_divided_name(_rust_result) for _rust_result in self.divide_names_raw(undivided_names)]
 
     def calc_score(self, family: str, given: str) -> float:
         """
@@ -133,6 +173,9 @@ def validate_rust_basic_config(config: NameDividerConfigBase) -> None:
     if config.cache_mask is True:
         errors.append("cache_mask=True")
 
+    if config.prune_candidates is True:
+        errors.append("prune_candidates=True")
+
     if _is_non_default_path(config.path_csv, KANJI_CSV_DEFAULT_PATH):
         errors.append("custom path_csv")
 
@@ -171,6 +214,9 @@ def validate_rust_gbdt_config(config: NameDividerConfigBase) -> None:
     if config.cache_mask is True:
         errors.append("cache_mask=True")
 
+    if config.prune_candidates is True:
+        errors.append("prune_candidates=True")
+
     if _is_non_default_path(config.path_csv, KANJI_CSV_DEFAULT_PATH):
         errors.append("custom path_csv")
 
@@ -187,6 +233,102 @@ def validate_rust_gbdt_config(config: NameDividerConfigBase) -> None:
         )
 
 
+def _constructor_parameters(rust_class: Any) -> set[str]:
+    """
+    Get the names of the parameters of a constructor of the Rust backend.
+
+    Args:
+        rust_class: Class of namedivider_core
+
+    Returns:
+        Names of the parameters, or an empty set if the signature is not available
+    """
+    try:
+        return set(inspect.signature(rust_class).parameters)
+    except (TypeError, ValueError):
+        return set()
+
+
+def _get_custom_asset_paths(
+    config: NameDividerConfigBase, rust_class: Any, default_paths: dict[str, Union[str, Path]]
+) -> dict[str, str]:
+    """
+    Get the non-default asset paths of configuration to pass to a constructor of the Rust backend.
+
+    Args:
+        config: Configuration object
+        rust_class: Class of namedivider_core
+        default_paths: Default path of each attribute of configuration holding an asset path
+
+    Returns:
+        Custom paths by the name of the parameter, which is the same as the attribute of configuration
+
+    Raises:
+        RustBackendUnsupportedConfigError: If the installed namedivider_core cannot load custom paths
+    """
+    parameters = _constructor_parameters(rust_class)
+    paths = {}
+    errors = []
+    for _name, _default_path in default_paths.items():
+        path = getattr(config, _name)
+        if not _is_non_default_path(path, _default_path):
+            continue
+        if _name in parameters:
+            paths[_name] = str(path)
+        else:
+            errors.append(f"custom {_name}")
+
+    if errors:
+        raise RustBackendUnsupportedConfigError(
+            f"Unsupported configuration for the installed namedivider-core: {', '.join(errors)}. "
+            "Use backend='python' to access these features."
+        )
+    return paths
+
+
+def get_hybrid_asset_paths(config: NameDividerConfigBase, namedivider_core: Any) -> dict[str, str]:
+    """
+    Get the non-default asset paths of configuration to pass to the Rust backend with backend="hybrid".
+
+    Args:
+        config: BasicNameDividerConfig or GBDTNameDividerConfig
+        namedivider_core: namedivider_core module
+
+    Returns:
+        Custom paths by the name of the parameter of the constructor
+
+    Raises:
+        TypeError: If config is neither BasicNameDividerConfig nor GBDTNameDividerConfig
+        RustBackendUnsupportedConfigError: If the installed namedivider_core cannot load custom paths,
+            or prune_candidates=True is specified
+    """
+    from namedivider.divider.config import (
+        FAMILY_NAME_PKL_DEFAULT_PATH,
+        GBDT_MODEL_V1_DEFAULT_PATH,
+        KANJI_CSV_DEFAULT_PATH,
+    )
+
+    if config.prune_candidates is True:
+        raise RustBackendUnsupportedConfigError(
+            "Unsupported configuration for Rust backend: prune_candidates=True. "
+            "Use backend='python' to access these features."
+        )
+
+    if isinstance(config, BasicNameDividerConfig):
+        return _get_custom_asset_paths(config, namedivider_core.BasicNameDivider, {"path_csv": KANJI_CSV_DEFAULT_PATH})
+    if isinstance(config, GBDTNameDividerConfig):
+        return _get_custom_asset_paths(
+            config,
+            namedivider_core.GBDTNameDivider,
+            {
+                "path_csv": KANJI_CSV_DEFAULT_PATH,
+                "path_family_names": FAMILY_NAME_PKL_DEFAULT_PATH,
+                "path_model": GBDT_MODEL_V1_DEFAULT_PATH,
+            },
+        )
+    raise TypeError(f"Expected BasicNameDividerConfig or GBDTNameDividerConfig, got {type(config).__name__}")
+
+
 def _try_import_rust_backend() -> Any:
     """
     Attempt to import namedivider_core package.
@@ -209,6 +351,10 @@ def create_rust_basic_divider(config: NameDividerConfigBase) -> RustNameDividerW
     """
     Create a Rust-based BasicNameDivider wrapper instance.
 
+    With backend="hybrid", custom_rules and cache_mask are allowed because rules are applied in Python,
+    and names are passed to the Rust backend after normalization. A custom path_csv is passed to the
+    Rust backend if the installed namedivider-core accepts it.
+
     Args:
         config: Configuration object
 
@@ -219,16 +365,22 @@ def create_rust_basic_divider(config: NameDividerConfigBase) -> RustNameDividerW
         RustBackendNotAvailableError: If namedivider_core is not available
         RustBackendUnsupportedConfigError: If unsupported configuration is specified
     """
+    is_hybrid = config.backend == "hybrid"
     # Validate configuration before creating divider
-    validate_rust_basic_config(config)
+    if not is_hybrid:
+        validate_rust_basic_config(config)
+    elif not isinstance(config, BasicNameDividerConfig):
+        raise TypeError(f"Expected BasicNameDividerConfig, got {type(config).__name__}")
 
     namedivider_core = _try_import_rust_backend()
+    asset_paths = get_hybrid_asset_paths(config, namedivider_core) if is_hybrid else {}
 
     # Create Rust BasicNameDivider with config parameters
     rust_divider = namedivider_core.BasicNameDivider(
         separator=config.separator,
-        normalize_name=config.normalize_name,
+        normalize_name=config.normalize_name and not is_hybrid,
         only_order_score_when_4=getattr(config, "only_order_score_when_4", False),
+        **asset_paths,
     )
 
     return RustNameDividerWrapper(rust_divider)
@@ -238,6 +390,10 @@ def create_rust_gbdt_divider(config: NameDividerConfigBase) -> RustNameDividerWr
     """
     Create a Rust-based GBDTNameDivider wrapper instance.
 
+    With backend="hybrid", custom_rules and cache_mask are allowed because rules are applied in Python,
+    and names are passed to the Rust backend after normalization. Custom asset paths are passed to the
+    Rust backend if the installed namedivider-core accepts them.
+
     Args:
         config: Configuration object
 
@@ -248,12 +404,19 @@ def create_rust_gbdt_divider(config: NameDividerConfigBase) -> RustNameDividerWr
         RustBackendNotAvailableError: If namedivider_core is not available
         RustBackendUnsupportedConfigError: If unsupported configuration is specified
     """
+    is_hybrid = config.backend == "hybrid"
     # Validate configuration before creating divider
-    validate_rust_gbdt_config(config)
+    if not is_hybrid:
+        validate_rust_gbdt_config(config)
+    elif not isinstance(config, GBDTNameDividerConfig):
+        raise TypeError(f"Expected GBDTNameDividerConfig, got {type(config).__name__}")
 
     namedivider_core = _try_import_rust_backend()
+    asset_paths = get_hybrid_asset_paths(config, namedivider_core) if is_hybrid else {}
 
     # Create Rust GBDTNameDivider with config parameters
-    rust_divider = namedivider_core.GBDTNameDivider(separator=config.separator, normalize_name=config.normalize_name)
+    rust_divider = namedivider_core.GBDTNameDivider(
+        separator=config.separator, normalize_name=config.normalize_name and not is_hybrid, **asset_paths
+    )
 
     return RustNameDividerWrapper(rust_divider)
@@ -0,0 +1,85 @@
+"""
+Snapshots of dividers for fast warm start.
+
+Building a divider from its source assets means parsing kanji.csv, unpickling family names and
+checking the downloaded files. A snapshot writes the prepared assets and the configuration of a divider into
+one versioned file in the model store format, which is memory-mapped when loaded.
+"""
+import pickle
+from pathlib import Path
+from typing import Any, Union
+
+import numpy as np
+
+from namedivider.divider.basic_name_divider import BasicNameDivider
+from namedivider.divider.config import BasicNameDividerConfig, GBDTNameDividerConfig
+from namedivider.divider.gbdt_name_divider import GBDTNameDivider
+from namedivider.divider.model_store import ModelStore, ModelStoreFormatError
+from namedivider.version import __version__
+
+SNAPSHOT_FORMAT_VERSION = 1
+
+
+def save_snapshot(divider: Union[BasicNameDivider, GBDTNameDivider], path: Union[str, Path]) -> None:
+    """
+    Writes the prepared assets and the configuration of a divider into a snapshot file.
+    :param divider: BasicNameDivider or GBDTNameDivider with Python backend.
+    :param path: Path of the snapshot file.
+    """
+    if divider.config.backend != "python":
+        raise ValueError("Only dividers with backend='python' can be saved as a snapshot.")
+    config = divider.config
+    config_dict: dict[str, Any] = {
+        "separator": config.separator,
+        "normalize_name": config.normalize_name,
+        "algorithm_name": config.algorithm_name,
+        "cache_mask": config.cache_mask,
+        "prune_candidates": config.prune_candidates,
+    }
+    if isinstance(divider, GBDTNameDivider):
+        arrays = ModelStore.collect_arrays(
+            kanji_statistics_repository=divider.feature_extractor.kanji_statistics_repository,
+            family_name_repository=divider.feature_extractor.family_name_repository,
+            model_str=divider.model.model_to_string(),
+        )
+    elif isinstance(divider, BasicNameDivider):
+        arrays = ModelStore.collect_arrays(divider.feature_extractor.kanji_statistics_repository)
+        config_dict["only_order_score_when_4"] = divider.only_order_score_when_4
+    else:
+        raise TypeError(f"{type(divider).__name__} cannot be saved as a snapshot.")
+    if config.custom_rules is not None:
+        arrays["custom_rules"] = np.frombuffer(pickle.dumps(config.custom_rules), dtype=np.uint8)
+    metadata = {
+        "snapshot_format_version": SNAPSHOT_FORMAT_VERSION,
+        "namedivider_version": __version__,
+        "divider": type(divider).__name__,
+        "config": config_dict,
+    }
+    ModelStore.save_from_arrays(path, arrays, metadata=metadata)
+
+
+def load_snapshot(path: Union[str, Path]) -> Union[BasicNameDivider, GBDTNameDivider]:
+    """
+    Loads a divider from a snapshot file written by save_snapshot.
+    The statistics are memory-mapped, so processes loading the same file share its pages.
+    Custom rules are unpickled, so only load snapshots from trusted sources.
+    :param path: Path of the snapshot file.
+    :return: BasicNameDivider or GBDTNameDivider, which is the same class as the saved one.
+    """
+    store = ModelStore.open_file(path)
+    version = store.metadata.get("snapshot_format_version")
+    if version is None:
+        raise ModelStoreFormatError(f"{path} is a model store, but not a snapshot.")
+    if version != SNAPSHOT_FORMAT_VERSION:
+        raise ModelStoreFormatError(
+            f"Snapshot format version {version} is not supported. Supported version is {SNAPSHOT_FORMAT_VERSION}."
+        )
+    config_dict = dict(store.metadata["config"])
+    if store.has_array("custom_rules"):
+        config_dict["custom_rules"] = pickle.loads(store.get_array("custom_rules").tobytes())
+    divider_name = store.metadata["divider"]
+    if divider_name == GBDTNameDivider.__name__:
+        return GBDTNameDivider.from_model_store(store, config=GBDTNameDividerConfig(**config_dict))
+    if divider_name == BasicNameDivider.__name__:
+        return BasicNameDivider.from_model_store(store, config=BasicNameDividerConfig(**config_dict))
+    raise ModelStoreFormatError(f"Unknown divider in snapshot: {divider_name}")
@@ -1,10 +1,18 @@
+from collections.abc import Sequence
 from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
 
 import namedivider.feature.functional as F
 from namedivider.feature.family_name import FamilyNameRepository
 from namedivider.feature.functional import MaskCache
 from namedivider.feature.kanji import KanjiStatisticsRepository
 
+# Selected 10 Kanji chars, especially those that rarely come at the beginning of a given name.
+SPECIFIC_GIVEN_START_KANJIS = ("田", "谷", "川", "島", "原", "村", "塚", "森", "井", "子")
+
 
 @dataclass(frozen=True)
 class SimpleFeatures:
@@ -69,6 +77,17 @@ class SimpleFeatureExtractor:
             given_length_score=given_length_score,
         )
 
+    def get_features_batch(self, families: Sequence[str], givens: Sequence[str]) -> dict[str, npt.NDArray[np.float64]]:
+        """
+        Calculates features of many divisions at once. Values are identical to get_features of each division.
+        :param families: Family names.
+        :param givens: Given names. Must be the same length as families.
+        :return: Columns of features, by the field names of SimpleFeatures.
+        :rtype: dict[str, np.ndarray]
+        """
+        scores = F.calc_scores_batch(self.kanji_statistics_repository, families, givens)
+        return {_field: scores[_field] for _field in SimpleFeatures.__dataclass_fields__}
+
 
 class FamilyRankingFeatureExtractor:
     """
@@ -109,8 +128,7 @@ class FamilyRankingFeatureExtractor:
         given_length_score = F.calc_length_score(
             self.kanji_statistics_repository, given, fullname_length, len(family), self.mask_cache
         )
-        # Selected 10 Kanji chars, especially those that rarely come at the beginning of a given name.
-        given_startswith_specific_kanji = given.startswith(("田", "谷", "川", "島", "原", "村", "塚", "森", "井", "子"))
+        given_startswith_specific_kanji = given.startswith(SPECIFIC_GIVEN_START_KANJIS)
         return FamilyRankingFeatures(
             rank=rank,
             fullname_length=fullname_length,
@@ -122,3 +140,32 @@ class FamilyRankingFeatureExtractor:
             given_length_score=given_length_score,
             given_startswith_specific_kanji=given_startswith_specific_kanji,
         )
+
+    def get_features_batch(self, families: Sequence[str], givens: Sequence[str]) -> dict[str, npt.NDArray[Any]]:
+        """
+        Calculates features of many divisions at once. Values are identical to get_features of each division.
+        :param families: Family names.
+        :param givens: Given names. Must be the same length as families.
+        :return: Columns of features, by the field names of FamilyRankingFeatures in the same order.
+            rank is int64 like get_features, or float64 with nan if some family names are unknown.
+        :rtype: dict[str, np.ndarray]
+        """
+        ranks = np.array([self.family_name_repository.get_rank(_family) for _family in families], dtype=np.float64)
+        if not np.isnan(ranks).any():
+            ranks = ranks.astype(np.int64)
+        scores = F.calc_scores_batch(self.kanji_statistics_repository, families, givens)
+        family_lengths = np.fromiter(map(len, families), dtype=np.int64, count=len(families))
+        given_lengths = np.fromiter(map(len, givens), dtype=np.int64, count=len(givens))
+        return {
+            "rank": ranks,
+            "fullname_length": family_lengths + given_lengths,
+            "family_length": family_lengths,
+            "given_length": given_lengths,
+            "family_order_score": scores["family_order_score"],
+            "given_order_score": scores["given_order_score"],
+            "family_length_score": scores["family_length_score"],
+            "given_length_score": scores["given_length_score"],
+            "given_startswith_specific_kanji": np.array(
+                [_given.startswith(SPECIFIC_GIVEN_START_KANJIS) for _given in givens], dtype=np.bool_
+            ),
+        }
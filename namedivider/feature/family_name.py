@@ -1,8 +1,10 @@
 import os
+from collections.abc import Iterator
 from pathlib import Path
 from typing import Union
 
 import numpy as np
+import numpy.typing as npt
 
 
 class FamilyNameRepository:
@@ -42,3 +44,77 @@ class FamilyNameRepository:
             return self.__family_names[family]
         else:
             return np.nan
+
+    def items(self) -> Iterator[tuple[str, int]]:
+        """
+        Returns the pairs of family name and its rank.
+        :return: Iterator of (family name, rank)
+        """
+        return iter(self.__family_names.items())
+
+
+class ArrayFamilyNameRepository(FamilyNameRepository):
+    """
+    FamilyNameRepository backed by flat arrays instead of a dict.
+    The arrays can be views of shared memory or a memory-mapped file, so that processes share them without copying.
+    """
+
+    def __init__(self, family_names: npt.NDArray[np.str_], ranks: npt.NDArray[np.int64]):
+        """
+        :param family_names: Family names sorted in ascending order. Fixed-length unicode array.
+        :param ranks: Rank of each family name.
+        """
+        if len(family_names) != len(ranks):
+            raise ValueError("family_names and ranks must have the same length.")
+        self._sorted_family_names = family_names
+        self._ranks = ranks
+
+    @classmethod
+    def from_repository(cls, repository: FamilyNameRepository) -> "ArrayFamilyNameRepository":
+        """
+        Create instance from FamilyNameRepository.
+        :param repository: FamilyNameRepository
+        :return: ArrayFamilyNameRepository instance
+        :rtype: ArrayFamilyNameRepository
+        """
+        items = sorted(repository.items())
+        family_names = np.array([_family for _family, _ in items], dtype=np.str_)
+        ranks = np.array([_rank for _, _rank in items], dtype=np.int64)
+        return cls(family_names=family_names, ranks=ranks)
+
+    def _find(self, family: str) -> int:
+        """
+        Returns the index of the family name, or -1 if it does not exist.
+        :param family: Family name.
+        :return: int
+        """
+        idx = int(np.searchsorted(self._sorted_family_names, family))
+        if idx < len(self._sorted_family_names) and self._sorted_family_names[idx] == family:
+            return idx
+        return -1
+
+    def exists(self, family: str) -> bool:
+        """
+        Returns if the family name entered is included in the pre-prepared family names.
+        :param family: Family name.
+        :return: bool
+        """
+        return self._find(family) >= 0
+
+    def get_rank(self, family: str) -> Union[int, float]:
+        """
+        Returns the rank of the family name entered.
+        :param family: Family name.
+        :return:
+        """
+        idx = self._find(family)
+        if idx < 0:
+            return np.nan
+        return int(self._ranks[idx])
+
+    def items(self) -> Iterator[tuple[str, int]]:
+        """
+        Returns the pairs of family name and its rank.
+        :return: Iterator of (family name, rank)
+        """
+        return ((str(_family), int(_rank)) for _family, _rank in zip(self._sorted_family_names, self._ranks))
@@ -1,3 +1,4 @@
+from collections.abc import Sequence
 from typing import Optional
 
 import numpy as np
@@ -9,12 +10,15 @@ from namedivider.feature.kanji import KanjiStatisticsRepository
 class MaskCache:
     """
     Private cache for order and length masks to improve performance.
+    All masks are pre-computed in the constructor and never modified afterwards,
+    so one instance can be shared by multiple threads without locks.
     """
 
     def __init__(self, max_length: int = 6):
         """
         Initialize the mask cache.
         :param max_length: Maximum name length to pre-compute masks for.
+        Masks for longer names are created on each call without being cached.
         """
         self.order_masks: dict[tuple[int, int], npt.NDArray[np.int32]] = {}
         self.length_masks: dict[tuple[int, int], npt.NDArray[np.int32]] = {}
@@ -25,37 +29,45 @@ class MaskCache:
         """
         Pre-compute masks for common name lengths.
         """
-        for length in range(3, self.max_length + 1):
-            for idx in range(1, length - 1):
-                self.order_masks[(length, idx)] = _create_order_mask(length, idx)
-                self.length_masks[(length, idx)] = _create_length_mask(length, idx)
+        for length in range(1, self.max_length + 1):
+            for idx in range(length):
+                if 0 < idx < length - 1:
+                    self.order_masks[(length, idx)] = _read_only(_create_order_mask(length, idx))
+                self.length_masks[(length, idx)] = _read_only(_create_length_mask(length, idx))
 
     def get_order_mask(self, full_name_length: int, char_idx: int) -> npt.NDArray[np.int32]:
         """
-        Get order mask from cache or create it if not cached.
+        Get order mask from cache, or create it if not cached.
         :param full_name_length: Length of full name.
         :param char_idx: The order of the character in full name.
         :return: Order mask.
         """
-        if char_idx == 0 or char_idx == full_name_length - 1:
-            raise ValueError("First character and last character must not be created order mask.")
-
-        key = (full_name_length, char_idx)
-        if key not in self.order_masks:
-            self.order_masks[key] = _create_order_mask(full_name_length, char_idx)
-        return self.order_masks[key]
+        mask = self.order_masks.get((full_name_length, char_idx))
+        if mask is None:
+            return _create_order_mask(full_name_length, char_idx)
+        return mask
 
     def get_length_mask(self, full_name_length: int, char_idx: int) -> npt.NDArray[np.int32]:
         """
-        Get length mask from cache or create it if not cached.
+        Get length mask from cache, or create it if not cached.
         :param full_name_length: Length of full name.
         :param char_idx: The order of the character in full name.
         :return: Length mask.
         """
-        key = (full_name_length, char_idx)
-        if key not in self.length_masks:
-            self.length_masks[key] = _create_length_mask(full_name_length, char_idx)
-        return self.length_masks[key]
+        mask = self.length_masks.get((full_name_length, char_idx))
+        if mask is None:
+            return _create_length_mask(full_name_length, char_idx)
+        return mask
+
+
+def _read_only(array: npt.NDArray[np.int32]) -> npt.NDArray[np.int32]:
+    """
+    Makes array read-only so that a shared array is not modified by mistake.
+    :param array: Array
+    :return: The same array, which is not writeable.
+    """
+    array.setflags(write=False)
+    return array
 
 
 def _create_order_mask(full_name_length: int, char_idx: int) -> npt.NDArray[np.int32]:
@@ -250,3 +262,112 @@ def calc_length_score(
         cur_score = masked_length_scores[current_length_status_idx] / np.sum(masked_length_scores)
         scores += cur_score
     return scores
+
+
+def _create_mask_tables(max_length: int) -> tuple[npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+    """
+    Create order masks and length masks of all lengths up to max_length as dense tables.
+    :param max_length: Maximum length of full name.
+    :return: [order_mask_table, length_mask_table]
+      order_mask_table: Table of shape (max_length + 1, max_length, 6). Unused entries are zeros.
+      length_mask_table: Table of shape (max_length + 1, max_length, 8). Unused entries are zeros.
+    """
+    order_mask_table = np.zeros((max_length + 1, max_length, 6), dtype=np.int64)
+    length_mask_table = np.zeros((max_length + 1, max_length, 8), dtype=np.int64)
+    for length in range(1, max_length + 1):
+        for idx in range(length):
+            if 0 < idx < length - 1:
+                order_mask_table[length, idx] = _create_order_mask(length, idx)
+            length_mask_table[length, idx] = _create_length_mask(length, idx)
+    return order_mask_table, length_mask_table
+
+
+def _sum_by_position(
+    scores: npt.NDArray[np.float64], rows: npt.NDArray[np.int64], positions: npt.NDArray[np.int64], num_rows: int
+) -> npt.NDArray[np.float64]:
+    """
+    Sums the scores of characters for each row, adding them in the order of positions.
+    The order is the same as calc_order_score and calc_length_score, so the results are bit-identical.
+    """
+    max_position = int(positions.max()) + 1 if len(positions) > 0 else 0
+    score_table = np.zeros((num_rows, max_position), dtype=np.float64)
+    score_table[rows, positions] = scores
+    total = np.zeros(num_rows, dtype=np.float64)
+    for position in range(max_position):
+        total += score_table[:, position]
+    return total
+
+
+def calc_scores_batch(
+    kanji_statistics_repository: KanjiStatisticsRepository, families: Sequence[str], givens: Sequence[str]
+) -> dict[str, npt.NDArray[np.float64]]:
+    """
+    Calculates order scores and length scores of many divisions at once with the dense statistics tables.
+    Results are identical to calc_order_score and calc_length_score of each division.
+    :param kanji_statistics_repository: Class for managing Kanji statistics.
+    :param families: Family names.
+    :param givens: Given names. Must be the same length as families.
+    :return: Scores by name. The names are family_order_score, family_length_score,
+        given_order_score and given_length_score.
+    :rtype: dict[str, np.ndarray]
+    """
+    if len(families) != len(givens):
+        raise ValueError(f"Lengths of families and givens are different: {len(families)} != {len(givens)}")
+    num_names = len(families)
+    family_lengths = np.fromiter(map(len, families), dtype=np.int64, count=num_names)
+    given_lengths = np.fromiter(map(len, givens), dtype=np.int64, count=num_names)
+    fullname_lengths = family_lengths + given_lengths
+    max_length = int(fullname_lengths.max()) if num_names > 0 else 0
+    order_mask_table, length_mask_table = _create_mask_tables(max_length)
+
+    # One element per character of all full names.
+    codes = kanji_statistics_repository.encode("".join([_family + _given for _family, _given in zip(families, givens)]))
+    rows = np.repeat(np.arange(num_names, dtype=np.int64), fullname_lengths)
+    starts = np.cumsum(fullname_lengths) - fullname_lengths
+    current_idx = np.arange(len(codes), dtype=np.int64) - starts[rows]
+    char_fullname_lengths = fullname_lengths[rows]
+    is_family = current_idx < family_lengths[rows]
+    idx_in_piece = np.where(is_family, current_idx, current_idx - family_lengths[rows])
+    piece_lengths = np.where(is_family, family_lengths[rows], given_lengths[rows])
+
+    # Order scores (See calc_order_score and _calc_current_order_status).
+    is_first = idx_in_piece == 0
+    is_last = idx_in_piece == piece_lengths - 1
+    order_status = np.where(is_first, 0, np.where(is_last, 2, 1)) + np.where(is_family, 0, 3)
+    masked_order = (
+        kanji_statistics_repository.order_counts_table[codes] * order_mask_table[char_fullname_lengths, current_idx]
+    )
+    order_scores = _divide_status_by_sum(masked_order, order_status)
+    # Masks of the first and last characters are zeros, so they are skipped as in calc_order_score.
+
+    # Length scores (See calc_length_score and _calc_current_length_status).
+    length_status = np.minimum(piece_lengths, 4) - 1 + np.where(is_family, 0, 4)
+    masked_length = (
+        kanji_statistics_repository.length_counts_table[codes] * length_mask_table[char_fullname_lengths, current_idx]
+    )
+    length_scores = _divide_status_by_sum(masked_length, length_status)
+
+    given = ~is_family
+    return {
+        "family_order_score": _sum_by_position(
+            order_scores[is_family], rows[is_family], idx_in_piece[is_family], num_names
+        ),
+        "family_length_score": _sum_by_position(
+            length_scores[is_family], rows[is_family], idx_in_piece[is_family], num_names
+        ),
+        "given_order_score": _sum_by_position(order_scores[given], rows[given], idx_in_piece[given], num_names),
+        "given_length_score": _sum_by_position(length_scores[given], rows[given], idx_in_piece[given], num_names),
+    }
+
+
+def _divide_status_by_sum(
+    masked_counts: npt.NDArray[np.int64], status: npt.NDArray[np.int64]
+) -> npt.NDArray[np.float64]:
+    """
+    Returns masked_counts[status] / sum(masked_counts) for each character, or 0 if the sum is 0.
+    """
+    sums = masked_counts.sum(axis=1)
+    counts = masked_counts[np.arange(len(masked_counts)), status]
+    scores = np.zeros(len(masked_counts), dtype=np.float64)
+    np.divide(counts, sums, out=scores, where=sums != 0)
+    return scores
@@ -1,3 +1,4 @@
+from collections.abc import Sequence
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Union
@@ -100,22 +101,72 @@ class KanjiStatistics:
 class KanjiStatisticsRepository:
     """
     Repository class for managing KanjiStatistics.
+
+    Statistics of all kanji are held in two dense tables (See order_counts_table and length_counts_table).
+    The last row of each table is the statistics of the default kanji, which is used for unknown kanji.
     """
 
     def __init__(self, path_csv: Union[str, Path]):
         """
-
-        :param path_csv:
+        :param path_csv: Path of the file containing the kanji information.
         """
-        kanji_records = pd.read_csv(path_csv).to_numpy()
-        kanjis = kanji_records[:, 0]
-        orders = kanji_records[:, 1:7]
-        lengths = kanji_records[:, 7:]
+        kanji_records = pd.read_csv(path_csv)
+        kanjis = [str(_kanji) for _kanji in kanji_records.iloc[:, 0]]
+        default_row = np.zeros((1, 1), dtype=np.int64)
+        order_counts_table = np.concatenate(
+            [kanji_records.iloc[:, 1:7].to_numpy(dtype=np.int64), np.repeat(default_row, 6, axis=1)]
+        )
+        length_counts_table = np.concatenate(
+            [kanji_records.iloc[:, 7:].to_numpy(dtype=np.int64), np.repeat(default_row, 8, axis=1)]
+        )
+        self._build(kanjis, order_counts_table, length_counts_table)
 
-        self._kanji_dict = {}
-        for _kanji, _order, _length in zip(kanjis, orders, lengths):
-            self._kanji_dict[_kanji] = KanjiStatistics(kanji=_kanji, order_counts=_order, length_counts=_length)
-        self._default_kanji = KanjiStatistics.default()
+    @classmethod
+    def from_tables(
+        cls,
+        kanjis: Sequence[str],
+        order_counts_table: npt.NDArray[np.int64],
+        length_counts_table: npt.NDArray[np.int64],
+    ) -> "KanjiStatisticsRepository":
+        """
+        Create instance from dense tables without copying them.
+        :param kanjis: Kanji of each row.
+        :param order_counts_table: Order counts of shape (len(kanjis) + 1, 6). The last row must be zeros.
+        :param length_counts_table: Length counts of shape (len(kanjis) + 1, 8). The last row must be zeros.
+        :return: KanjiStatisticsRepository instance
+        :rtype: KanjiStatisticsRepository
+        """
+        if order_counts_table.shape != (len(kanjis) + 1, 6):
+            raise ValueError(f"Shape of order_counts_table must be {(len(kanjis) + 1, 6)}")
+        if length_counts_table.shape != (len(kanjis) + 1, 8):
+            raise ValueError(f"Shape of length_counts_table must be {(len(kanjis) + 1, 8)}")
+        repository = cls.__new__(cls)
+        repository._build(kanjis, order_counts_table, length_counts_table)
+        return repository
+
+    def _build(
+        self,
+        kanjis: Sequence[str],
+        order_counts_table: npt.NDArray[np.int64],
+        length_counts_table: npt.NDArray[np.int64],
+    ) -> None:
+        # Statistics are shared by all threads using this repository, so they must not be modified.
+        order_counts_table.setflags(write=False)
+        length_counts_table.setflags(write=False)
+        self.kanjis = list(kanjis)
+        self.order_counts_table = order_counts_table
+        self.length_counts_table = length_counts_table
+        self.default_index = len(self.kanjis)
+        self._kanji_index = {_kanji: idx for idx, _kanji in enumerate(self.kanjis)}
+        self._kanji_dict = {
+            _kanji: KanjiStatistics(kanji=_kanji, order_counts=_order_counts, length_counts=_length_counts)
+            for _kanji, _order_counts, _length_counts in zip(self.kanjis, order_counts_table, length_counts_table)
+        }
+        self._default_kanji = KanjiStatistics(
+            kanji="default",
+            order_counts=order_counts_table[self.default_index],
+            length_counts=length_counts_table[self.default_index],
+        )
 
     def get(self, kanji: str) -> KanjiStatistics:
         """
@@ -125,3 +176,13 @@ class KanjiStatisticsRepository:
         :rtype: KanjiStatistics
         """
         return self._kanji_dict.get(kanji, self._default_kanji)
+
+    def encode(self, text: str) -> npt.NDArray[np.int64]:
+        """
+        Converts each character into the row index of the dense tables.
+        Unknown characters are converted into default_index.
+        :param text: Name or piece of name.
+        :return: Row indices of the characters.
+        :rtype: np.ndarray
+        """
+        return np.array([self._kanji_index.get(_kanji, self.default_index) for _kanji in text], dtype=np.int64)
@@ -0,0 +1,54 @@
+from typing import Optional
+
+import regex
+
+from namedivider.divider.divided_name import DividedName
+from namedivider.rule.rule import Rule
+
+# Katakana except "・", which is used as a delimiter.
+_KATAKANA = "[\u30A1-\u30FA\u30FC-\u30FF]"
+# Delimiters written between given name and family name, such as "ジョン・スミス".
+KATAKANA_NAME_DELIMITERS = "\u30FB\uFF1D=\u3000 "
+
+
+class KatakanaRule(Rule):
+    """
+    A rule for katakana names which can be divided without the katakana model.
+    """
+
+    def __init__(self, family_first: bool = False) -> None:
+        """
+        :param family_first: whether family name comes first
+        """
+        self.family_first = family_first
+        self._compiled_regex_delimited = regex.compile(
+            f"({_KATAKANA}+)[{regex.escape(KATAKANA_NAME_DELIMITERS)}]({_KATAKANA}+)"
+        )
+        self._compiled_regex_two_char = regex.compile(f"{_KATAKANA}{{2}}")
+
+    def divide(self, undivided_name: str, separator: str = " ") -> Optional[DividedName]:
+        """
+        If the undivided name consists of two katakana parts joined by one delimiter ("・", "＝", "=" or a space),
+        the undivided name will be divided at the delimiter. For example, "ジョン・スミス" is divided into
+        "スミス" for the family name, and "ジョン" for the given name unless family_first.
+        A katakana name of 2 characters is divided into each character.
+
+        :param undivided_name: Names with no space between the family name and given name
+        :param separator: Character for separate family name and given name
+        :return:
+            if fits the rules: Divided name
+            else: None
+        :rtype:
+            if fits the rules: DividedName
+            else: None
+        """
+        match = self._compiled_regex_delimited.fullmatch(undivided_name)
+        if match is not None:
+            first, second = match.group(1), match.group(2)
+        elif self._compiled_regex_two_char.fullmatch(undivided_name):
+            first, second = undivided_name[0], undivided_name[1]
+        else:
+            return None
+
+        family, given = (first, second) if self.family_first else (second, first)
+        return DividedName(family=family, given=given, separator=separator, score=1.0, algorithm="rule")
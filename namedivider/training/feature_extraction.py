@@ -0,0 +1,95 @@
+"""
+Create training data of GBDTNameDivider from divided names.
+
+Every division of each name is a candidate row, and the row of the correct division is labeled as target.
+Features are calculated for all candidates at once with FamilyRankingFeatureExtractor.get_features_batch.
+"""
+import itertools
+from collections.abc import Iterable, Sequence
+from pathlib import Path
+from typing import Union
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+
+from namedivider.feature.extractor import FamilyRankingFeatureExtractor
+
+
+def generate_candidates(
+    divided_names: Sequence[str], separator: str = " "
+) -> tuple[list[str], list[str], npt.NDArray[np.bool_]]:
+    """
+    Generates all divisions of each name.
+    :param divided_names: Divided names like "菅 義偉".
+    :param separator: Separator between family name and given name.
+    :return: [families, givens, targets]
+      families: Family name of each candidate.
+      givens: Given name of each candidate.
+      targets: True if the candidate is the correct division.
+    """
+    families = []
+    givens = []
+    targets = []
+    for _divided_name in divided_names:
+        if separator not in _divided_name:
+            raise ValueError(f"Separator '{separator}' is not found in '{_divided_name}'")
+        undivided_name = _divided_name.replace(separator, "")
+        for i in range(1, len(undivided_name)):
+            family = undivided_name[:i]
+            given = undivided_name[i:]
+            families.append(family)
+            givens.append(given)
+            targets.append(f"{family}{separator}{given}" == _divided_name)
+    return families, givens, np.array(targets, dtype=np.bool_)
+
+
+def extract_features_batch(
+    divided_names: Sequence[str], extractor: FamilyRankingFeatureExtractor, separator: str = " "
+) -> pd.DataFrame:
+    """
+    Extracts the features of all candidates of divided names.
+    :param divided_names: Divided names like "菅 義偉".
+    :param extractor: Feature extractor of GBDTNameDivider.
+    :param separator: Separator between family name and given name.
+    :return: DataFrame with columns name, target and the fields of FamilyRankingFeatures.
+    :rtype: pd.DataFrame
+    """
+    families, givens, targets = generate_candidates(divided_names, separator=separator)
+    columns: dict[str, Union[list[str], npt.NDArray[np.generic]]] = {
+        "name": [f"{_family}{separator}{_given}" for _family, _given in zip(families, givens)],
+        "target": targets,
+    }
+    columns.update(extractor.get_features_batch(families, givens))
+    return pd.DataFrame(columns)
+
+
+def write_features_csv(
+    divided_names: Iterable[str],
+    dst: Union[str, Path],
+    extractor: FamilyRankingFeatureExtractor,
+    separator: str = " ",
+    chunk_size: int = 100000,
+) -> int:
+    """
+    Extracts the features of all candidates of divided names chunk by chunk, and writes them into a CSV file.
+    :param divided_names: Divided names like "菅 義偉". Empty lines are skipped.
+    :param dst: Path of the CSV file.
+    :param extractor: Feature extractor of GBDTNameDivider.
+    :param separator: Separator between family name and given name.
+    :param chunk_size: Number of names processed at once.
+    :return: Number of written rows.
+    :rtype: int
+    """
+    num_rows = 0
+    is_first_chunk = True
+    iterator = iter(divided_names)
+    for _chunk in iter(lambda: list(itertools.islice(iterator, chunk_size)), []):
+        names = [_name.rstrip("\r\n") for _name in _chunk]
+        df = extract_features_batch([_name for _name in names if _name != ""], extractor, separator=separator)
+        df.to_csv(dst, index=False, mode="w" if is_first_chunk else "a", header=is_first_chunk)
+        is_first_chunk = False
+        num_rows += len(df)
+    if is_first_chunk:
+        extract_features_batch([], extractor, separator=separator).to_csv(dst, index=False)
+    return num_rows
@@ -0,0 +1,283 @@
+"""
+Training pipeline of GBDTNameDivider.
+
+The pipeline consists of the following steps, each of which streams its input chunk by chunk.
+1. Augmentation: Creates new names by shuffling family names and given names.
+2. Feature extraction: Writes features and targets of all candidates into chunked .npy files.
+3. Fitting: Builds a LightGBM dataset from the memory-mapped chunks and trains the model.
+
+The trained model can be used with GBDTNameDividerConfig(path_model=...).
+"""
+import itertools
+import os
+import random
+from collections import Counter
+from collections.abc import Iterable, Iterator, Sequence
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Optional, Union
+
+import numpy as np
+import numpy.typing as npt
+import regex
+
+from namedivider.feature.extractor import (
+    FamilyRankingFeatureExtractor,
+    FamilyRankingFeatures,
+)
+from namedivider.feature.kanji import KanjiStatisticsRepository
+from namedivider.training.feature_extraction import generate_candidates
+
+if TYPE_CHECKING:
+    import lightgbm as lgb
+
+FEATURE_COLUMNS = list(FamilyRankingFeatures.__dataclass_fields__)
+DEFAULT_PARAMS: dict[str, Any] = {"objective": "binary", "metric": "auc"}
+# Default number of boosting rounds. Without a validation set, early stopping cannot end training earlier.
+DEFAULT_NUM_BOOST_ROUND_WITH_VALIDATION = 10000
+DEFAULT_NUM_BOOST_ROUND_WITHOUT_VALIDATION = 100
+
+_compiled_regex_kanji = regex.compile(r"\p{Script=Han}+")
+
+# Extractor owned by each worker process of write_feature_chunks.
+_worker_extractor: Optional[FamilyRankingFeatureExtractor] = None
+
+
+def read_divided_names(path: Union[str, Path], separator: str = " ", encoding: str = "utf-8") -> Iterator[str]:
+    """
+    Reads divided names consisting only of kanji from a text file, one by one.
+    Lines without separator or with characters other than kanji are skipped, as in the training of the default model.
+    :param path: Path of the text file with one divided name per line.
+    :param separator: Separator between family name and given name.
+    :param encoding: Encoding of the text file.
+    :return: Iterator of divided names.
+    """
+    with open(path, encoding=encoding) as f:
+        for _line in f:
+            divided_name = _line.rstrip("\r\n")
+            if separator not in divided_name:
+                continue
+            if not _compiled_regex_kanji.fullmatch(divided_name.replace(separator, "")):
+                continue
+            yield divided_name
+
+
+def augment_names(
+    divided_names: Iterable[str], factor: int = 7, separator: str = " ", seed: Optional[int] = None
+) -> Iterator[str]:
+    """
+    Yields the original names followed by names made by shuffling family names and given names factor times.
+    :param divided_names: Divided names like "菅 義偉".
+    :param factor: Number of times to shuffle.
+    :param separator: Separator between family name and given name.
+    :param seed: Seed of the shuffle.
+    :return: Iterator of divided names.
+    """
+    rng = random.Random(seed)
+    family_names = []
+    given_names = []
+    for _divided_name in divided_names:
+        family, _, given = _divided_name.partition(separator)
+        family_names.append(family)
+        given_names.append(given)
+        yield _divided_name
+    for _ in range(factor):
+        rng.shuffle(family_names)
+        rng.shuffle(given_names)
+        for _family, _given in zip(family_names, given_names):
+            yield f"{_family}{separator}{_given}"
+
+
+def count_family_names(divided_names: Iterable[str], separator: str = " ") -> list[str]:
+    """
+    Ranks family names by frequency, in the format of the text file of FamilyNameRepository.
+    :param divided_names: Divided names like "菅 義偉".
+    :param separator: Separator between family name and given name.
+    :return: Family names from the most common one. Ties are ordered by first appearance.
+    """
+    counter = Counter(_divided_name.partition(separator)[0] for _divided_name in divided_names)
+    return [_family for _family, _ in counter.most_common()]
+
+
+def _extract_chunk(
+    extractor: FamilyRankingFeatureExtractor, divided_names: Sequence[str], separator: str
+) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.bool_]]:
+    families, givens, targets = generate_candidates(divided_names, separator=separator)
+    features = extractor.get_features_batch(families, givens)
+    x = np.empty((len(families), len(FEATURE_COLUMNS)), dtype=np.float64)
+    for i, _column in enumerate(FEATURE_COLUMNS):
+        x[:, i] = features[_column]
+    return x, targets
+
+
+def _save_chunk(dst_dir: Path, index: int, x: npt.NDArray[np.float64], y: npt.NDArray[np.bool_]) -> int:
+    np.save(dst_dir / f"features_{index:06d}.npy", x)
+    np.save(dst_dir / f"targets_{index:06d}.npy", y)
+    return len(y)
+
+
+def _init_worker(path_csv: Union[str, Path], path_family_names: Union[str, Path]) -> None:
+    """
+    Initializer of worker processes. Each process builds its own extractor once.
+    """
+    global _worker_extractor
+    _worker_extractor = create_extractor(path_csv, path_family_names)
+
+
+def _extract_and_save_chunk_in_worker(dst_dir: Path, index: int, divided_names: list[str], separator: str) -> int:
+    if _worker_extractor is None:
+        raise RuntimeError("Worker process is not initialized.")
+    x, y = _extract_chunk(_worker_extractor, divided_names, separator)
+    return _save_chunk(dst_dir, index, x, y)
+
+
+def create_extractor(path_csv: Union[str, Path], path_family_names: Union[str, Path]) -> FamilyRankingFeatureExtractor:
+    """
+    Create the feature extractor of GBDTNameDivider from the paths of assets.
+    :param path_csv: Path of kanji.csv.
+    :param path_family_names: Allows .pickle file or text file (See GBDTNameDividerConfig).
+    :return: FamilyRankingFeatureExtractor
+    :rtype: FamilyRankingFeatureExtractor
+    """
+    from namedivider.divider.gbdt_name_divider import load_family_name_repository
+
+    return FamilyRankingFeatureExtractor(
+        kanji_statistics_repository=KanjiStatisticsRepository(path_csv=path_csv),
+        family_name_repository=load_family_name_repository(path_family_names),
+    )
+
+
+def write_feature_chunks(
+    divided_names: Iterable[str],
+    dst_dir: Union[str, Path],
+    path_csv: Union[str, Path],
+    path_family_names: Union[str, Path],
+    separator: str = " ",
+    chunk_size: int = 100000,
+    num_workers: int = 1,
+) -> int:
+    """
+    Extracts features of all candidates of divided names, and writes them into chunked .npy files.
+    Each chunk is saved as features_XXXXXX.npy (float64, columns are FEATURE_COLUMNS) and targets_XXXXXX.npy (bool).
+    Chunks already in dst_dir are removed, so that they are not loaded with the new chunks.
+    :param divided_names: Divided names like "菅 義偉".
+    :param dst_dir: Directory to write the chunks.
+    :param path_csv: Path of kanji.csv.
+    :param path_family_names: Allows .pickle file or text file (See GBDTNameDividerConfig).
+    :param separator: Separator between family name and given name.
+    :param chunk_size: Number of names in a chunk.
+    :param num_workers: Number of processes extracting features.
+    :return: Number of written rows.
+    :rtype: int
+    """
+    dst_dir = Path(dst_dir)
+    dst_dir.mkdir(parents=True, exist_ok=True)
+    for _path in itertools.chain(dst_dir.glob("features_*.npy"), dst_dir.glob("targets_*.npy")):
+        _path.unlink()
+    iterator = iter(divided_names)
+    chunks = enumerate(iter(lambda: list(itertools.islice(iterator, chunk_size)), []))
+    if num_workers <= 1:
+        extractor = create_extractor(path_csv, path_family_names)
+        return sum(
+            _save_chunk(dst_dir, _index, *_extract_chunk(extractor, _chunk, separator)) for _index, _chunk in chunks
+        )
+
+    num_rows = 0
+    with ProcessPoolExecutor(
+        max_workers=num_workers, initializer=_init_worker, initargs=(path_csv, path_family_names)
+    ) as executor:
+        # Bound the chunks in flight, so that the input is not read into memory at once.
+        futures: list["Future[int]"] = []
+        for _index, _chunk in chunks:
+            if len(futures) >= num_workers * 2:
+                num_rows += futures.pop(0).result()
+            futures.append(executor.submit(_extract_and_save_chunk_in_worker, dst_dir, _index, _chunk, separator))
+        for _future in futures:
+            num_rows += _future.result()
+    return num_rows
+
+
+def load_feature_chunks(src_dir: Union[str, Path], batch_size: int = 4096) -> tuple[list[Any], npt.NDArray[np.float64]]:
+    """
+    Loads chunks written by write_feature_chunks as memory-mapped lightgbm.Sequence objects.
+    :param src_dir: Directory of the chunks.
+    :param batch_size: Number of rows LightGBM reads at once.
+    :return: [sequences, labels]
+      sequences: lightgbm.Sequence of each chunk.
+      labels: Targets of all chunks.
+    """
+    import lightgbm as lgb
+
+    class _NpySequence(lgb.Sequence):
+        def __init__(self, path: Path):
+            self.data = np.load(path, mmap_mode="r")
+            self.batch_size = batch_size
+
+        def __getitem__(self, idx: Any) -> Any:
+            return self.data[idx]
+
+        def __len__(self) -> int:
+            return len(self.data)
+
+    src_dir = Path(src_dir)
+    feature_paths = sorted(src_dir.glob("features_*.npy"))
+    if len(feature_paths) == 0:
+        raise FileNotFoundError(f"No feature chunks in {src_dir}")
+    sequences = []
+    labels = []
+    for _feature_path in feature_paths:
+        target_path = _feature_path.with_name(_feature_path.name.replace("features_", "targets_"))
+        sequence = _NpySequence(_feature_path)
+        if len(sequence) == 0:
+            continue
+        sequences.append(sequence)
+        labels.append(np.load(target_path).astype(np.float64))
+    return sequences, np.concatenate(labels)
+
+
+def train_gbdt(
+    train_dir: Union[str, Path],
+    dst: Union[str, Path],
+    valid_dir: Optional[Union[str, Path]] = None,
+    params: Optional[dict[str, Any]] = None,
+    num_boost_round: Optional[int] = None,
+    early_stopping_rounds: int = 200,
+    num_threads: int = 0,
+) -> "lgb.Booster":
+    """
+    Trains the GBDT model from feature chunks, and saves it in the format of GBDTNameDividerConfig.path_model.
+    :param train_dir: Directory of the feature chunks for training.
+    :param dst: Path to save the model.
+    :param valid_dir: Directory of the feature chunks for validation. Early stopping is used if provided.
+    :param params: Parameters of LightGBM, which override DEFAULT_PARAMS.
+    :param num_boost_round: Maximum number of boosting rounds. If None, DEFAULT_NUM_BOOST_ROUND_WITH_VALIDATION
+        is used with valid_dir, and DEFAULT_NUM_BOOST_ROUND_WITHOUT_VALIDATION without it.
+    :param early_stopping_rounds: Rounds without improvement of the validation metric to stop training.
+    :param num_threads: Number of threads of LightGBM. 0 means the default of OpenMP.
+    :return: Trained model.
+    :rtype: lightgbm.Booster
+    """
+    import lightgbm as lgb
+
+    if num_boost_round is None:
+        num_boost_round = (
+            DEFAULT_NUM_BOOST_ROUND_WITH_VALIDATION
+            if valid_dir is not None
+            else DEFAULT_NUM_BOOST_ROUND_WITHOUT_VALIDATION
+        )
+    train_params = {**DEFAULT_PARAMS, "num_threads": num_threads, "verbose": -1, **(params or {})}
+    train_sequences, train_labels = load_feature_chunks(train_dir)
+    train_set = lgb.Dataset(train_sequences, label=train_labels, feature_name=FEATURE_COLUMNS, params=train_params)
+    valid_sets = []
+    callbacks: list[Callable[..., Any]] = []
+    if valid_dir is not None:
+        valid_sequences, valid_labels = load_feature_chunks(valid_dir)
+        valid_sets.append(lgb.Dataset(valid_sequences, label=valid_labels, reference=train_set))
+        callbacks.append(lgb.early_stopping(early_stopping_rounds))
+        callbacks.append(lgb.log_evaluation(100))
+    model = lgb.train(
+        train_params, train_set, num_boost_round=num_boost_round, valid_sets=valid_sets, callbacks=callbacks
+    )
+    os.makedirs(Path(dst).parent, exist_ok=True)
+    model.save_model(str(dst))
+    return model
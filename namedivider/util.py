@@ -1,6 +1,9 @@
+import hashlib
+import os
+import sys
 import urllib.request
 from pathlib import Path
-from typing import Union
+from typing import Optional, Union
 
 CURRENT_DIR = Path(__file__).resolve().parent
 DEFAULT_CACHE_DIR = Path("~/.cache/namedivider-python").expanduser()
@@ -8,6 +11,12 @@ GBDT_MODEL_V1_URL = "https://github.com/rskmoi/namedivider-python/releases/downl
 FAMILY_NAME_REPOSITORY_URL = (
     "https://github.com/rskmoi/namedivider-python/releases/download/Models/family_name_repository.pickle"
 )
+# Pinned SHA-256 checksums of the released assets. Downloaded and staged assets must match them.
+# None means the asset is not pinned, and it is accepted without the check.
+GBDT_MODEL_V1_SHA256: Optional[str] = None
+FAMILY_NAME_REPOSITORY_SHA256: Optional[str] = None
+OFFLINE_ENV_VAR = "NAMEDIVIDER_OFFLINE"
+DOWNLOAD_TIMEOUT = 60
 
 
 def get_kanji_csv_default_path() -> Path:
@@ -31,6 +40,56 @@ def get_gbdt_model_v1_default_path() -> Path:
     return (DEFAULT_CACHE_DIR / "gbdt_model_v1.txt").expanduser()
 
 
+def is_gil_enabled() -> bool:
+    """
+    Returns whether the GIL is enabled in the running interpreter.
+    Always True before Python 3.13, and False on free-threaded builds (e.g. 3.13t) running without the GIL.
+    """
+    is_gil_enabled_func = getattr(sys, "_is_gil_enabled", None)
+    if is_gil_enabled_func is None:
+        return True
+    return bool(is_gil_enabled_func())
+
+
+def is_offline() -> bool:
+    """
+    Returns whether downloads are disabled by the environment variable NAMEDIVIDER_OFFLINE.
+    """
+    return os.environ.get(OFFLINE_ENV_VAR, "").lower() in ("1", "true", "yes")
+
+
+class AssetIntegrityError(ValueError):
+    """
+    Raised when an asset does not match its checksum.
+    """
+
+
+def _download(url: str, path: Path, description: str, expected_sha256: Optional[str] = None) -> None:
+    """
+    Downloads url into path. The file is written through a temporary file, so it is never left half-written.
+    If expected_sha256 is given, the content is saved only when it matches the checksum.
+    """
+    if is_offline():
+        raise FileNotFoundError(
+            f"{path} does not exist and downloads are disabled by {OFFLINE_ENV_VAR}. "
+            "Stage the assets with `nmdiv assets stage`."
+        )
+    DEFAULT_CACHE_DIR.mkdir(exist_ok=True, parents=True)
+    print(f"Download {description} from GitHub...")
+    with urllib.request.urlopen(url, timeout=DOWNLOAD_TIMEOUT) as response:
+        content = response.read()
+    if expected_sha256 is not None:
+        checksum = hashlib.sha256(content).hexdigest()
+        if checksum != expected_sha256:
+            raise AssetIntegrityError(
+                f"Checksum mismatch of {description} from {url}: expected {expected_sha256}, but got {checksum}"
+            )
+    tmp_path = path.with_name(f".{path.name}.download")
+    with open(tmp_path, "wb") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
 def download_family_name_pickle_if_needed(path: Union[str, Path]) -> None:
     """
     When a default path is provided, download from the Internet if not already downloaded.
@@ -40,12 +99,7 @@ def download_family_name_pickle_if_needed(path: Union[str, Path]) -> None:
         return None
     if path.exists():
         return None
-    DEFAULT_CACHE_DIR.mkdir(exist_ok=True, parents=True)
-    print("Download FamilyNameRepository from GitHub...")
-    with urllib.request.urlopen(FAMILY_NAME_REPOSITORY_URL) as response:
-        content = response.read()
-    with open(path, "wb") as f:
-        f.write(content)
+    _download(FAMILY_NAME_REPOSITORY_URL, path, "FamilyNameRepository", expected_sha256=FAMILY_NAME_REPOSITORY_SHA256)
 
 
 def download_gbdt_model_v1_if_needed(path: Union[str, Path]) -> None:
@@ -57,9 +111,4 @@ def download_gbdt_model_v1_if_needed(path: Union[str, Path]) -> None:
         return None
     if path.exists():
         return None
-    DEFAULT_CACHE_DIR.mkdir(exist_ok=True, parents=True)
-    print("Download GBDT Model from GitHub...")
-    with urllib.request.urlopen(GBDT_MODEL_V1_URL) as response:
-        content = response.read()
-    with open(path, "wb") as f:
-        f.write(content)
+    _download(GBDT_MODEL_V1_URL, path, "GBDT Model", expected_sha256=GBDT_MODEL_V1_SHA256)
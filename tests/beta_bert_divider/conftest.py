@@ -0,0 +1,20 @@
+import pytest
+
+torch = pytest.importorskip("torch")
+transformers = pytest.importorskip("transformers")
+
+from namedivider.beta_bert_divider import bert_name_divider_only_katakana  # noqa: E402
+
+
+@pytest.fixture
+def model_path(tmp_path, monkeypatch):
+    """
+    Small BERT with random weights, which has the same vocabulary as the released model.
+    """
+    config = transformers.BertConfig.from_json_file(bert_name_divider_only_katakana.CURRENT_DIR / "config.json")
+    config.update({"hidden_size": 32, "num_hidden_layers": 2, "num_attention_heads": 2, "intermediate_size": 64})
+    monkeypatch.setattr(transformers.PretrainedConfig, "from_json_file", lambda *args, **kwargs: config)
+    torch.manual_seed(0)
+    path = tmp_path / "bert.pt"
+    torch.save(transformers.BertForSequenceClassification(config=config).state_dict(), path)
+    return path
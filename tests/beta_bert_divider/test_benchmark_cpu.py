@@ -0,0 +1,41 @@
+import doctest
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("torch")
+pytest.importorskip("transformers")
+pytest.importorskip("typer")
+
+from namedivider.divider.divided_name import DividedName  # noqa: E402
+
+BENCHMARK_PATH = Path(__file__).resolve().parents[2] / "examples" / "beta_bert" / "benchmark_cpu.py"
+
+
+@pytest.fixture
+def benchmark_cpu():
+    spec = importlib.util.spec_from_file_location("benchmark_cpu", BENCHMARK_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class FixedDivider:
+    """
+    Returns the same division as the file, like a divider with family_first=False.
+    """
+
+    def divide_names(self, undivided_names):
+        return [DividedName(family="ザビエル", given="フランシスコ") for _ in undivided_names]
+
+
+def test_doctest(benchmark_cpu):
+    result = doctest.testmod(benchmark_cpu)
+    assert result.attempted > 0
+    assert result.failed == 0
+
+
+def test_evaluate_compares_in_given_family_order(benchmark_cpu):
+    accuracy, _ = benchmark_cpu.evaluate(FixedDivider(), ["フランシスコ ザビエル", "フランシ スコザビエル"])
+    assert accuracy == 0.5
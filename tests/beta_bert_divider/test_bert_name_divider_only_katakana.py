@@ -0,0 +1,143 @@
+import pytest
+
+torch = pytest.importorskip("torch")
+transformers = pytest.importorskip("transformers")
+
+from namedivider.beta_bert_divider.bert_name_divider_only_katakana import (  # noqa: E402
+    BERTNameDividerOnlyKatakana,
+    _segmented_softmax,
+)
+
+names = ["フランシスコザビエル", "ヤマダタロウ", "スズキイチロウ", "サトウ", "アイ", "レオナルドダヴィンチ"]
+
+
+def _divide_name_without_batch(divider, undivided_name):
+    input_ids, attention_masks = divider.preprocess(undivided_name)
+    with torch.no_grad():
+        logits = divider.model(input_ids=input_ids, attention_mask=attention_masks).logits
+    scores = torch.softmax(logits, dim=0)[:, 1]
+    return int(torch.argmax(scores)), float(torch.max(scores))
+
+
+def test_segmented_softmax():
+    values = torch.tensor([1.0, 2.0, 3.0, -1.0, 5.0, 0.5])
+    segment_ids = torch.tensor([0, 0, 0, 1, 2, 2])
+    expected = torch.cat(
+        [torch.softmax(values[:3], dim=0), torch.softmax(values[3:4], dim=0), torch.softmax(values[4:], dim=0)]
+    )
+    assert torch.allclose(_segmented_softmax(values, segment_ids, 3), expected)
+
+
+@pytest.mark.parametrize("padding", ["dynamic", "fixed"])
+@pytest.mark.parametrize("family_first", [False, True])
+@pytest.mark.parametrize("max_tokens", [1, 64, 8192])
+def test_divide_names(model_path, family_first, max_tokens, padding):
+    divider = BERTNameDividerOnlyKatakana(model_path, family_first=family_first, padding=padding)
+    divided_names = divider.divide_names(names, max_tokens=max_tokens)
+    assert len(divided_names) == len(names)
+    for _name, _divided_name in zip(names, divided_names):
+        max_idx, score = _divide_name_without_batch(divider, _name)
+        first, second = (_divided_name.family, _divided_name.given)
+        if not family_first:
+            first, second = second, first
+        assert first == _name[: max_idx + 1]
+        assert second == _name[max_idx + 1 :]
+        assert _divided_name.score == pytest.approx(score, abs=1e-5)
+        assert _divided_name.algorithm == "beta_bert_only_katakana"
+        assert divider.divide_name(_name).family == _divided_name.family
+
+
+def test_divide_names_empty(model_path):
+    divider = BERTNameDividerOnlyKatakana(model_path)
+    assert divider.divide_names([]) == []
+    with pytest.raises(ValueError):
+        divider.divide_names(["ア"])
+
+
+def test_quantize(model_path):
+    divider = BERTNameDividerOnlyKatakana(model_path)
+    quantized_divider = BERTNameDividerOnlyKatakana(model_path, device="cpu", quantize=True)
+    assert any(
+        isinstance(_module, torch.ao.nn.quantized.dynamic.Linear) for _module in quantized_divider.model.modules()
+    )
+    # Weights are random, so the best candidate may differ. Only scores are compared.
+    for _name, _divided_name, _quantized_divided_name in zip(
+        names, divider.divide_names(names), quantized_divider.divide_names(names)
+    ):
+        assert _quantized_divided_name.given + _quantized_divided_name.family == _name
+        assert _quantized_divided_name.score == pytest.approx(_divided_name.score, abs=0.1)
+
+
+def test_quantize_on_cuda(model_path):
+    with pytest.raises(ValueError):
+        BERTNameDividerOnlyKatakana(model_path, device="cuda", quantize=True)
+
+
+def test_num_threads(model_path):
+    num_threads = torch.get_num_threads()
+    try:
+        BERTNameDividerOnlyKatakana(model_path, num_threads=1)
+        assert torch.get_num_threads() == 1
+    finally:
+        torch.set_num_threads(num_threads)
+
+
+@pytest.mark.parametrize("quantize", [False, True])
+def test_export_torchscript(model_path, tmp_path, quantize):
+    divider = BERTNameDividerOnlyKatakana(model_path, device="cpu", quantize=quantize)
+    path = tmp_path / "bert.torchscript"
+    divider.export_torchscript(path)
+    loaded_divider = BERTNameDividerOnlyKatakana(path, device="cpu", torchscript=True)
+    for _divided_name, _loaded_divided_name in zip(divider.divide_names(names), loaded_divider.divide_names(names)):
+        assert _loaded_divided_name.family == _divided_name.family
+        assert _loaded_divided_name.score == pytest.approx(_divided_name.score, abs=1e-5)
+
+
+def _preprocess_with_strings(divider, undivided_name):
+    preprocessed_names = []
+    attention_masks = []
+    for i in range(1, len(undivided_name)):
+        tagged = ["[CLS]"] + list(undivided_name[:i] + "・" + undivided_name[i:]) + ["[SEP]"]
+        preprocessed_names.append([divider.vocab_hash[c] for c in tagged + ["[PAD]"] * (16 - len(tagged))])
+        attention_masks.append([1] * len(tagged) + [0] * (16 - len(tagged)))
+    return torch.tensor(preprocessed_names, dtype=torch.int32), torch.tensor(attention_masks, dtype=torch.int32)
+
+
+@pytest.mark.parametrize("undivided_name", names + ["アイウエオカキクケコサシスセ"])
+def test_preprocess(model_path, undivided_name):
+    divider = BERTNameDividerOnlyKatakana(model_path, padding="fixed")
+    input_ids, attention_masks = divider.preprocess(undivided_name)
+    expected_input_ids, expected_attention_masks = _preprocess_with_strings(divider, undivided_name)
+    assert input_ids.dtype == torch.int32
+    assert torch.equal(input_ids, expected_input_ids)
+    assert torch.equal(attention_masks, expected_attention_masks)
+
+
+def test_preprocess_unknown_character(model_path):
+    divider = BERTNameDividerOnlyKatakana(model_path)
+    with pytest.raises(KeyError):
+        divider.preprocess("ヤマダ太郎")
+
+
+@pytest.mark.parametrize("undivided_name", names)
+def test_preprocess_dynamic_padding(model_path, undivided_name):
+    divider = BERTNameDividerOnlyKatakana(model_path, padding="dynamic")
+    input_ids, attention_masks = divider.preprocess(undivided_name)
+    expected_input_ids, expected_attention_masks = _preprocess_with_strings(divider, undivided_name)
+    assert input_ids.shape == (len(undivided_name) - 1, len(undivided_name) + 3)
+    assert torch.equal(input_ids, expected_input_ids[:, : len(undivided_name) + 3])
+    assert bool(attention_masks.all())
+
+
+def test_dynamic_padding_is_consistent_with_fixed_padding(model_path):
+    mixed_length_names = names + ["アイウエオカキクケコサシスセ", "ヤマダタロウ", "アイ"]
+    divided_names = BERTNameDividerOnlyKatakana(model_path, padding="dynamic").divide_names(mixed_length_names)
+    fixed_divided_names = BERTNameDividerOnlyKatakana(model_path, padding="fixed").divide_names(mixed_length_names)
+    for _divided_name, _fixed_divided_name in zip(divided_names, fixed_divided_names):
+        assert _divided_name.family == _fixed_divided_name.family
+        assert _divided_name.score == pytest.approx(_fixed_divided_name.score, abs=1e-5)
+
+
+def test_invalid_padding(model_path):
+    with pytest.raises(ValueError):
+        BERTNameDividerOnlyKatakana(model_path, padding="max_length")
@@ -0,0 +1,91 @@
+from collections import Counter
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("torch")
+pytest.importorskip("transformers")
+
+from namedivider.beta_bert_divider import (  # noqa: E402
+    BERTNameDividerOnlyKatakana,
+    CombinedNameDivider,
+)
+from namedivider.divider.basic_name_divider import BasicNameDivider  # noqa: E402
+from namedivider.divider.config import BasicNameDividerConfig  # noqa: E402
+
+CURRENT_DIR = Path(__file__).resolve().parent
+
+names = ["菅義偉", "フランシスコザビエル", "安倍晋三", "ヤマダタロウ", "中曽根康弘", "アイウエオカキクケコサシスセソ", "原敬"]
+
+
+class CountingDivider:
+    """
+    Records the names passed to the dividers.
+    """
+
+    def __init__(self, divider):
+        self.divider = divider
+        self.calls = []
+
+    def __getattr__(self, name):
+        return getattr(self.divider, name)
+
+    def divide_name(self, undivided_name):
+        self.calls.append([undivided_name])
+        return self.divider.divide_name(undivided_name)
+
+    def divide_names(self, undivided_names):
+        self.calls.append(list(undivided_names))
+        return self.divider.divide_names(undivided_names)
+
+
+@pytest.fixture
+def base_divider():
+    return BasicNameDivider(BasicNameDividerConfig(path_csv=CURRENT_DIR / ".." / "assets" / "kanji_for_test.csv"))
+
+
+def test_divide_names(model_path, base_divider):
+    katakana_divider = CountingDivider(BERTNameDividerOnlyKatakana(model_path))
+    counting_base_divider = CountingDivider(base_divider)
+    divider = CombinedNameDivider(base_divider=counting_base_divider, katakana_divider=katakana_divider)
+    divided_names = divider.divide_names(names)
+    assert katakana_divider.calls == [["フランシスコザビエル", "ヤマダタロウ"]]
+    assert counting_base_divider.calls == [["菅義偉", "安倍晋三", "中曽根康弘", "アイウエオカキクケコサシスセソ", "原敬"]]
+    for _name, _divided_name in zip(names, divided_names):
+        expected = divider.divide_name(_name)
+        assert _divided_name.family == expected.family
+        assert _divided_name.algorithm == expected.algorithm
+        assert _divided_name.score == pytest.approx(expected.score, abs=1e-5)
+
+
+def test_divide_names_single_script(model_path, base_divider):
+    katakana_divider = CountingDivider(BERTNameDividerOnlyKatakana(model_path))
+    counting_base_divider = CountingDivider(base_divider)
+    divider = CombinedNameDivider(base_divider=counting_base_divider, katakana_divider=katakana_divider)
+    assert [str(_name) for _name in divider.divide_names(["菅義偉", "原敬"])] == ["菅 義偉", "原 敬"]
+    assert katakana_divider.calls == []
+    assert divider.divide_names([]) == []
+    assert counting_base_divider.calls == [["菅義偉", "原敬"]]
+
+
+def test_katakana_rules(model_path, base_divider):
+    katakana_divider = CountingDivider(BERTNameDividerOnlyKatakana(model_path))
+    divider = CombinedNameDivider(base_divider=base_divider, katakana_divider=katakana_divider)
+    delimited_names = ["ジョン・スミス", "ジョン＝スミス", "ジョン　スミス", "アイ"]
+    divided_names = divider.divide_names(delimited_names + ["ヤマダタロウ", "菅義偉"])
+    assert [str(_divided_name) for _divided_name in divided_names[:4]] == ["スミス ジョン"] * 3 + ["イ ア"]
+    assert all(_divided_name.algorithm == "rule" for _divided_name in divided_names[:4])
+    assert katakana_divider.calls == [["ヤマダタロウ"]]
+    assert divider.route_counts == Counter({"rule": 4, "katakana": 1, "base": 1})
+
+    assert str(divider.divide_name("ジョン・スミス")) == "スミス ジョン"
+    assert divider.route_counts["rule"] == 5
+    assert katakana_divider.calls == [["ヤマダタロウ"]]
+
+
+def test_katakana_rules_disabled(model_path, base_divider):
+    katakana_divider = CountingDivider(BERTNameDividerOnlyKatakana(model_path))
+    divider = CombinedNameDivider(base_divider=base_divider, katakana_divider=katakana_divider, katakana_rules=[])
+    divider.divide_names(["ジョン・スミス", "アイ"])
+    assert katakana_divider.calls == [["ジョン・スミス", "アイ"]]
+    assert divider.route_counts == Counter({"katakana": 2})
@@ -0,0 +1,126 @@
+import asyncio
+import time
+
+import pytest
+
+from namedivider.divider.async_name_divider import AsyncNameDivider
+from namedivider.divider.basic_name_divider import BasicNameDivider
+
+names = ["原敬", "中山マサ", "菅義偉", "阿部晋三", "中曽根康弘", "蝶院羊"]
+
+
+class CountingBasicNameDivider(BasicNameDivider):
+    def __init__(self):
+        super().__init__()
+        self.batch_sizes = []
+
+    def divide_names(self, undivided_names):
+        self.batch_sizes.append(len(undivided_names))
+        return super().divide_names(undivided_names)
+
+
+def test_adivide_names_same_as_divide_name():
+    divider = BasicNameDivider()
+    expected = [divider.divide_name(_name) for _name in names]
+
+    async def run():
+        async with AsyncNameDivider(divider) as async_divider:
+            return await async_divider.adivide_names(names)
+
+    assert asyncio.run(run()) == expected
+
+
+def test_adivide_name():
+    divider = BasicNameDivider()
+
+    async def run():
+        async with AsyncNameDivider(divider) as async_divider:
+            return await async_divider.adivide_name("菅義偉")
+
+    assert asyncio.run(run()) == divider.divide_name("菅義偉")
+
+
+def test_concurrent_small_requests_are_coalesced():
+    divider = CountingBasicNameDivider()
+    expected = [divider.divide_name(_name) for _name in names]
+
+    async def run():
+        async with AsyncNameDivider(divider, max_batch_size=100, max_delay=0.05) as async_divider:
+            return await asyncio.gather(*[async_divider.adivide_name(_name) for _name in names])
+
+    assert asyncio.run(run()) == expected
+    assert divider.batch_sizes == [len(names)]
+
+
+def test_large_request_is_split():
+    divider = CountingBasicNameDivider()
+    undivided_names = names * 5
+
+    async def run():
+        async with AsyncNameDivider(divider, max_batch_size=8) as async_divider:
+            return await async_divider.adivide_names(undivided_names)
+
+    results = asyncio.run(run())
+    assert results == [divider.divide_name(_name) for _name in undivided_names]
+    assert sorted(divider.batch_sizes) == [6, 8, 8, 8]
+
+
+def test_coalesced_batch_is_split_at_max_batch_size():
+    divider = CountingBasicNameDivider()
+
+    async def run():
+        async with AsyncNameDivider(divider, max_batch_size=8, max_delay=0.05) as async_divider:
+            return await asyncio.gather(async_divider.adivide_names(names[:5]), async_divider.adivide_names(names))
+
+    small, large = asyncio.run(run())
+    assert small == [divider.divide_name(_name) for _name in names[:5]]
+    assert large == [divider.divide_name(_name) for _name in names]
+    assert sorted(divider.batch_sizes) == [3, 8]
+
+
+def test_aexit_does_not_block_event_loop():
+    class SlowDivider(BasicNameDivider):
+        def divide_names(self, undivided_names):
+            time.sleep(0.2)
+            return super().divide_names(undivided_names)
+
+    async def run():
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticker = asyncio.ensure_future(tick())
+        async with AsyncNameDivider(SlowDivider(), max_delay=0.0) as async_divider:
+            request = asyncio.ensure_future(async_divider.adivide_names(names))
+            await asyncio.sleep(0.02)
+            ticks = 0
+        ticker.cancel()
+        await request
+        return ticks
+
+    assert asyncio.run(run()) > 5
+
+
+def test_invalid_name_does_not_affect_other_requests():
+    divider = BasicNameDivider()
+
+    async def run():
+        async with AsyncNameDivider(divider, max_delay=0.05) as async_divider:
+            return await asyncio.gather(
+                async_divider.adivide_names(["菅義偉"]), async_divider.adivide_names(["菅"]), return_exceptions=True
+            )
+
+    valid, invalid = asyncio.run(run())
+    assert valid == [divider.divide_name("菅義偉")]
+    assert isinstance(invalid, ValueError)
+
+
+def test_invalid_parameters():
+    with pytest.raises(ValueError):
+        AsyncNameDivider(None)
+    with pytest.raises(ValueError):
+        AsyncNameDivider(BasicNameDivider(), max_in_flight=0)
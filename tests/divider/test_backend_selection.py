@@ -0,0 +1,108 @@
+import sys
+
+import pytest
+
+from namedivider.divider.backend_selection import (
+    BackendChoice,
+    probe_backends,
+    select_backend,
+)
+from namedivider.divider.basic_name_divider import BasicNameDivider
+from namedivider.divider.config import BasicNameDividerConfig, GBDTNameDividerConfig
+from namedivider.rule.specific_family_name_rule import SpecificFamilyNameRule
+
+names = ["菅義偉", "安倍晋三", "中曽根康弘", "原敬", "竜胆英一郎"]
+
+
+@pytest.fixture
+def no_core(monkeypatch):
+    # Importing a module mapped to None raises ImportError.
+    monkeypatch.setitem(sys.modules, "namedivider_core", None)
+    monkeypatch.setitem(sys.modules, "numba", None)
+
+
+def test_probe_backends_without_core(no_core):
+    probes = probe_backends(BasicNameDividerConfig())
+    assert list(probes) == ["rust", "hybrid", "numba", "python"]
+    assert probes["rust"] == "namedivider-core is not installed."
+    assert probes["hybrid"] == "namedivider-core is not installed."
+    assert probes["numba"] == "numba is not installed."
+    assert probes["python"] is None
+
+
+def test_select_backend_without_core(no_core):
+    choice = select_backend(BasicNameDividerConfig(backend="auto"), BasicNameDivider, benchmark=True)
+    assert choice.backend == "python"
+    assert "rust, hybrid, numba can not be used" in choice.reason
+    assert set(choice.unavailable) == {"rust", "hybrid", "numba"}
+    assert choice.names_per_sec == {}
+
+
+def test_select_backend_with_wrong_config_type():
+    with pytest.raises(TypeError):
+        select_backend("auto", BasicNameDivider)  # type: ignore
+
+
+def test_auto_backend_without_core(no_core):
+    divider = BasicNameDivider(BasicNameDividerConfig(backend="auto"))
+    assert divider.config.backend == "python"
+    assert divider.backend_choice is not None
+    assert divider.backend_choice.backend == "python"
+    assert str(divider.divide_name("菅義偉")) == "菅 義偉"
+
+
+def test_backend_choice_of_specified_backend():
+    divider = BasicNameDivider(BasicNameDividerConfig(backend="python"))
+    assert divider.backend_choice == BackendChoice(backend="python", reason="Specified by the configuration.")
+
+
+class TestWithCore:
+    @pytest.fixture(autouse=True)
+    def require_core(self):
+        pytest.importorskip("namedivider_core")
+
+    @pytest.mark.parametrize("config_class", [BasicNameDividerConfig, GBDTNameDividerConfig])
+    def test_probe_backends(self, config_class):
+        probes = probe_backends(config_class())
+        assert probes["rust"] is None
+        assert probes["hybrid"] is None
+        assert probes["python"] is None
+
+    def test_probe_numba_backend_with_gbdt(self):
+        assert "not supported by GBDTNameDividerConfig" in probe_backends(GBDTNameDividerConfig())["numba"]
+
+    def test_probe_backends_with_custom_rules(self):
+        config = BasicNameDividerConfig(custom_rules=[SpecificFamilyNameRule(family_names=["中曽"])])
+        probes = probe_backends(config)
+        assert "custom_rules" in probes["rust"]
+        assert probes["hybrid"] is None
+
+    def test_select_backend(self):
+        choice = select_backend(BasicNameDividerConfig(backend="auto"), BasicNameDivider)
+        assert choice.backend == "rust"
+        assert choice.unavailable == {}
+
+    def test_select_backend_with_custom_rules(self):
+        config = BasicNameDividerConfig(backend="auto", custom_rules=[SpecificFamilyNameRule(family_names=["中曽"])])
+        choice = select_backend(config, BasicNameDivider)
+        assert choice.backend == "hybrid"
+        assert "rust can not be used" in choice.reason
+        assert list(choice.unavailable) == ["rust"]
+
+    def test_select_backend_with_pruning(self):
+        choice = select_backend(BasicNameDividerConfig(backend="auto", prune_candidates=True), BasicNameDivider)
+        assert choice.backend == "python"
+        assert all("prune_candidates=True" in _reason for _reason in choice.unavailable.values())
+
+    def test_select_backend_with_benchmark(self):
+        choice = select_backend(BasicNameDividerConfig(backend="auto"), BasicNameDivider, benchmark=True)
+        assert {"rust", "hybrid", "python"} <= set(choice.names_per_sec)
+        assert choice.backend == max(choice.names_per_sec, key=lambda _backend: choice.names_per_sec[_backend])
+        assert "self-benchmark" in choice.reason
+
+    def test_auto_backend(self):
+        divider = BasicNameDivider(BasicNameDividerConfig(backend="auto"))
+        assert divider.backend_choice is not None
+        assert divider.config.backend == divider.backend_choice.backend
+        expected = BasicNameDivider(BasicNameDividerConfig(backend="python")).divide_names(names)
+        assert [str(_n) for _n in divider.divide_names(names)] == [str(_n) for _n in expected]
@@ -94,3 +94,10 @@ def test_divide_name_latest(undivided_name: str, expect: Dict):
     assert divided_name.separator == expect["separator"]
     assert divided_name.score == expect["score"]
     assert divided_name.algorithm == expect["algorithm"]
+
+
+def test_divide_names():
+    undivided_names = [_name for _name, _ in name_test_data_v2]
+    name_divider = BasicNameDivider.from_version(NameDividerVersions.BASIC_NAME_DIVIDER_LATEST)
+    divided_names = name_divider.divide_names(undivided_names)
+    assert divided_names == [name_divider.divide_name(_name) for _name in undivided_names]
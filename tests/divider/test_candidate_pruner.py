@@ -0,0 +1,102 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from namedivider.divider.basic_name_divider import BasicNameDivider
+from namedivider.divider.candidate_pruner import CandidatePruner
+from namedivider.divider.config import BasicNameDividerConfig
+from namedivider.divider.rust_backend import (
+    RustBackendUnsupportedConfigError,
+    validate_rust_basic_config,
+)
+from namedivider.feature.family_name import FamilyNameRepository
+from namedivider.feature.kanji import KanjiStatisticsRepository
+
+CURRENT_DIR = Path(__file__).resolve().parent
+PATH_FAMILY_NAMES = CURRENT_DIR / ".." / "assets" / "family_name_for_test.txt"
+
+names = ["原敬", "中山マサ", "菅義偉", "阿部晋三", "中曽根康弘", "竜胆英一郎", "鳩山由紀夫", "武者小路実篤", "髙橋一生"]
+
+
+@pytest.fixture
+def repository():
+    # order_counts: [family_first, family_other, family_last, given_first, given_other, given_last]
+    order_counts_table = np.array(
+        [
+            [100, 0, 0, 0, 0, 0],  # 山: Only starts a family name
+            [0, 0, 0, 100, 0, 0],  # 太: Only starts a given name
+            [0, 0, 0, 0, 0, 9],  # 郎: Too rare to trust the zeros
+            [0, 0, 0, 0, 0, 0],  # Default
+        ]
+    )
+    return KanjiStatisticsRepository.from_tables(["山", "太", "郎"], order_counts_table, np.zeros((4, 8), dtype=np.int64))
+
+
+def test_is_plausible_by_lengths(repository):
+    pruner = CandidatePruner(repository, max_family_length=2, max_given_length=3)
+    assert pruner.is_plausible("あい", "うえお")
+    assert not pruner.is_plausible("あいう", "えお")
+    assert not pruner.is_plausible("あ", "いうえお")
+
+
+def test_is_plausible_by_zero_counts(repository):
+    pruner = CandidatePruner(repository, min_kanji_count=10)
+    # 太 never starts a family name, and 山 never starts a given name.
+    assert not pruner.is_plausible("太", "あ")
+    assert not pruner.is_plausible("あ", "山")
+    # 山 never ends a family name longer than 1 character.
+    assert pruner.is_plausible("山", "太")
+    assert not pruner.is_plausible("あ山", "太")
+    # Zeros of 郎 and unknown characters are not trusted.
+    assert pruner.is_plausible("郎", "郎")
+    assert pruner.is_plausible("あ", "い")
+
+
+def test_is_plausible_by_family_names(repository):
+    pruner = CandidatePruner(repository, family_name_repository=FamilyNameRepository(PATH_FAMILY_NAMES))
+    assert pruner.is_plausible("中曽根", "康弘")
+    assert pruner.is_plausible("中曽", "根康弘")
+    assert not pruner.is_plausible("中曽根康", "弘")
+
+
+def test_select_family_lengths(repository):
+    pruner = CandidatePruner(repository, max_family_length=2, max_given_length=2, min_kanji_count=10)
+    assert pruner.select_family_lengths("あいうえ") == [2]
+    assert pruner.pruning_rate(["あいうえ"]) == pytest.approx(2 / 3)
+    # All divisions are kept if all of them are pruned.
+    assert pruner.select_family_lengths("あいうえおか") == [1, 2, 3, 4, 5]
+    assert pruner.pruning_rate(["あいうえ", "あいうえおか"]) == pytest.approx(2 / 8)
+    assert pruner.pruning_rate([]) == 0.0
+
+
+def test_basic_name_divider_with_pruning():
+    divider = BasicNameDivider(BasicNameDividerConfig(prune_candidates=True))
+    expected = BasicNameDivider().divide_names(names)
+    divided_names = divider.divide_names(names)
+    assert [str(_divided_name) for _divided_name in divided_names] == [str(_n) for _n in expected]
+    assert [divider.divide_name(_name) for _name in names] == divided_names
+    assert divider.candidate_pruner is not None
+    assert divider.candidate_pruner.pruning_rate(names) > 0
+    for _divided_name, _expected in zip(divided_names, expected):
+        # Scores are the softmax of the remaining divisions.
+        assert _divided_name.score >= _expected.score
+
+
+def test_pruning_is_disabled_by_default():
+    assert BasicNameDivider().candidate_pruner is None
+
+
+def test_pruning_with_snapshot(tmp_path):
+    divider = BasicNameDivider(BasicNameDividerConfig(prune_candidates=True))
+    divider.save_snapshot(tmp_path / "basic.snapshot")
+    loaded = BasicNameDivider.load_snapshot(tmp_path / "basic.snapshot")
+    assert loaded.candidate_pruner is not None
+    assert loaded.divide_names(names) == divider.divide_names(names)
+
+
+def test_pruning_is_not_supported_by_other_backends():
+    with pytest.raises(RustBackendUnsupportedConfigError, match="prune_candidates=True"):
+        validate_rust_basic_config(BasicNameDividerConfig(backend="rust", prune_candidates=True))
+    with pytest.raises(ValueError, match="prune_candidates=True"):
+        BasicNameDivider(BasicNameDividerConfig(backend="numba", prune_candidates=True))
@@ -0,0 +1,143 @@
+import math
+
+import pytest
+
+from namedivider.divider.basic_name_divider import BasicNameDivider
+from namedivider.divider.cascade_name_divider import (
+    ROUTE_BASIC,
+    ROUTE_GBDT,
+    CascadeNameDivider,
+    select_threshold,
+)
+from namedivider.divider.config import BasicNameDividerConfig
+from namedivider.divider.divided_name import DividedName
+from namedivider.rule.specific_family_name_rule import SpecificFamilyNameRule
+
+divided_names = [
+    "原 敬",
+    "中山 マサ",
+    "菅 義偉",
+    "阿部 晋三",
+    "中曽根 康弘",
+    "竜胆 英一郎",
+    "鳩山 由紀夫",
+    "滝 登喜男",
+    "武者小路 実篤",
+    "海部 俊樹",
+    "福田 康夫",
+    "羽田 孜",
+]
+undivided_names = [_name.replace(" ", "") for _name in divided_names]
+
+
+@pytest.fixture(scope="module")
+def basic_divider():
+    return BasicNameDivider()
+
+
+class OracleDivider:
+    """Stands in for GBDTNameDivider, and always returns the correct division."""
+
+    def __init__(self, names):
+        self.answers = {_name.replace(" ", ""): _name.split(" ") for _name in names}
+
+    def divide_names(self, names):
+        return [DividedName(*self.answers[_name], score=1.0, algorithm="oracle") for _name in names]
+
+
+@pytest.fixture(scope="module")
+def second_divider():
+    return OracleDivider(divided_names)
+
+
+def evaluate(divider, names):
+    results = divider.divide_names([_name.replace(" ", "") for _name in names])
+    return sum(str(_result) == _name for _result, _name in zip(results, names)) / len(names)
+
+
+def test_invalid_criterion(basic_divider, second_divider):
+    with pytest.raises(ValueError):
+        CascadeNameDivider(basic_divider, second_divider, criterion="unknown")
+
+
+@pytest.mark.parametrize("criterion", ["score", "margin"])
+def test_divide_names(basic_divider, second_divider, criterion):
+    divider = CascadeNameDivider(basic_divider, second_divider, threshold=0.5, criterion=criterion)
+    basic_results = basic_divider.divide_names(undivided_names)
+    second_results = second_divider.divide_names(undivided_names)
+    confidences = divider.calc_confidences(undivided_names, basic_results)
+    results = divider.divide_names(undivided_names)
+
+    num_escalated = 0
+    for _result, _basic, _second, _confidence in zip(results, basic_results, second_results, confidences):
+        if _basic.algorithm == "rule":
+            assert _confidence == math.inf
+        if _confidence >= 0.5:
+            assert _result == _basic
+        else:
+            assert _result == _second
+            num_escalated += 1
+    assert 0 < num_escalated < len(undivided_names)
+    assert divider.route_counts == {ROUTE_BASIC: len(undivided_names) - num_escalated, ROUTE_GBDT: num_escalated}
+    assert divider.escalation_rate == num_escalated / len(undivided_names)
+    assert [divider.divide_name(_name) for _name in undivided_names] == results
+
+
+def test_margin(basic_divider, second_divider):
+    divider = CascadeNameDivider(basic_divider, second_divider, criterion="margin")
+    name = "中曽根康弘"
+    scores = basic_divider._softmax([basic_divider.calc_score(name[:i], name[i:]) for i in range(1, len(name))])
+    top1, top2 = sorted(scores, reverse=True)[:2]
+    confidences = divider.calc_confidences([name], basic_divider.divide_names([name]))
+    assert confidences[0] == pytest.approx(top1 - top2)
+
+
+@pytest.mark.parametrize("criterion", ["score", "margin"])
+def test_custom_rules_are_always_accepted(second_divider, criterion):
+    basic_divider = BasicNameDivider(BasicNameDividerConfig(custom_rules=[SpecificFamilyNameRule(["谷田部"])]))
+    rule_result = basic_divider.divide_name("谷田部太郎")
+    assert rule_result.algorithm == "rule_specific_family"
+    oracle = OracleDivider(["谷田 部太郎"])
+    divider = CascadeNameDivider(basic_divider, oracle, threshold=0.9, criterion=criterion)
+    assert divider.calc_confidences(["谷田部太郎"], [rule_result]) == [math.inf]
+    assert divider.divide_names(["谷田部太郎"]) == [rule_result]
+    assert divider.escalation_rate == 0.0
+    selection = select_threshold(["谷田部 太郎"], basic_divider, oracle, criterion=criterion)
+    assert selection.escalation_rate == 0.0
+
+
+def test_escalation_rate_without_names(basic_divider, second_divider):
+    assert CascadeNameDivider(basic_divider, second_divider).escalation_rate == 0.0
+
+
+@pytest.mark.parametrize("criterion", ["score", "margin"])
+def test_select_threshold(basic_divider, second_divider, criterion):
+    selection = select_threshold(divided_names, basic_divider, second_divider, criterion=criterion)
+    assert selection.basic_accuracy == evaluate(basic_divider, divided_names)
+    assert selection.gbdt_accuracy == evaluate(second_divider, divided_names)
+    assert selection.basic_accuracy < selection.gbdt_accuracy == selection.accuracy == 1.0
+    assert 0.0 < selection.escalation_rate < 1.0
+
+    divider = CascadeNameDivider(basic_divider, second_divider, threshold=selection.threshold, criterion=criterion)
+    assert evaluate(divider, divided_names) == selection.accuracy
+    assert divider.escalation_rate == selection.escalation_rate
+
+    # Any lower threshold is less accurate than the second divider.
+    confidences = divider.calc_confidences(undivided_names, basic_divider.divide_names(undivided_names))
+    lower_thresholds = [_c for _c in confidences if _c < selection.threshold]
+    assert len(lower_thresholds) > 0
+    for _threshold in lower_thresholds:
+        lower_divider = CascadeNameDivider(basic_divider, second_divider, threshold=_threshold, criterion=criterion)
+        assert evaluate(lower_divider, divided_names) < selection.gbdt_accuracy
+
+
+def test_select_threshold_with_tolerance(basic_divider, second_divider):
+    strict = select_threshold(divided_names, basic_divider, second_divider)
+    tolerant = select_threshold(divided_names, basic_divider, second_divider, tolerance=1.0)
+    assert tolerant.threshold <= strict.threshold
+    assert tolerant.escalation_rate == 0.0
+
+
+def test_select_threshold_empty(basic_divider, second_divider):
+    with pytest.raises(ValueError):
+        select_threshold([], basic_divider, second_divider)
@@ -16,6 +16,16 @@ class TestBackendValidation:
         config = BasicNameDividerConfig(backend="rust")
         assert config.backend == "rust"
 
+    def test_valid_hybrid_backend(self):
+        """Test configs with valid hybrid backend."""
+        assert BasicNameDividerConfig(backend="hybrid").backend == "hybrid"
+        assert GBDTNameDividerConfig(backend="hybrid").backend == "hybrid"
+
+    def test_valid_auto_backend(self):
+        """Test configs with valid auto backend."""
+        assert BasicNameDividerConfig(backend="auto").backend == "auto"
+        assert GBDTNameDividerConfig(backend="auto", auto_benchmark=True).auto_benchmark
+
     def test_basic_config_invalid_backend(self):
         """Test BasicNameDividerConfig with invalid backend raises ValueError."""
         with pytest.raises(ValueError, match="Invalid backend 'invalid'"):
@@ -38,8 +48,10 @@ class TestBackendValidation:
 
     def test_backend_validation_error_message(self):
         """Test that error message contains valid backend options."""
-        with pytest.raises(ValueError, match="Valid backends are: python, rust"):
+        with pytest.raises(ValueError, match="Valid backends are: auto, hybrid, numba, python, rust"):
             BasicNameDividerConfig(backend="unknown")
+        with pytest.raises(ValueError, match="Valid backends are: auto, hybrid, python, rust"):
+            GBDTNameDividerConfig(backend="unknown")
 
     def test_backend_case_sensitivity(self):
         """Test that backend validation is case sensitive."""
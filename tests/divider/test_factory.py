@@ -0,0 +1,11 @@
+import pytest
+
+from namedivider.divider.basic_name_divider import BasicNameDivider
+from namedivider.divider.config import BasicNameDividerConfig, NameDividerConfigBase
+from namedivider.divider.factory import create_divider_from_config
+
+
+def test_create_divider_from_config():
+    assert isinstance(create_divider_from_config(BasicNameDividerConfig()), BasicNameDivider)
+    with pytest.raises(TypeError):
+        create_divider_from_config(NameDividerConfigBase())
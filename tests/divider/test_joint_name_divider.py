@@ -0,0 +1,81 @@
+from pathlib import Path
+
+import pytest
+
+from namedivider.divider.basic_name_divider import BasicNameDivider
+from namedivider.divider.config import BasicNameDividerConfig, GBDTNameDividerConfig
+from namedivider.divider.gbdt_name_divider import GBDTNameDivider
+from namedivider.divider.joint_name_divider import JointNameDivider
+from namedivider.training.gbdt_training import (
+    augment_names,
+    train_gbdt,
+    write_feature_chunks,
+)
+
+CURRENT_DIR = Path(__file__).resolve().parent
+PATH_CSV = CURRENT_DIR / ".." / "assets" / "kanji_for_test.csv"
+PATH_FAMILY_NAMES = CURRENT_DIR / ".." / "assets" / "family_name_for_test.txt"
+
+divided_names = ["原 敬", "菅 義偉", "安倍 晋三", "中曽根 康弘", "竜胆 英一郎", "菅 直人", "安倍 晋太郎"]
+undivided_names = ["原敬", "中山マサ", "菅義偉", "阿部晋三", "中曽根康弘", "竜胆英一郎", "髙橋是清", "武者小路実篤"]
+
+
+@pytest.fixture(scope="module")
+def gbdt_divider(tmp_path_factory):
+    tmp_path = tmp_path_factory.mktemp("joint")
+    names = list(augment_names(divided_names, factor=20, seed=0))
+    write_feature_chunks(names, tmp_path / "train", path_csv=PATH_CSV, path_family_names=PATH_FAMILY_NAMES)
+    path_model = tmp_path / "gbdt_model.txt"
+    train_gbdt(tmp_path / "train", path_model, params={"min_data_in_leaf": 1}, num_boost_round=5, num_threads=1)
+    return GBDTNameDivider(
+        GBDTNameDividerConfig(path_csv=PATH_CSV, path_family_names=PATH_FAMILY_NAMES, path_model=path_model)
+    )
+
+
+@pytest.mark.parametrize("only_order_score_when_4", [False, True])
+def test_consistent_with_dividers(gbdt_divider, only_order_score_when_4):
+    basic_divider = BasicNameDivider(
+        BasicNameDividerConfig(path_csv=PATH_CSV, only_order_score_when_4=only_order_score_when_4)
+    )
+    divider = JointNameDivider(gbdt_divider, only_order_score_when_4=only_order_score_when_4)
+    results = divider.divide_names_joint(undivided_names)
+    assert [_result.basic for _result in results] == basic_divider.divide_names(undivided_names)
+    assert [_result.gbdt for _result in results] == gbdt_divider.divide_names(undivided_names)
+
+
+def test_calc_scores(gbdt_divider):
+    basic_divider = BasicNameDivider(BasicNameDividerConfig(path_csv=PATH_CSV))
+    families = ["菅", "菅義", "中曽根", "中曽"]
+    givens = ["義偉", "偉", "康弘", "根康弘"]
+    basic_scores, gbdt_scores = JointNameDivider(gbdt_divider).calc_scores(families, givens)
+    assert list(basic_scores) == [basic_divider.calc_score(_f, _g) for _f, _g in zip(families, givens)]
+    assert list(gbdt_scores) == [gbdt_divider.calc_score(_f, _g) for _f, _g in zip(families, givens)]
+
+
+def test_calc_scores_empty(gbdt_divider):
+    basic_scores, gbdt_scores = JointNameDivider(gbdt_divider).calc_scores([], [])
+    assert len(basic_scores) == len(gbdt_scores) == 0
+
+
+@pytest.mark.parametrize("basic_weight", [0.0, 0.3, 1.0])
+def test_blended(gbdt_divider, basic_weight):
+    divider = JointNameDivider(gbdt_divider, basic_weight=basic_weight)
+    results = divider.divide_names_joint(undivided_names)
+    assert divider.divide_names(undivided_names) == [_result.blended for _result in results]
+    assert divider.divide_name("中曽根康弘") == results[4].blended
+    for _result in results:
+        if _result.basic.algorithm == "rule":
+            assert _result.basic == _result.gbdt == _result.blended
+            continue
+        assert _result.blended.algorithm == "joint"
+        if basic_weight == 1.0:
+            assert str(_result.blended) == str(_result.basic)
+            assert _result.blended.score == pytest.approx(_result.basic.score)
+        elif basic_weight == 0.0:
+            assert str(_result.blended) == str(_result.gbdt)
+            assert _result.blended.score == pytest.approx(_result.gbdt.score)
+
+
+def test_invalid_basic_weight(gbdt_divider):
+    with pytest.raises(ValueError):
+        JointNameDivider(gbdt_divider, basic_weight=1.5)
@@ -0,0 +1,74 @@
+import asyncio
+import threading
+
+import pytest
+
+from namedivider.divider.basic_name_divider import BasicNameDivider
+from namedivider.divider.micro_batch_name_divider import MicroBatchNameDivider
+
+names = ["原敬", "中山マサ", "菅義偉", "阿部晋三", "中曽根康弘", "蝶院羊"]
+
+
+class CountingBasicNameDivider(BasicNameDivider):
+    def __init__(self):
+        super().__init__()
+        self.batch_sizes = []
+
+    def divide_names(self, undivided_names):
+        self.batch_sizes.append(len(undivided_names))
+        return super().divide_names(undivided_names)
+
+
+def test_divide_name_from_threads():
+    divider = CountingBasicNameDivider()
+    expected = [divider.divide_name(_name) for _name in names]
+    results = [None] * len(names)
+    barrier = threading.Barrier(len(names))
+
+    def worker(idx):
+        barrier.wait()
+        results[idx] = micro_batch_divider.divide_name(names[idx])
+
+    with MicroBatchNameDivider(divider, max_batch_size=len(names), max_delay=1.0) as micro_batch_divider:
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(len(names))]
+        for _thread in threads:
+            _thread.start()
+        for _thread in threads:
+            _thread.join()
+
+    assert results == expected
+    assert divider.batch_sizes == [len(names)]
+
+
+def test_adivide_name():
+    divider = BasicNameDivider()
+    expected = [divider.divide_name(_name) for _name in names]
+
+    async def run(micro_batch_divider):
+        return await asyncio.gather(*[micro_batch_divider.adivide_name(_name) for _name in names])
+
+    with MicroBatchNameDivider(divider) as micro_batch_divider:
+        assert asyncio.run(run(micro_batch_divider)) == expected
+
+
+def test_batch_size_is_limited():
+    divider = CountingBasicNameDivider()
+    with MicroBatchNameDivider(divider, max_batch_size=4, max_delay=1.0) as micro_batch_divider:
+        futures = [micro_batch_divider.submit(_name) for _name in names * 2]
+        results = [_future.result() for _future in futures]
+    assert results == [divider.divide_name(_name) for _name in names * 2]
+    assert all(_size <= 4 for _size in divider.batch_sizes)
+    assert sum(divider.batch_sizes) == len(names) * 2
+
+
+def test_invalid_name():
+    with MicroBatchNameDivider(BasicNameDivider()) as micro_batch_divider:
+        with pytest.raises(ValueError):
+            micro_batch_divider.divide_name("菅")
+
+
+def test_closed():
+    micro_batch_divider = MicroBatchNameDivider(BasicNameDivider())
+    micro_batch_divider.close()
+    with pytest.raises(RuntimeError):
+        micro_batch_divider.divide_name("菅義偉")
@@ -0,0 +1,86 @@
+import subprocess
+import sys
+
+import pytest
+
+from namedivider.divider.basic_name_divider import BasicNameDivider
+from namedivider.divider.config import BasicNameDividerConfig, GBDTNameDividerConfig
+from namedivider.divider.gbdt_name_divider import GBDTNameDivider
+from namedivider.divider.model_store import ModelStore, ModelStoreFormatError
+
+names = ["原敬", "中山マサ", "菅義偉", "阿部晋三", "中曽根康弘", "蝶院羊", "髙橋一生"]
+
+
+def test_basic_name_divider_from_shared_store():
+    config = BasicNameDividerConfig(separator="_")
+    store = ModelStore.create_shared(config)
+    try:
+        attached = ModelStore.attach_shared(store.name)
+        divider = BasicNameDivider.from_model_store(attached, config=config)
+        assert divider.divide_names(names) == BasicNameDivider(config=config).divide_names(names)
+        assert not attached.has_gbdt_assets()
+        del divider
+        attached.close()
+    finally:
+        store.close()
+        store.unlink()
+
+
+def test_attaching_process_does_not_unlink_store():
+    store = ModelStore.create_shared(BasicNameDividerConfig())
+    try:
+        code = (
+            "from namedivider.divider.model_store import ModelStore; "
+            f"store = ModelStore.attach_shared({store.name!r}); store.close()"
+        )
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        assert "leaked" not in result.stderr
+        ModelStore.attach_shared(store.name).close()
+    finally:
+        store.close()
+        store.unlink()
+
+
+def test_basic_name_divider_from_file_store(tmp_path):
+    path = tmp_path / "basic.store"
+    ModelStore.save(path, BasicNameDividerConfig())
+    store = ModelStore.open_file(path)
+    divider = BasicNameDivider.from_model_store(store)
+    assert divider.divide_names(names) == BasicNameDivider().divide_names(names)
+    assert store.name is None
+
+
+def test_store_is_read_only(tmp_path):
+    path = tmp_path / "basic.store"
+    ModelStore.save(path, BasicNameDividerConfig(), metadata={"note": "test"})
+    store = ModelStore.open_file(path)
+    assert store.metadata == {"note": "test"}
+    repository = store.kanji_statistics_repository()
+    with pytest.raises(ValueError):
+        repository.order_counts_table[0, 0] = 0
+
+
+def test_invalid_store(tmp_path):
+    path = tmp_path / "invalid.store"
+    path.write_bytes(b"namedivider" * 10)
+    with pytest.raises(ModelStoreFormatError):
+        ModelStore.open_file(path)
+
+
+def test_rust_backend_is_not_supported(tmp_path):
+    path = tmp_path / "basic.store"
+    ModelStore.save(path, BasicNameDividerConfig())
+    store = ModelStore.open_file(path)
+    with pytest.raises(ValueError):
+        BasicNameDivider.from_model_store(store, config=BasicNameDividerConfig(backend="rust"))
+    with pytest.raises(ValueError):
+        GBDTNameDivider.from_model_store(store)
+
+
+def test_gbdt_name_divider_from_file_store(tmp_path):
+    path = tmp_path / "gbdt.store"
+    ModelStore.save(path, GBDTNameDividerConfig())
+    store = ModelStore.open_file(path)
+    divider = GBDTNameDivider.from_model_store(store)
+    assert store.has_gbdt_assets()
+    assert divider.divide_names(names) == GBDTNameDivider().divide_names(names)
@@ -81,3 +81,34 @@ def test_divide_name_error():
     except ValueError:
         caught_error = True
     assert caught_error
+
+
+def test_divide_names():
+    config = NameDividerConfigBase(separator="_")
+    name_divider = NameDividerForTest(config=config)
+    undivided_names = [_name for _name, _ in name_test_data] + ["手須戸𠮷郎"]
+    divided_names = name_divider.divide_names(undivided_names)
+    assert divided_names == [name_divider.divide_name(_name) for _name in undivided_names]
+
+
+def test_divide_names_error():
+    config = NameDividerConfigBase(separator="_")
+    name_divider = NameDividerForTest(config=config)
+    with pytest.raises(ValueError):
+        name_divider.divide_names(["菅義偉", "原"])
+
+
+def test_calc_scores():
+    name_divider = NameDividerForTest()
+    scores = name_divider.calc_scores(["菅", "菅義"], ["義偉", "偉"])
+    assert scores == [name_divider.calc_score("菅", "義偉"), name_divider.calc_score("菅義", "偉")]
+
+
+@pytest.mark.parametrize("num_threads", [1, 2, 3, None])
+def test_divide_names_with_threads(monkeypatch, num_threads):
+    # Force the free-threaded code path so that it is tested on GIL builds too.
+    monkeypatch.setattr("namedivider.divider.name_divider_base.is_gil_enabled", lambda: False)
+    name_divider = NameDividerForTest()
+    undivided_names = [_name for _name, _ in name_test_data] * 3 + ["手須戸𠮷郎"]
+    divided_names = name_divider.divide_names(undivided_names, num_threads=num_threads)
+    assert divided_names == [name_divider.divide_name(_name) for _name in undivided_names]
@@ -0,0 +1,121 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+import namedivider.feature.functional as F
+from namedivider.divider.basic_name_divider import BasicNameDivider
+from namedivider.divider.config import BasicNameDividerConfig, GBDTNameDividerConfig
+from namedivider.divider.numba_backend import (
+    NumbaDivisionEngine,
+    NumbaNotAvailableError,
+    _compile_kernel,
+)
+from namedivider.feature.kanji import KanjiStatisticsRepository
+
+CURRENT_DIR = Path(__file__).resolve().parent
+PATH_CSV = CURRENT_DIR / ".." / "assets" / "kanji_for_test.csv"
+
+names = [
+    "菅義偉",
+    "阿部晋三",
+    "中曽根康弘",
+    "竜胆英一郎",
+    "鳩山由紀夫",
+    "武者小路実篤",
+    "勘解由小路資忠",
+    "正親町三条実愛子",
+    "𠮷野家豊",
+]
+
+
+def divide_with_functional(repository: KanjiStatisticsRepository, name: str, only_order_score_when_4: bool):
+    scores = []
+    for i in range(1, len(name)):
+        family, given = name[:i], name[i:]
+        order_score = (
+            F.calc_order_score(repository, family, len(name), 0) + F.calc_order_score(repository, given, len(name), i)
+        ) / (len(name) - 2)
+        length_score = (
+            F.calc_length_score(repository, family, len(name), 0) + F.calc_length_score(repository, given, len(name), i)
+        ) / len(name)
+        scores.append(order_score if only_order_score_when_4 and len(name) == 4 else (order_score + length_score) / 2)
+    softmax_scores = np.exp(scores) / np.sum(np.exp(scores))
+    max_idx = int(np.argmax(softmax_scores))
+    return max_idx + 1, softmax_scores[max_idx]
+
+
+@pytest.fixture
+def no_numba(monkeypatch):
+    # Importing a module mapped to None raises ImportError.
+    monkeypatch.setitem(sys.modules, "numba", None)
+    _compile_kernel.cache_clear()
+    yield
+    _compile_kernel.cache_clear()
+
+
+class TestWithNumba:
+    @pytest.fixture(autouse=True)
+    def require_numba(self):
+        pytest.importorskip("numba")
+
+    @pytest.mark.parametrize("path_csv", [None, PATH_CSV])
+    @pytest.mark.parametrize("only_order_score_when_4", [False, True])
+    def test_consistent_with_functional(self, path_csv, only_order_score_when_4):
+        repository = KanjiStatisticsRepository(path_csv=path_csv or BasicNameDividerConfig().path_csv)
+        family_lengths, scores = NumbaDivisionEngine(repository, only_order_score_when_4).divide_names(names)
+        for _name, _family_length, _score in zip(names, family_lengths, scores):
+            expected_family_length, expected_score = divide_with_functional(repository, _name, only_order_score_when_4)
+            assert _family_length == expected_family_length
+            assert _score == pytest.approx(expected_score, rel=1e-12)
+
+    def test_divide_names_empty(self):
+        repository = KanjiStatisticsRepository(path_csv=PATH_CSV)
+        family_lengths, scores = NumbaDivisionEngine(repository).divide_names([])
+        assert len(family_lengths) == 0
+        assert len(scores) == 0
+
+    def test_divide_names_too_short(self):
+        repository = KanjiStatisticsRepository(path_csv=PATH_CSV)
+        with pytest.raises(ValueError):
+            NumbaDivisionEngine(repository).divide_names(["原敬"])
+
+    def test_consistent_with_python_backend(self):
+        undivided_names = [*names, "原敬", "中山マサ", "ｻﾄｳﾀﾛｳ"]
+        python_divider = BasicNameDivider(BasicNameDividerConfig())
+        numba_divider = BasicNameDivider(BasicNameDividerConfig(backend="numba"))
+        assert numba_divider.config.backend == "numba"
+        expected = python_divider.divide_names(undivided_names)
+        for _divided_names in [
+            numba_divider.divide_names(undivided_names),
+            [numba_divider.divide_name(_name) for _name in undivided_names],
+        ]:
+            assert [str(_divided_name) for _divided_name in _divided_names] == [str(_n) for _n in expected]
+            for _divided_name, _expected in zip(_divided_names, expected):
+                assert _divided_name.score == pytest.approx(_expected.score, rel=1e-12)
+                assert _divided_name.algorithm == _expected.algorithm
+
+    def test_auto_backend_without_core(self, monkeypatch):
+        monkeypatch.setitem(sys.modules, "namedivider_core", None)
+        divider = BasicNameDivider(BasicNameDividerConfig(backend="auto"))
+        assert divider.config.backend == "numba"
+
+
+def test_fallback_without_numba(no_numba):
+    with pytest.warns(UserWarning, match="numba is not installed"):
+        divider = BasicNameDivider(BasicNameDividerConfig(backend="numba"))
+    assert divider.config.backend == "python"
+    assert divider.backend_choice is not None
+    assert divider.backend_choice.backend == "python"
+    assert str(divider.divide_name("菅義偉")) == "菅 義偉"
+
+
+def test_engine_without_numba(no_numba):
+    with pytest.raises(NumbaNotAvailableError):
+        NumbaDivisionEngine(KanjiStatisticsRepository(path_csv=PATH_CSV))
+
+
+def test_gbdt_config_does_not_support_numba():
+    with pytest.raises(ValueError, match="Invalid backend 'numba'"):
+        GBDTNameDividerConfig(backend="numba")
@@ -0,0 +1,106 @@
+import os
+import shutil
+import time
+from pathlib import Path
+
+import pytest
+
+from namedivider.divider.basic_name_divider import BasicNameDivider
+from namedivider.divider.config import KANJI_CSV_DEFAULT_PATH, BasicNameDividerConfig
+from namedivider.divider.reloadable_name_divider import ReloadableNameDivider
+
+CURRENT_DIR = Path(__file__).resolve().parent
+TEST_KANJI_CSV = CURRENT_DIR / ".." / "assets" / "kanji_for_test.csv"
+
+names = ["菅義偉", "阿部晋三", "中曽根康弘", "蝶院羊", "竜胆英一"]
+
+
+def _replace(src, dst):
+    # Replace atomically like a deployment would, and make sure the modification time changes.
+    tmp = dst.with_suffix(".tmp")
+    shutil.copy(src, tmp)
+    stat = dst.stat()
+    os.utime(tmp, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    os.replace(tmp, dst)
+
+
+@pytest.fixture
+def path_csv(tmp_path):
+    path = tmp_path / "kanji.csv"
+    shutil.copy(TEST_KANJI_CSV, path)
+    return path
+
+
+def test_reload_if_changed(path_csv):
+    config = BasicNameDividerConfig(path_csv=path_csv)
+    divider = ReloadableNameDivider(config)
+    old_divider = divider.divider
+    assert divider.divide_names(names) == BasicNameDivider(config).divide_names(names)
+    assert not divider.reload_if_changed()
+
+    _replace(KANJI_CSV_DEFAULT_PATH, path_csv)
+    assert divider.reload_if_changed()
+    assert divider.version == 2
+    assert divider.divide_names(names) == BasicNameDivider(config).divide_names(names)
+    # A divider held by an in-flight call keeps the old statistics.
+    assert old_divider.divide_names(names) == BasicNameDivider(
+        BasicNameDividerConfig(path_csv=TEST_KANJI_CSV)
+    ).divide_names(names)
+
+
+def test_failed_reload_keeps_current_divider(path_csv):
+    divider = ReloadableNameDivider(BasicNameDividerConfig(path_csv=path_csv))
+    expected = divider.divide_names(names)
+    path_csv.unlink()
+    with pytest.raises(FileNotFoundError):
+        divider.reload()
+    assert divider.version == 1
+    assert divider.divide_names(names) == expected
+
+
+def test_broken_files_are_not_reloaded_until_changed(path_csv):
+    calls = []
+
+    def factory(config):
+        calls.append(config)
+        return BasicNameDivider(config)
+
+    divider = ReloadableNameDivider(BasicNameDividerConfig(path_csv=path_csv), factory=factory)
+    path_csv.unlink()
+    with pytest.raises(FileNotFoundError):
+        divider.reload_if_changed()
+    assert not divider.is_changed()
+    assert not divider.reload_if_changed()
+    assert len(calls) == 2
+
+    shutil.copy(KANJI_CSV_DEFAULT_PATH, path_csv)
+    assert divider.reload_if_changed()
+    assert divider.version == 2
+    assert len(calls) == 3
+
+
+def test_reload_with_new_config(path_csv):
+    divider = ReloadableNameDivider(BasicNameDividerConfig(path_csv=path_csv))
+    divider.reload(BasicNameDividerConfig(path_csv=path_csv, separator="/"))
+    assert str(divider.divide_name("菅義偉")) == "菅/義偉"
+
+
+def test_reload_with_new_config_keeps_watch_paths(path_csv, tmp_path):
+    marker = tmp_path / "marker"
+    marker.write_text("1")
+    divider = ReloadableNameDivider(BasicNameDividerConfig(path_csv=path_csv), watch_paths=[marker])
+    divider.reload(BasicNameDividerConfig(path_csv=TEST_KANJI_CSV))
+    assert divider._watch_paths == [marker]
+    divider.reload(watch_paths=[path_csv])
+    assert divider._watch_paths == [path_csv]
+    divider.reload(BasicNameDividerConfig(path_csv=path_csv))
+    assert divider._watch_paths == [path_csv]
+
+
+def test_watcher_thread(path_csv):
+    with ReloadableNameDivider(BasicNameDividerConfig(path_csv=path_csv), poll_interval=0.01) as divider:
+        _replace(KANJI_CSV_DEFAULT_PATH, path_csv)
+        deadline = time.monotonic() + 5
+        while divider.version == 1 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert divider.version == 2
@@ -1,3 +1,6 @@
+import sys
+import types
+
 import pytest
 
 from namedivider.divider.config import BasicNameDividerConfig, GBDTNameDividerConfig
@@ -11,6 +14,7 @@ from namedivider.divider.rust_backend import (
     validate_rust_basic_config,
     validate_rust_gbdt_config,
 )
+from namedivider.rule.specific_family_name_rule import SpecificFamilyNameRule
 from namedivider.rule.two_char_rule import TwoCharRule
 
 
@@ -60,6 +64,157 @@ class TestRustBackend:
         assert 0.0 <= score <= 1.0
 
 
+class _StubRustDividedName:
+    def __init__(self, family, given, separator):
+        self.family = family
+        self.given = given
+        self.separator = separator
+        self.score = 0.5
+        self.algorithm = "stub"
+
+
+class _StubRustDivider:
+    """
+    Stands in for the dividers of namedivider_core without the batch API. Divides after the first character.
+    """
+
+    def __init__(self, separator=" ", **kwargs):
+        self.separator = separator
+        self.calls = []
+
+    def divide_name(self, undivided_name):
+        self.calls.append(("divide_name", undivided_name))
+        return _StubRustDividedName(undivided_name[:1], undivided_name[1:], self.separator)
+
+    def calc_score(self, family, given):
+        return 0.5
+
+
+class _StubRustBatchDivider(_StubRustDivider):
+    def divide_names(self, undivided_names):
+        self.calls.append(("divide_names", undivided_names))
+        return [_StubRustDividedName(_name[:1], _name[1:], self.separator) for _name in undivided_names]
+
+
+@pytest.fixture(params=[_StubRustDivider, _StubRustBatchDivider], ids=["loop", "batch"])
+def stub_core(request, monkeypatch):
+    """
+    Local module which stands in for namedivider_core.
+    """
+    module = types.ModuleType("namedivider_core")
+    module.BasicNameDivider = request.param
+    module.GBDTNameDivider = request.param
+    monkeypatch.setitem(sys.modules, "namedivider_core", module)
+    return module
+
+
+class TestRustNameDividerWrapperBatch:
+    """Test divide_names of RustNameDividerWrapper with a stub of namedivider_core."""
+
+    names = ["菅義偉", "安倍晋三", "原敬"]
+
+    def test_divide_names(self, stub_core):
+        wrapper = create_rust_basic_divider(BasicNameDividerConfig(backend="rust", separator="/"))
+        results = wrapper.divide_names(self.names)
+        assert results == [
+            DividedName(family="菅", given="義偉", separator="/", score=0.5, algorithm="stub"),
+            DividedName(family="安", given="倍晋三", separator="/", score=0.5, algorithm="stub"),
+            DividedName(family="原", given="敬", separator="/", score=0.5, algorithm="stub"),
+        ]
+        if stub_core.BasicNameDivider is _StubRustBatchDivider:
+            assert wrapper.supports_batch
+            assert wrapper._rust_divider.calls == [("divide_names", self.names)]
+        else:
+            assert not wrapper.supports_batch
+            assert wrapper._rust_divider.calls == [("divide_name", _name) for _name in self.names]
+
+    def test_divide_names_raw(self, stub_core):
+        wrapper = create_rust_gbdt_divider(GBDTNameDividerConfig(backend="rust"))
+        results = wrapper.divide_names_raw(tuple(self.names))
+        assert all(isinstance(_result, _StubRustDividedName) for _result in results)
+        assert [f"{_result.family} {_result.given}" for _result in results] == ["菅 義偉", "安 倍晋三", "原 敬"]
+
+    def test_divide_names_empty(self, stub_core):
+        wrapper = create_rust_basic_divider(BasicNameDividerConfig(backend="rust"))
+        assert wrapper.divide_names([]) == []
+
+    def test_divider_uses_divide_names(self, stub_core):
+        from namedivider.divider.basic_name_divider import BasicNameDivider
+
+        divider = BasicNameDivider(BasicNameDividerConfig(backend="rust"))
+        assert [str(_name) for _name in divider.divide_names(self.names)] == ["菅 義偉", "安 倍晋三", "原 敬"]
+
+
+class _StubRustDividerWithAssetPaths(_StubRustBatchDivider):
+    def __init__(self, separator=" ", normalize_name=True, only_order_score_when_4=False, path_csv=None):
+        super().__init__(separator=separator)
+        self.normalize_name = normalize_name
+        self.path_csv = path_csv
+
+
+class TestHybridBackend:
+    """Test backend="hybrid", which applies rules in Python and divides the other names in Rust."""
+
+    names = ["菅義偉", "田中太郎", "谷田部太郎", "髙橋一郎", "原敬", "中曽根康弘", "河村たかし"]
+
+    @pytest.mark.parametrize("divider_class_name", ["BasicNameDivider", "GBDTNameDivider"])
+    def test_consistent_with_rust_backend(self, divider_class_name):
+        import namedivider
+
+        divider_class = getattr(namedivider, divider_class_name)
+        config_class = BasicNameDividerConfig if divider_class_name == "BasicNameDivider" else GBDTNameDividerConfig
+        hybrid_divider = divider_class(config_class(backend="hybrid"))
+        rust_divider = divider_class(config_class(backend="rust"))
+        assert hybrid_divider.divide_names(self.names) == rust_divider.divide_names(self.names)
+        assert [hybrid_divider.divide_name(_name) for _name in self.names] == rust_divider.divide_names(self.names)
+        assert hybrid_divider.calc_score("菅", "義偉") == rust_divider.calc_score("菅", "義偉")
+
+    @pytest.mark.parametrize("divider_class_name", ["BasicNameDivider", "GBDTNameDivider"])
+    def test_custom_rules(self, divider_class_name):
+        import namedivider
+
+        divider_class = getattr(namedivider, divider_class_name)
+        config_class = BasicNameDividerConfig if divider_class_name == "BasicNameDivider" else GBDTNameDividerConfig
+        custom_rules = [SpecificFamilyNameRule(family_names=["谷田部", "中曽"])]
+        hybrid_divider = divider_class(config_class(backend="hybrid", custom_rules=custom_rules, cache_mask=True))
+        rust_divider = divider_class(config_class(backend="rust"))
+        for _hybrid_result, _rust_result, _name in zip(
+            hybrid_divider.divide_names(self.names), rust_divider.divide_names(self.names), self.names
+        ):
+            if _name in ("谷田部太郎", "中曽根康弘"):
+                assert _hybrid_result.algorithm == "rule_specific_family"
+            else:
+                assert _hybrid_result == _rust_result
+        assert str(hybrid_divider.divide_name("中曽根康弘")) == "中曽 根康弘"
+
+    def test_normalize_name(self):
+        from namedivider import BasicNameDivider
+
+        divider = BasicNameDivider(BasicNameDividerConfig(backend="hybrid"))
+        assert divider._hybrid_divider._rust_divider is not None
+        assert str(divider.divide_name("髙橋一郎")) == "髙橋 一郎"
+
+    def test_custom_path_is_passed_to_rust_backend(self, monkeypatch, tmp_path):
+        module = types.ModuleType("namedivider_core")
+        module.BasicNameDivider = _StubRustDividerWithAssetPaths
+        monkeypatch.setitem(sys.modules, "namedivider_core", module)
+        path_csv = tmp_path / "kanji.csv"
+        wrapper = create_rust_basic_divider(BasicNameDividerConfig(backend="hybrid", path_csv=path_csv))
+        assert wrapper._rust_divider.path_csv == str(path_csv)
+        assert wrapper._rust_divider.normalize_name is False
+
+    def test_custom_path_is_not_supported(self, stub_core, tmp_path):
+        with pytest.raises(RustBackendUnsupportedConfigError, match="custom path_model"):
+            create_rust_gbdt_divider(GBDTNameDividerConfig(backend="hybrid", path_model=tmp_path / "model.txt"))
+
+    def test_snapshot_is_not_supported(self, tmp_path):
+        from namedivider import BasicNameDivider
+
+        divider = BasicNameDivider(BasicNameDividerConfig(backend="hybrid"))
+        with pytest.raises(ValueError):
+            divider.save_snapshot(tmp_path / "basic.snapshot")
+
+
 class TestRustBackendConfigurationValidation:
     """Test Rust backend configuration validation."""
 
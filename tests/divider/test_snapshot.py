@@ -0,0 +1,51 @@
+import pytest
+
+from namedivider.divider.basic_name_divider import BasicNameDivider
+from namedivider.divider.config import BasicNameDividerConfig, GBDTNameDividerConfig
+from namedivider.divider.gbdt_name_divider import GBDTNameDivider
+from namedivider.divider.model_store import ModelStore, ModelStoreFormatError
+from namedivider.divider.snapshot import load_snapshot
+from namedivider.rule.specific_family_name_rule import SpecificFamilyNameRule
+
+names = ["原敬", "中山マサ", "菅義偉", "阿部晋三", "中曽根康弘", "蝶院羊", "髙橋一生"]
+
+
+def test_basic_name_divider_snapshot(tmp_path):
+    config = BasicNameDividerConfig(
+        separator="_",
+        normalize_name=False,
+        only_order_score_when_4=True,
+        cache_mask=True,
+        custom_rules=[SpecificFamilyNameRule(family_names=["中曽"])],
+    )
+    divider = BasicNameDivider(config=config)
+    path = tmp_path / "basic.snapshot"
+    divider.save_snapshot(path)
+    loaded = BasicNameDivider.load_snapshot(path)
+    assert loaded.divide_names(names) == divider.divide_names(names)
+    assert loaded.only_order_score_when_4
+    assert loaded.feature_extractor.mask_cache is not None
+    assert loaded.divide_name("中曽根康弘").family == "中曽"
+
+
+def test_load_snapshot_returns_saved_class(tmp_path):
+    path = tmp_path / "basic.snapshot"
+    BasicNameDivider().save_snapshot(path)
+    assert isinstance(load_snapshot(path), BasicNameDivider)
+    with pytest.raises(TypeError):
+        GBDTNameDivider.load_snapshot(path)
+
+
+def test_model_store_is_not_snapshot(tmp_path):
+    path = tmp_path / "basic.store"
+    ModelStore.save(path, BasicNameDividerConfig())
+    with pytest.raises(ModelStoreFormatError):
+        load_snapshot(path)
+
+
+def test_gbdt_name_divider_snapshot(tmp_path):
+    divider = GBDTNameDivider(config=GBDTNameDividerConfig(cache_mask=True))
+    path = tmp_path / "gbdt.snapshot"
+    divider.save_snapshot(path)
+    loaded = GBDTNameDivider.load_snapshot(path)
+    assert loaded.divide_names(names) == divider.divide_names(names)
@@ -0,0 +1,58 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from namedivider.divider.basic_name_divider import BasicNameDivider
+from namedivider.divider.config import BasicNameDividerConfig, GBDTNameDividerConfig
+from namedivider.divider.gbdt_name_divider import GBDTNameDivider
+from namedivider.rule.specific_family_name_rule import SpecificFamilyNameRule
+
+names = [
+    "原敬",
+    "中山マサ",
+    "つるの剛士",
+    "菅義偉",
+    "阿部晋三",
+    "中曽根康弘",
+    "蝶院羊",
+    "髙橋一生",
+    "竈門炭治郎",
+    "竜胆尊",
+    "長曾我部元親",
+    "勅使河原三郎",
+    "武者小路実篤",
+]
+
+
+@pytest.mark.parametrize("cache_mask", [False, True])
+def test_shared_basic_name_divider_from_many_threads(cache_mask: bool):
+    config = BasicNameDividerConfig(cache_mask=cache_mask, custom_rules=[SpecificFamilyNameRule(["竜胆"])])
+    divider = BasicNameDivider(config=config)
+    expected = [divider.divide_name(_name) for _name in names]
+
+    def worker(offset: int):
+        # Each thread starts from a different name so that various names are divided at the same time.
+        rotated = names[offset:] + names[:offset]
+        results = []
+        for _ in range(5):
+            results.append([divider.divide_name(_name) for _name in rotated])
+            results.append(divider.divide_names(rotated))
+        return offset, results
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        for offset, results in executor.map(worker, [i % len(names) for i in range(32)]):
+            rotated_expected = expected[offset:] + expected[:offset]
+            for _result in results:
+                assert _result == rotated_expected
+
+
+def test_shared_gbdt_name_divider_from_many_threads():
+    divider = GBDTNameDivider(config=GBDTNameDividerConfig(cache_mask=True))
+    expected = [divider.divide_name(_name) for _name in names]
+
+    def worker(_):
+        return divider.divide_names(names)
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        for _result in executor.map(worker, range(32)):
+            assert _result == expected
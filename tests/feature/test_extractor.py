@@ -1,5 +1,8 @@
+from dataclasses import asdict
 from pathlib import Path
 
+import numpy as np
+
 from namedivider.feature.extractor import (
     FamilyRankingFeatureExtractor,
     FamilyRankingFeatures,
@@ -44,3 +47,35 @@ def test_family_name_repository_get_rank_exists():
     assert features.given_order_score == 1.0
     assert features.given_length_score == 1.9410276679841898
     assert not features.given_startswith_specific_kanji
+
+
+def test_get_features_batch():
+    kanji_statistics_repository = KanjiStatisticsRepository(
+        path_csv=CURRENT_DIR / ".." / "assets" / "kanji_for_test.csv"
+    )
+    family_name_repository = FamilyNameRepository(path_txt=CURRENT_DIR / ".." / "assets" / "family_name_for_test.txt")
+    extractor = FamilyRankingFeatureExtractor(
+        kanji_statistics_repository=kanji_statistics_repository, family_name_repository=family_name_repository
+    )
+    simple_extractor = SimpleFeatureExtractor(kanji_statistics_repository=kanji_statistics_repository)
+    undivided_names = ["原敬", "菅義偉", "中曽根康弘", "竜胆英一郎太", "田中森子"]
+    families = [_name[:i] for _name in undivided_names for i in range(1, len(_name))]
+    givens = [_name[i:] for _name in undivided_names for i in range(1, len(_name))]
+    features_batch = extractor.get_features_batch(families, givens)
+    simple_features_batch = simple_extractor.get_features_batch(families, givens)
+    assert list(features_batch.keys()) == list(FamilyRankingFeatures.__dataclass_fields__)
+    for i, (_family, _given) in enumerate(zip(families, givens)):
+        features = asdict(extractor.get_features(family=_family, given=_given))
+        for _field, _value in features.items():
+            # Ranks of unknown family names are nan.
+            assert features_batch[_field][i] == _value or (np.isnan(_value) and np.isnan(features_batch[_field][i]))
+        for _field, _value in asdict(simple_extractor.get_features(family=_family, given=_given)).items():
+            assert simple_features_batch[_field][i] == _value
+    # Ranks are integers like get_features as long as all family names are known.
+    assert features_batch["rank"].dtype == np.float64
+    known_features_batch = extractor.get_features_batch(["原", "菅"], ["敬", "義偉"])
+    assert known_features_batch["rank"].dtype == np.int64
+    assert known_features_batch["rank"].tolist() == [
+        extractor.get_features(family="原", given="敬").rank,
+        extractor.get_features(family="菅", given="義偉").rank,
+    ]
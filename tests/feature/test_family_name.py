@@ -2,7 +2,10 @@ from pathlib import Path
 
 import numpy as np
 
-from namedivider.feature.family_name import FamilyNameRepository
+from namedivider.feature.family_name import (
+    ArrayFamilyNameRepository,
+    FamilyNameRepository,
+)
 
 CURRENT_DIR = Path(__file__).resolve().parent
 
@@ -25,3 +28,15 @@ def test_family_name_repository_get_rank_not_exists():
     repo = FamilyNameRepository(path_txt=CURRENT_DIR / ".." / "assets" / "family_name_for_test.txt")
     rank = repo.get_rank("岸田")
     assert np.isnan(rank)
+
+
+def test_array_family_name_repository():
+    repo = FamilyNameRepository(path_txt=CURRENT_DIR / ".." / "assets" / "family_name_for_test.txt")
+    array_repo = ArrayFamilyNameRepository.from_repository(repo)
+    for _family in ["原", "菅", "安倍", "中曽根"]:
+        assert array_repo.exists(_family)
+        assert array_repo.get_rank(_family) == repo.get_rank(_family)
+    for _family in ["岸田", "中", "中曽根康", ""]:
+        assert not array_repo.exists(_family)
+        assert np.isnan(array_repo.get_rank(_family))
+    assert sorted(array_repo.items()) == sorted(repo.items())
@@ -1,3 +1,5 @@
+from pathlib import Path
+
 import numpy as np
 import pytest
 
@@ -5,7 +7,11 @@ from namedivider.feature.functional import (
     MaskCache,
     _create_length_mask,
     _create_order_mask,
+    calc_scores_batch,
 )
+from namedivider.feature.kanji import KanjiStatisticsRepository
+
+CURRENT_DIR = Path(__file__).resolve().parent
 
 test_data = [
     (2, 0, np.array([1, 0, 0, 0, 0, 0, 0, 0])),  # short name
@@ -53,8 +59,8 @@ class TestMaskCache:
         mask = cache.get_order_mask(5, 2)
         expected = _create_order_mask(5, 2)
         np.testing.assert_array_equal(mask, expected)
-        # Should now be cached
-        assert (5, 2) in cache.order_masks
+        # Should not be cached because the cache is immutable after initialization
+        assert (5, 2) not in cache.order_masks
 
     def test_get_order_mask_invalid_first_char(self):
         cache = MaskCache()
@@ -78,8 +84,8 @@ class TestMaskCache:
         mask = cache.get_length_mask(6, 3)
         expected = _create_length_mask(6, 3)
         np.testing.assert_array_equal(mask, expected)
-        # Should now be cached
-        assert (6, 3) in cache.length_masks
+        # Should not be cached because the cache is immutable after initialization
+        assert (6, 3) not in cache.length_masks
 
     def test_cache_consistency_order_mask(self):
         cache = MaskCache()
@@ -95,6 +101,19 @@ class TestMaskCache:
         mask2 = cache.get_length_mask(4, 2)
         assert mask1 is mask2
 
+    def test_initialize_cache_precomputes_all_length_masks(self):
+        cache = MaskCache(max_length=4)
+        for length in range(1, 5):
+            for idx in range(length):
+                assert (length, idx) in cache.length_masks
+
+    def test_cached_masks_are_read_only(self):
+        cache = MaskCache()
+        with pytest.raises(ValueError):
+            cache.get_order_mask(4, 1)[0] = 1
+        with pytest.raises(ValueError):
+            cache.get_length_mask(4, 1)[0] = 1
+
     def test_order_mask_correctness(self):
         cache = MaskCache()
         # Test specific cases to ensure correctness
@@ -114,3 +133,11 @@ class TestMaskCache:
         mask = cache.get_length_mask(3, 1)
         expected = _create_length_mask(3, 1)
         np.testing.assert_array_equal(mask, expected)
+
+
+def test_calc_scores_batch_empty():
+    repository = KanjiStatisticsRepository(path_csv=CURRENT_DIR / ".." / "assets" / "kanji_for_test.csv")
+    scores = calc_scores_batch(repository, [], [])
+    assert all(len(_scores) == 0 for _scores in scores.values())
+    with pytest.raises(ValueError):
+        calc_scores_batch(repository, ["菅"], [])
@@ -1,6 +1,7 @@
 from pathlib import Path
 
 import numpy as np
+import pytest
 
 from namedivider.feature.kanji import KanjiStatistics, KanjiStatisticsRepository
 
@@ -28,3 +29,27 @@ def test_get_not_exists():
     assert kanji_statistics.kanji == "default"
     np.testing.assert_equal(kanji_statistics.order_counts, np.array([0, 0, 0, 0, 0, 0]))
     np.testing.assert_equal(kanji_statistics.length_counts, np.array([0, 0, 0, 0, 0, 0, 0, 0]))
+
+
+def test_encode():
+    repo = KanjiStatisticsRepository(path_csv=CURRENT_DIR / ".." / "assets" / "kanji_for_test.csv")
+    codes = repo.encode("菅岸")
+    assert repo.kanjis[codes[0]] == "菅"
+    assert codes[1] == repo.default_index
+    np.testing.assert_equal(repo.order_counts_table[codes[0]], repo.get("菅").order_counts)
+    np.testing.assert_equal(repo.length_counts_table[codes[1]], np.zeros(8))
+
+
+def test_from_tables():
+    repo = KanjiStatisticsRepository(path_csv=CURRENT_DIR / ".." / "assets" / "kanji_for_test.csv")
+    copied = KanjiStatisticsRepository.from_tables(repo.kanjis, repo.order_counts_table, repo.length_counts_table)
+    assert copied.order_counts_table is repo.order_counts_table
+    np.testing.assert_equal(copied.get("菅").length_counts, repo.get("菅").length_counts)
+    with pytest.raises(ValueError):
+        KanjiStatisticsRepository.from_tables(repo.kanjis, repo.order_counts_table[:-1], repo.length_counts_table)
+
+
+def test_statistics_are_read_only():
+    repo = KanjiStatisticsRepository(path_csv=CURRENT_DIR / ".." / "assets" / "kanji_for_test.csv")
+    with pytest.raises(ValueError):
+        repo.get("菅").order_counts[0] = 0
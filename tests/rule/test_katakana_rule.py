@@ -0,0 +1,32 @@
+import pytest
+
+from namedivider.rule.katakana_rule import KatakanaRule
+
+
+@pytest.mark.parametrize("undivided_name", ["ジョン・スミス", "ジョン＝スミス", "ジョン=スミス", "ジョン　スミス", "ジョン スミス"])
+def test_divide_if_delimited(undivided_name):
+    rule = KatakanaRule()
+    divided_name = rule.divide(undivided_name=undivided_name, separator="/")
+    assert divided_name.family == "スミス"
+    assert divided_name.given == "ジョン"
+    assert divided_name.separator == "/"
+    assert divided_name.score == 1.0
+    assert divided_name.algorithm == "rule"
+
+
+def test_divide_if_family_first():
+    rule = KatakanaRule(family_first=True)
+    divided_name = rule.divide(undivided_name="ヤマダ・タロウ")
+    assert divided_name.family == "ヤマダ"
+    assert divided_name.given == "タロウ"
+
+
+def test_divide_if_two_char():
+    divided_name = KatakanaRule().divide(undivided_name="アイ")
+    assert divided_name.family == "イ"
+    assert divided_name.given == "ア"
+
+
+@pytest.mark.parametrize("undivided_name", ["ジョンスミス", "レオナルド・ダ・ヴィンチ", "・スミス", "ジョン・", "原・敬", "ア", "ジョン・スミスJr"])
+def test_divide_if_not_match(undivided_name):
+    assert KatakanaRule().divide(undivided_name=undivided_name) is None
@@ -0,0 +1,157 @@
+import dataclasses
+import hashlib
+import io
+import json
+import tarfile
+
+import pytest
+
+from namedivider import asset_manager, util
+from namedivider.asset_manager import AssetIntegrityError, AssetManager, sha256_of
+
+
+@pytest.fixture
+def source_dir(tmp_path):
+    source = tmp_path / "source"
+    (source / "models").mkdir(parents=True)
+    (source / "models" / "gbdt_model_v1.txt").write_bytes(b"model")
+    (source / "family_name_repository.pickle").write_bytes(b"family names")
+    return source
+
+
+@pytest.fixture
+def pinned(monkeypatch):
+    """
+    Pins the checksums of the assets in source_dir.
+    """
+    checksums = {
+        "gbdt_model_v1": hashlib.sha256(b"model").hexdigest(),
+        "family_name_repository": hashlib.sha256(b"family names").hexdigest(),
+    }
+    monkeypatch.setattr(
+        asset_manager,
+        "KNOWN_ASSETS",
+        tuple(dataclasses.replace(_spec, sha256=checksums[_spec.name]) for _spec in asset_manager.KNOWN_ASSETS),
+    )
+    return checksums
+
+
+def test_missing_and_status(tmp_path):
+    manager = AssetManager(tmp_path / "cache")
+    assert manager.missing() == ["gbdt_model_v1", "family_name_repository"]
+    assert all(not _status.exists for _status in manager.status())
+
+
+def test_stage_from_directory(tmp_path, source_dir):
+    manager = AssetManager(tmp_path / "cache")
+    assert manager.stage(source_dir) == ["gbdt_model_v1", "family_name_repository"]
+    assert manager.missing() == []
+    assert manager.path("gbdt_model_v1").read_bytes() == b"model"
+    assert all(_status.verified for _status in manager.verify())
+
+
+def test_bundle_and_stage_from_tarball(tmp_path, source_dir):
+    manager = AssetManager(tmp_path / "cache")
+    manager.stage(source_dir)
+    manager.bundle(tmp_path / "assets.tar.gz")
+    other_manager = AssetManager(tmp_path / "other_cache")
+    other_manager.stage(tmp_path / "assets.tar.gz")
+    assert other_manager.missing() == []
+    assert other_manager.read_manifest() == manager.read_manifest()
+
+
+def test_stage_rejects_checksum_mismatch(tmp_path, source_dir):
+    manager = AssetManager(tmp_path / "cache")
+    manager.stage(source_dir)
+    (source_dir / "models" / "gbdt_model_v1.txt").write_bytes(b"new model")
+    (source_dir / "manifest.json").write_text(
+        json.dumps(
+            {"assets": {"gbdt_model_v1.txt": {"sha256": sha256_of(source_dir / "family_name_repository.pickle")}}}
+        )
+    )
+    with pytest.raises(AssetIntegrityError):
+        manager.stage(source_dir)
+    # The cached asset is not replaced by the corrupted one.
+    assert manager.path("gbdt_model_v1").read_bytes() == b"model"
+    assert all(_status.verified for _status in manager.verify())
+
+
+def test_verify_detects_corruption(tmp_path, source_dir):
+    manager = AssetManager(tmp_path / "cache")
+    manager.stage(source_dir)
+    manager.path("family_name_repository").write_bytes(b"broken")
+    with pytest.raises(AssetIntegrityError):
+        manager.verify()
+
+
+def test_stage_rejects_duplicate_assets(tmp_path, source_dir):
+    (source_dir / "gbdt_model_v1.txt").write_bytes(b"another model")
+    manager = AssetManager(tmp_path / "cache")
+    with pytest.raises(ValueError, match="gbdt_model_v1.txt"):
+        manager.stage(source_dir)
+    assert manager.missing() == ["gbdt_model_v1", "family_name_repository"]
+
+    with tarfile.open(tmp_path / "assets.tar", "w") as tar:
+        tar.add(source_dir / "gbdt_model_v1.txt", arcname="a/gbdt_model_v1.txt")
+        tar.add(source_dir / "models" / "gbdt_model_v1.txt", arcname="b/gbdt_model_v1.txt")
+    with pytest.raises(ValueError, match="gbdt_model_v1.txt"):
+        manager.stage(tmp_path / "assets.tar")
+
+
+def test_tarball_paths_are_not_used(tmp_path):
+    payload = tmp_path / "gbdt_model_v1.txt"
+    payload.write_bytes(b"model")
+    with tarfile.open(tmp_path / "evil.tar", "w") as tar:
+        tar.add(payload, arcname="../../gbdt_model_v1.txt")
+    manager = AssetManager(tmp_path / "cache" / "nested")
+    manager.stage(tmp_path / "evil.tar")
+    assert manager.path("gbdt_model_v1").read_bytes() == b"model"
+    assert not (tmp_path / "cache" / "gbdt_model_v1.txt").exists()
+
+
+def test_offline_download(tmp_path, monkeypatch):
+    path = tmp_path / "gbdt_model_v1.txt"
+    monkeypatch.setenv("NAMEDIVIDER_OFFLINE", "1")
+    monkeypatch.setattr(util, "get_gbdt_model_v1_default_path", lambda: path)
+    with pytest.raises(FileNotFoundError):
+        util.download_gbdt_model_v1_if_needed(path)
+
+
+def test_stage_checks_pinned_checksums(tmp_path, source_dir, pinned):
+    manager = AssetManager(tmp_path / "cache")
+    assert manager.stage(source_dir) == ["gbdt_model_v1", "family_name_repository"]
+    assert manager.read_manifest()["gbdt_model_v1.txt"]["sha256"] == pinned["gbdt_model_v1"]
+
+    # Assets not matching the pinned checksums are rejected without manifest.json.
+    (source_dir / "models" / "gbdt_model_v1.txt").write_bytes(b"tampered model")
+    with pytest.raises(AssetIntegrityError):
+        manager.stage(source_dir)
+    # A manifest.json agreeing with the tampered asset is not trusted either.
+    (source_dir / "manifest.json").write_text(
+        json.dumps(
+            {"assets": {"gbdt_model_v1.txt": {"sha256": sha256_of(source_dir / "models" / "gbdt_model_v1.txt")}}}
+        )
+    )
+    with pytest.raises(AssetIntegrityError):
+        manager.stage(source_dir)
+    assert manager.path("gbdt_model_v1").read_bytes() == b"model"
+    assert all(_status.verified for _status in manager.verify())
+
+    manager.path("gbdt_model_v1").write_bytes(b"tampered model")
+    with pytest.raises(AssetIntegrityError):
+        manager.verify()
+
+
+def test_download_checks_checksum(tmp_path, monkeypatch):
+    monkeypatch.setattr(util.urllib.request, "urlopen", lambda *args, **kwargs: io.BytesIO(b"tampered model"))
+    monkeypatch.setattr(util, "DEFAULT_CACHE_DIR", tmp_path)
+    path = tmp_path / "gbdt_model_v1.txt"
+    with pytest.raises(AssetIntegrityError):
+        util._download(
+            "https://example.com/gbdt_model_v1.txt", path, "GBDT Model", hashlib.sha256(b"model").hexdigest()
+        )
+    assert not path.exists()
+    util._download(
+        "https://example.com/gbdt_model_v1.txt", path, "GBDT Model", hashlib.sha256(b"tampered model").hexdigest()
+    )
+    assert path.read_bytes() == b"tampered model"
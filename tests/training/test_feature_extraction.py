@@ -0,0 +1,61 @@
+from dataclasses import asdict
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from namedivider.feature.extractor import FamilyRankingFeatureExtractor
+from namedivider.feature.family_name import FamilyNameRepository
+from namedivider.feature.kanji import KanjiStatisticsRepository
+from namedivider.training.feature_extraction import (
+    extract_features_batch,
+    generate_candidates,
+    write_features_csv,
+)
+
+CURRENT_DIR = Path(__file__).resolve().parent
+
+divided_names = ["原 敬", "菅 義偉", "安倍 晋三", "中曽根 康弘", "竜胆 英一郎"]
+
+
+@pytest.fixture
+def extractor():
+    return FamilyRankingFeatureExtractor(
+        kanji_statistics_repository=KanjiStatisticsRepository(
+            path_csv=CURRENT_DIR / ".." / "assets" / "kanji_for_test.csv"
+        ),
+        family_name_repository=FamilyNameRepository(
+            path_txt=CURRENT_DIR / ".." / "assets" / "family_name_for_test.txt"
+        ),
+    )
+
+
+def test_generate_candidates():
+    families, givens, targets = generate_candidates(["安倍 晋三"])
+    assert families == ["安", "安倍", "安倍晋"]
+    assert givens == ["倍晋三", "晋三", "三"]
+    assert targets.tolist() == [False, True, False]
+    with pytest.raises(ValueError):
+        generate_candidates(["安倍晋三"])
+
+
+def test_extract_features_batch_same_as_get_features(extractor):
+    rows = []
+    for _name in divided_names:
+        undivided_name = _name.replace(" ", "")
+        for i in range(len(undivided_name) - 1):
+            _family = undivided_name[: i + 1]
+            _given = undivided_name[i + 1 :]
+            row = {"name": f"{_family} {_given}", "target": f"{_family} {_given}" == _name}
+            row.update(asdict(extractor.get_features(_family, _given)))
+            rows.append(row)
+    expected = pd.DataFrame(rows)
+    pd.testing.assert_frame_equal(extract_features_batch(divided_names, extractor), expected, check_exact=True)
+
+
+def test_write_features_csv(tmp_path, extractor):
+    num_rows = write_features_csv(divided_names + [""], tmp_path / "features.csv", extractor, chunk_size=2)
+    df = pd.read_csv(tmp_path / "features.csv")
+    assert num_rows == len(df) == sum(len(_name) - 2 for _name in divided_names)
+    expected = extract_features_batch(divided_names, extractor)
+    pd.testing.assert_frame_equal(df, expected)
@@ -0,0 +1,126 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from namedivider.divider.config import GBDTNameDividerConfig
+from namedivider.divider.gbdt_name_divider import GBDTNameDivider
+from namedivider.training.feature_extraction import extract_features_batch
+from namedivider.training.gbdt_training import (
+    DEFAULT_NUM_BOOST_ROUND_WITHOUT_VALIDATION,
+    FEATURE_COLUMNS,
+    augment_names,
+    count_family_names,
+    create_extractor,
+    load_feature_chunks,
+    read_divided_names,
+    train_gbdt,
+    write_feature_chunks,
+)
+
+CURRENT_DIR = Path(__file__).resolve().parent
+PATH_CSV = CURRENT_DIR / ".." / "assets" / "kanji_for_test.csv"
+PATH_FAMILY_NAMES = CURRENT_DIR / ".." / "assets" / "family_name_for_test.txt"
+
+divided_names = ["原 敬", "菅 義偉", "安倍 晋三", "中曽根 康弘", "竜胆 英一郎", "菅 直人", "安倍 晋太郎"]
+
+
+def test_read_divided_names(tmp_path):
+    path = tmp_path / "names.txt"
+    path.write_text("原 敬\n菅義偉\nキム ヨナ\n\n安倍 晋三\n", encoding="utf-8")
+    assert list(read_divided_names(path)) == ["原 敬", "安倍 晋三"]
+
+
+def test_augment_names():
+    augmented = list(augment_names(divided_names, factor=3, seed=0))
+    assert len(augmented) == len(divided_names) * 4
+    assert augmented[: len(divided_names)] == divided_names
+    assert augmented == list(augment_names(divided_names, factor=3, seed=0))
+    for i in range(1, 4):
+        shuffled = augmented[len(divided_names) * i : len(divided_names) * (i + 1)]
+        assert sorted(_name.split(" ")[0] for _name in shuffled) == sorted(
+            _name.split(" ")[0] for _name in divided_names
+        )
+        assert sorted(_name.split(" ")[1] for _name in shuffled) == sorted(
+            _name.split(" ")[1] for _name in divided_names
+        )
+
+
+def test_count_family_names():
+    assert count_family_names(divided_names) == ["菅", "安倍", "原", "中曽根", "竜胆"]
+
+
+@pytest.mark.parametrize("num_workers", [1, 2])
+def test_write_feature_chunks(tmp_path, num_workers):
+    num_rows = write_feature_chunks(
+        divided_names,
+        tmp_path,
+        path_csv=PATH_CSV,
+        path_family_names=PATH_FAMILY_NAMES,
+        chunk_size=3,
+        num_workers=num_workers,
+    )
+    assert num_rows == sum(len(_name) - 2 for _name in divided_names)
+    assert len(list(tmp_path.glob("features_*.npy"))) == 3
+
+    expected = extract_features_batch(divided_names, create_extractor(PATH_CSV, PATH_FAMILY_NAMES))
+    sequences, labels = load_feature_chunks(tmp_path)
+    x = np.concatenate([_sequence[0 : len(_sequence)] for _sequence in sequences])
+    assert np.array_equal(x, expected[FEATURE_COLUMNS].to_numpy(dtype=np.float64), equal_nan=True)
+    assert np.array_equal(labels, expected["target"].to_numpy(dtype=np.float64))
+
+
+def test_write_feature_chunks_removes_old_chunks(tmp_path):
+    write_feature_chunks(divided_names, tmp_path, path_csv=PATH_CSV, path_family_names=PATH_FAMILY_NAMES, chunk_size=2)
+    num_rows = write_feature_chunks(
+        divided_names[:2], tmp_path, path_csv=PATH_CSV, path_family_names=PATH_FAMILY_NAMES, chunk_size=2
+    )
+    assert len(list(tmp_path.glob("features_*.npy"))) == 1
+    assert len(list(tmp_path.glob("targets_*.npy"))) == 1
+    _, labels = load_feature_chunks(tmp_path)
+    assert len(labels) == num_rows == sum(len(_name) - 2 for _name in divided_names[:2])
+
+
+def test_load_feature_chunks_empty(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        load_feature_chunks(tmp_path)
+
+
+def test_train_gbdt(tmp_path):
+    names = list(augment_names(divided_names, factor=20, seed=0))
+    write_feature_chunks(
+        names, tmp_path / "train", path_csv=PATH_CSV, path_family_names=PATH_FAMILY_NAMES, chunk_size=50
+    )
+    write_feature_chunks(divided_names, tmp_path / "valid", path_csv=PATH_CSV, path_family_names=PATH_FAMILY_NAMES)
+    path_model = tmp_path / "model" / "gbdt_model.txt"
+    model = train_gbdt(
+        tmp_path / "train",
+        path_model,
+        valid_dir=tmp_path / "valid",
+        params={"min_data_in_leaf": 1},
+        num_boost_round=5,
+        num_threads=1,
+    )
+    assert path_model.exists()
+    assert model.feature_name() == FEATURE_COLUMNS
+
+    divider = GBDTNameDivider(
+        GBDTNameDividerConfig(path_csv=PATH_CSV, path_family_names=PATH_FAMILY_NAMES, path_model=path_model)
+    )
+    divided_name = divider.divide_name("菅義偉")
+    assert str(divided_name).replace(" ", "") == "菅義偉"
+
+
+def test_train_gbdt_without_validation(tmp_path, monkeypatch):
+    lgb = pytest.importorskip("lightgbm")
+    num_boost_rounds = []
+    train = lgb.train
+
+    def recording_train(*args, **kwargs):
+        num_boost_rounds.append(kwargs["num_boost_round"])
+        return train(*args, **kwargs)
+
+    monkeypatch.setattr(lgb, "train", recording_train)
+    write_feature_chunks(divided_names, tmp_path / "train", path_csv=PATH_CSV, path_family_names=PATH_FAMILY_NAMES)
+    train_gbdt(tmp_path / "train", tmp_path / "gbdt_model.txt", num_threads=1)
+    assert num_boost_rounds == [DEFAULT_NUM_BOOST_ROUND_WITHOUT_VALIDATION]
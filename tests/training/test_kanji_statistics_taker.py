@@ -0,0 +1,114 @@
+import pytest
+
+from namedivider.training.kanji_statistics_taker import (
+    BatchKanjiStatisticsTaker,
+    KanjiStatisticsMode,
+    KanjiStatisticsTaker,
+    take_from_files,
+)
+
+divided_names = [("原", "敬"), ("菅", "義偉"), ("阿部", "晋三"), ("中曽根", "康弘"), ("北里", "柴三郎"), ("柴田", "錬三郎")]
+
+
+@pytest.mark.parametrize("mode", list(KanjiStatisticsMode))
+def test_batch_taker_same_as_taker(tmp_path, mode):
+    taker = KanjiStatisticsTaker(mode=mode)
+    batch_taker = BatchKanjiStatisticsTaker(mode=mode)
+    # Repeat names so that ONLY_FREQUENT_KANJI keeps some kanji.
+    for _family, _given in divided_names * 3:
+        taker.append(_family, _given)
+    batch_taker.append_batch([_family for _family, _ in divided_names * 3], [_given for _, _given in divided_names * 3])
+    taker.to_csv(tmp_path / "taker.csv")
+    batch_taker.to_csv(tmp_path / "batch_taker.csv")
+    assert (tmp_path / "taker.csv").read_text() == (tmp_path / "batch_taker.csv").read_text()
+
+
+def test_batch_taker_counts():
+    taker = BatchKanjiStatisticsTaker()
+    taker.append("北里", "柴三郎")
+    taker.append("柴田", "錬三郎")
+    taker._materialize()
+    assert taker.statistics["柴"].order_counts.tolist() == [1, 0, 0, 1, 0, 0]
+    assert taker.statistics["柴"].length_counts.tolist() == [0, 1, 0, 0, 0, 0, 1, 0]
+    assert taker.statistics["三"].order_counts.tolist() == [0, 0, 0, 0, 2, 0]
+
+
+def test_batch_taker_base_class_api(tmp_path):
+    taker = KanjiStatisticsTaker(mode=KanjiStatisticsMode.ALL)
+    batch_taker = BatchKanjiStatisticsTaker(mode=KanjiStatisticsMode.ALL)
+    for _taker in [taker, batch_taker]:
+        for _family, _given in divided_names:
+            _taker.set_kanji(_family + _given)
+            for i, _kanji in enumerate(_family):
+                _taker.set_count(_kanji, _taker.get_order(_family, i, True), _taker.get_length(_family, True))
+            for i, _kanji in enumerate(_given):
+                _taker.set_count(_kanji, _taker.get_order(_given, i, False), _taker.get_length(_given, False))
+    taker.to_csv(tmp_path / "taker.csv")
+    batch_taker.to_csv(tmp_path / "batch_taker.csv")
+    assert (tmp_path / "taker.csv").read_text() == (tmp_path / "batch_taker.csv").read_text()
+
+
+def test_take_from_file(tmp_path):
+    path = tmp_path / "names.txt"
+    path.write_text("\n".join(f"{_family} {_given}" for _family, _given in divided_names) + "\n\n")
+    taker = BatchKanjiStatisticsTaker(mode=KanjiStatisticsMode.ALL)
+    taker.take_from_file(path, chunk_size=4)
+    expected = KanjiStatisticsTaker(mode=KanjiStatisticsMode.ALL)
+    for _family, _given in divided_names:
+        expected.append(_family, _given)
+    taker.to_csv(tmp_path / "taker.csv")
+    expected.to_csv(tmp_path / "expected.csv")
+    assert (tmp_path / "taker.csv").read_text() == (tmp_path / "expected.csv").read_text()
+
+
+def test_take_error():
+    taker = BatchKanjiStatisticsTaker()
+    with pytest.raises(ValueError):
+        taker.take(["菅義偉"])
+    with pytest.raises(ValueError):
+        taker.append_batch(["菅"], [])
+
+
+def _batch_taker(names, mode=KanjiStatisticsMode.ALL):
+    taker = BatchKanjiStatisticsTaker(mode=mode)
+    taker.append_batch([_family for _family, _ in names], [_given for _, _given in names])
+    return taker
+
+
+def test_add(tmp_path):
+    taker_a = _batch_taker(divided_names[:2])
+    taker_b = _batch_taker(divided_names[2:4])
+    taker_c = _batch_taker(divided_names[4:])
+    ((taker_a + taker_b) + taker_c).to_csv(tmp_path / "left.csv")
+    (taker_c + (taker_b + taker_a)).to_csv(tmp_path / "right.csv")
+    _batch_taker(divided_names).to_csv(tmp_path / "expected.csv")
+    assert (tmp_path / "left.csv").read_text() == (tmp_path / "expected.csv").read_text()
+    assert (tmp_path / "right.csv").read_text() == (tmp_path / "expected.csv").read_text()
+    # Operands are not modified.
+    assert taker_a.kanjis == _batch_taker(divided_names[:2]).kanjis
+    with pytest.raises(ValueError):
+        taker_a + BatchKanjiStatisticsTaker(mode=KanjiStatisticsMode.ONLY_KANJI)
+
+
+def test_checkpoint(tmp_path):
+    taker = _batch_taker(divided_names, mode=KanjiStatisticsMode.ONLY_KANJI)
+    taker.save_checkpoint(tmp_path / "checkpoint.npz")
+    loaded = BatchKanjiStatisticsTaker.load_checkpoint(tmp_path / "checkpoint.npz")
+    assert loaded.mode == KanjiStatisticsMode.ONLY_KANJI
+    assert loaded.kanjis == taker.kanjis
+    assert (loaded.order_counts_table == taker.order_counts_table).all()
+    assert (loaded.length_counts_table == taker.length_counts_table).all()
+
+
+@pytest.mark.parametrize("num_workers", [1, 2])
+def test_take_from_files(tmp_path, num_workers):
+    paths = []
+    for i, _names in enumerate([divided_names[:3], divided_names[3:]]):
+        path = tmp_path / f"{i}.txt"
+        path.write_text("\n".join(f"{_family} {_given}" for _family, _given in _names))
+        paths.append(path)
+    base = _batch_taker(divided_names)
+    taker = take_from_files(paths, mode=KanjiStatisticsMode.ALL, num_workers=num_workers, base=base)
+    taker.to_csv(tmp_path / "taker.csv")
+    _batch_taker(divided_names * 2).to_csv(tmp_path / "expected.csv")
+    assert (tmp_path / "taker.csv").read_text() == (tmp_path / "expected.csv").read_text()